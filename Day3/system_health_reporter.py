@@ -1,4 +1,6 @@
-
+import json
+import operator
+import os
 import psutil
 import shutil
 import time
@@ -6,9 +8,31 @@ from datetime import datetime
 
 # Configuration
 LOG_FILE = "system_health.log"
-CPU_THRESHOLD = 80        # percent
-DISK_THRESHOLD_GB = 5     # GB of free space minimum
+RULES_FILE = "health_rules.json"  # same rule format as the remote monitor's --rules
 CHECK_PATH = "C:\\"       # change this if needed
+HOST_TAGS = []            # tags of this machine, they select the per-tag "overrides" of a rule
+
+# Used when RULES_FILE does not exist
+DEFAULT_RULES = [
+    {"name": "cpu", "metric": "cpu_percent", "op": ">", "warn": 80, "message": "High CPU usage"},
+    {"name": "disk", "metric": "free_disk_gb", "op": "<", "warn": 5, "message": "Low disk space"},
+]
+
+OPERATORS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le}
+
+def load_rules(path=RULES_FILE):
+    """Load alert rules from a JSON file, falling back to the defaults."""
+    if not os.path.exists(path):
+        return DEFAULT_RULES
+    with open(path) as f:
+        document = json.load(f)
+    rules = document["rules"] if isinstance(document, dict) else document
+    for rule in rules:
+        if "metric" not in rule or ("warn" not in rule and "crit" not in rule):
+            raise ValueError(f"alert rule needs a metric and a warn or crit threshold: {rule}")
+        if rule.get("op", ">=") not in OPERATORS:
+            raise ValueError(f"alert rule operator must be one of {', '.join(OPERATORS)}: {rule}")
+    return rules
 
 def check_system_health():
     """Check CPU and disk usage, return results."""
@@ -17,17 +41,48 @@ def check_system_health():
     free_gb = free / (1024 ** 3)
     return cpu_usage, free_gb
 
-def log_health(cpu, free_gb):
+def rule_limits(rule, tags):
+    """Return the warn, crit and "for" settings of a rule after the overrides for these tags."""
+    limits = {"warn": rule.get("warn"), "crit": rule.get("crit"), "for": rule.get("for", 1)}
+    for tag, override in rule.get("overrides", {}).items():
+        if tag in tags:
+            limits.update({key: override[key] for key in ("warn", "crit", "for") if key in override})
+    limits["for"] = max(1, int(limits["for"]))
+    return limits
+
+def evaluate_rules(rules, metrics, streaks, tags=HOST_TAGS):
+    """Return a warning for every rule whose threshold was crossed on "for" consecutive checks.
+
+    streaks keeps the consecutive warn and crit counts per rule between calls.
+    """
+    warnings = []
+    for rule in rules:
+        value = metrics.get(rule["metric"])
+        if value is None:
+            continue
+        compare = OPERATORS[rule.get("op", ">=")]
+        name = rule.get("name", rule["metric"])
+        message = rule.get("message", name)
+        limits = rule_limits(rule, tags)
+        crit_hit = limits["crit"] is not None and compare(value, limits["crit"])
+        warn_hit = crit_hit or (limits["warn"] is not None and compare(value, limits["warn"]))
+        warn_streak, crit_streak = streaks.get(name, (0, 0))
+        warn_streak = warn_streak + 1 if warn_hit else 0
+        crit_streak = crit_streak + 1 if crit_hit else 0
+        streaks[name] = (warn_streak, crit_streak)
+        if crit_streak >= limits["for"]:
+            warnings.append(f"✖ {message}")
+        elif warn_streak >= limits["for"]:
+            warnings.append(f"⚠ {message}")
+    return warnings
+
+def log_health(cpu, free_gb, rules, streaks):
     """Write a line to the log file with timestamp and status."""
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     status_line = f"[{timestamp}] CPU: {cpu:.2f}% | Free Disk: {free_gb:.2f} GB"
 
     # Detect warnings
-    warnings = []
-    if cpu > CPU_THRESHOLD:
-        warnings.append("⚠ High CPU usage")
-    if free_gb < DISK_THRESHOLD_GB:
-        warnings.append("⚠ Low disk space")
+    warnings = evaluate_rules(rules, {"cpu_percent": cpu, "free_disk_gb": free_gb}, streaks)
 
     # Combine everything into one log line
     if warnings:
@@ -42,9 +97,11 @@ def log_health(cpu, free_gb):
 
 def main():
     print("System Health Monitor Started. Press Ctrl+C to stop.\n")
+    rules = load_rules()
+    streaks = {}
     for i in range(5):
         cpu_usage, free_gb = check_system_health()
-        log_health(cpu_usage, free_gb)
+        log_health(cpu_usage, free_gb, rules, streaks)
         time.sleep(5)  # check every 5 seconds
 
 if __name__ == "__main__":
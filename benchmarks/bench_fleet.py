@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+import paramiko
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+if REPO_DIR not in sys.path:
+    sys.path.insert(0, REPO_DIR)
+
+import health_monitor
+
+STAGES = ["collection", "save_to_json", "save_to_csv", "report", "visualize_data"]
+SAMPLE_PROBE_OUTPUTS = {
+    "uptime": " 10:14:02 up 12 days,  3:41,  2 users,  load average: 0.08, 0.03, 0.01",
+    "df -h": (
+        "Filesystem      Size  Used Avail Use% Mounted on\n"
+        "udev            2.0G     0  2.0G   0% /dev\n"
+        "tmpfs           394M  1.6M  392M   1% /run\n"
+        "/dev/sda1        20G  8.1G   11G  43% /\n"
+        "/dev/sdb1       100G   50G   50G  50% /data"
+    ),
+    "free -m": (
+        "               total        used        free      shared  buff/cache   available\n"
+        "Mem:            3936        1234         987          12        1714        2400\n"
+        "Swap:           2047           0        2047"
+    )
+}
+
+
+class RSSSampler:
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.start = 0
+        self.peak = 0
+        self.end = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+    def current(self) -> int:
+        try:
+            with open('/proc/self/statm') as f:
+                return int(f.read().split()[1]) * self._page_size
+        except OSError:
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.current())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.start = self.peak = self.current()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self.end = self.current()
+        self.peak = max(self.peak, self.end)
+
+
+def build_outputs(module, mounts: int) -> Dict[str, str]:
+    outputs = dict(SAMPLE_PROBE_OUTPUTS)
+    lines = outputs["df -h"].split('\n')
+    for index in range(max(0, mounts - (len(lines) - 1))):
+        lines.append(f"/dev/mapper/vg-data{index:05d}   50G   21G   29G  42% /srv/data{index:05d}")
+    outputs["df -h"] = '\n'.join(lines)
+    return outputs
+
+
+def build_host_behaviours(hosts: int, args, outputs: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+    rng = random.Random(args.seed)
+    behaviours = {}
+    for index in range(hosts):
+        behaviour = {
+            "connect_latency": args.connect_latency / 1000.0,
+            "latency": args.latency / 1000.0,
+            "outputs": outputs
+        }
+        roll = rng.random()
+        if roll < args.failure_rate:
+            behaviour["fail"] = "auth" if rng.random() < 0.5 else "ssh"
+        elif roll < args.failure_rate + args.slow_banner_rate:
+            behaviour["connect_latency"] += args.slow_banner_seconds
+            if args.slow_banner_seconds > 20:
+                behaviour["fail"] = "ssh"
+        behaviours[f"sim-{index:05d}.example"] = behaviour
+    return behaviours
+
+
+class SimulatedStream:
+    def __init__(self, data: str):
+        self._data = data
+
+    def read(self) -> bytes:
+        return self._data.encode()
+
+
+class SimulatedSSHClient:
+    def __init__(self, module, behaviour: Dict[str, Any]):
+        self._module = module
+        self._behaviour = behaviour
+
+    def exec_command(self, command: str, timeout: float = None) -> tuple:
+        time.sleep(self._behaviour["latency"])
+        stdout, stderr = probe_response(self._module, self._behaviour["outputs"], command)
+        return None, SimulatedStream(stdout), SimulatedStream(stderr)
+
+    def close(self):
+        pass
+
+
+def probe_response(module, outputs: Dict[str, str], command: str) -> tuple:
+    if module.PROBE_MARKER.format("uptime") in command:
+        stdout, stderr = [], []
+        for section, section_command in module.PROBE_COMMANDS.items():
+            marker = module.PROBE_MARKER.format(section)
+            stdout += [marker, outputs.get(section_command, "")]
+            stderr.append(marker)
+        return '\n'.join(stdout), '\n'.join(stderr)
+    return outputs.get(command, ""), ""
+
+
+class InMemoryTransport(health_monitor.AsyncTransport):
+    def __init__(self, module, hosts: Dict[str, Dict[str, Any]], latency: float = 0.0):
+        self._module = module
+        self.hosts = hosts
+        self.latency = latency
+
+    async def connect(self, server_config: Dict[str, Any]) -> Dict[str, Any]:
+        behaviour = self.hosts.get(server_config["hostname"], {})
+        await asyncio.sleep(behaviour.get("connect_latency", behaviour.get("latency", self.latency)))
+        failure = behaviour.get("fail")
+        if failure == "auth":
+            raise paramiko.AuthenticationException("Authentication failed.")
+        if failure == "ssh":
+            raise paramiko.SSHException("Error reading SSH protocol banner")
+        if failure == "refused":
+            raise ConnectionRefusedError(111, "Connection refused")
+        if failure == "hang":
+            await asyncio.sleep(float('inf'))
+        return behaviour
+
+    async def run(self, session: Dict[str, Any], command: str, timeout: float = 30) -> tuple:
+        await asyncio.sleep(session.get("latency", self.latency))
+        return probe_response(self._module, session.get("outputs", SAMPLE_PROBE_OUTPUTS), command)
+
+    async def close(self, session: Dict[str, Any]):
+        return None
+
+
+def simulated_connect(module, behaviours: Dict[str, Dict[str, Any]]) -> Callable:
+    def connect(server_config: Dict[str, Any]) -> SimulatedSSHClient:
+        behaviour = behaviours[server_config["hostname"]]
+        time.sleep(min(behaviour["connect_latency"], 20))
+        if behaviour.get("fail") == "auth":
+            raise paramiko.AuthenticationException("Authentication failed.")
+        if behaviour.get("fail") == "ssh":
+            raise paramiko.SSHException("Error reading SSH protocol banner")
+        return SimulatedSSHClient(module, behaviour)
+
+    return connect
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    module = health_monitor
+    output_dir = args.output_dir or tempfile.mkdtemp(prefix='fleet-bench-')
+    monitor = module.ServerHealthMonitor(probe_mode=args.probe, output_dir=output_dir)
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.CRITICAL)
+    monitor.enable_async_logging(max_open_files=256)
+    if args.fast_dashboard:
+        monitor.enable_fast_dashboard()
+    monitor.dashboard_dpi = args.dpi
+
+    outputs = build_outputs(module, args.mounts)
+    behaviours = build_host_behaviours(args.hosts, args, outputs)
+    monitor.servers = [
+        {"name": hostname.split('.')[0], "hostname": hostname, "username": "bench", "password": "bench"}
+        for hostname in behaviours
+    ]
+
+    host_times = []
+    host_times_lock = threading.Lock()
+    if args.engine == "asyncio":
+        transport = InMemoryTransport(module, behaviours)
+        collect_one = monitor.collect_server_data_async
+
+        async def timed_collect_async(server_config, transport, host_timeout=60):
+            start = time.perf_counter()
+            try:
+                return await collect_one(server_config, transport, host_timeout)
+            finally:
+                host_times.append(time.perf_counter() - start)
+
+        monitor.collect_server_data_async = timed_collect_async
+        collect = lambda: asyncio.run(
+            monitor.collect_all_async(transport, concurrency=args.workers, host_timeout=args.host_timeout)
+        )
+    else:
+        monitor._open_ssh_client = simulated_connect(module, behaviours)
+        collect_one = monitor.collect_server_data
+
+        def timed_collect(server_config):
+            start = time.perf_counter()
+            try:
+                return collect_one(server_config)
+            finally:
+                with host_times_lock:
+                    host_times.append(time.perf_counter() - start)
+
+        monitor.collect_server_data = timed_collect
+        collect = lambda: monitor.collect_all(args.workers)
+
+    stage_functions = {
+        "collection": collect,
+        "save_to_json": monitor.save_to_json,
+        "save_to_csv": monitor.save_to_csv,
+        "report": monitor.generate_summary_report,
+        "visualize_data": monitor.visualize_data
+    }
+    results = {"hosts": args.hosts, "engine": args.engine, "workers": args.workers, "stages": {}}
+    with open(os.devnull, 'w') as devnull:
+        for stage in args.stages:
+            with RSSSampler() as sampler, contextlib.redirect_stdout(devnull):
+                start = time.perf_counter()
+                stage_functions[stage]()
+                elapsed = time.perf_counter() - start
+            results["stages"][stage] = {
+                "seconds": round(elapsed, 4),
+                "hosts_per_sec": round(args.hosts / elapsed, 1) if elapsed > 0 else None,
+                "rss_after_mb": round(sampler.end / (1024 * 1024), 1),
+                "rss_growth_mb": round((sampler.end - sampler.start) / (1024 * 1024), 1),
+                "stage_peak_mb": round((sampler.peak - sampler.start) / (1024 * 1024), 1)
+            }
+    monitor.close()
+    successful = monitor.collected_data.count_status("success")
+    results["successful"] = successful
+    results["failed"] = len(monitor.collected_data) - successful
+    results["per_host_seconds"] = {
+        "p50": round(percentile(host_times, 0.50), 4),
+        "p99": round(percentile(host_times, 0.99), 4),
+        "mean": round(statistics.fmean(host_times), 4) if host_times else 0.0
+    }
+    results["output_dir"] = output_dir
+    return results
+
+
+def print_results(results: Dict[str, Any]):
+    print(f"Simulated fleet: {results['hosts']} host(s), engine={results['engine']}, workers={results['workers']}")
+    print(f"  {results['successful']} successful, {results['failed']} failed")
+    per_host = results["per_host_seconds"]
+    print(f"  per-host time: p50={per_host['p50'] * 1000:.1f} ms, p99={per_host['p99'] * 1000:.1f} ms")
+    print(f"{'stage':<18}{'seconds':>10}{'hosts/s':>14}{'RSS after (MB)':>16}{'growth (MB)':>13}"
+          f"{'stage peak (MB)':>17}")
+    for stage, stats in results["stages"].items():
+        hosts_per_sec = f"{stats['hosts_per_sec']:,.1f}" if stats["hosts_per_sec"] else "-"
+        print(f"{stage:<18}{stats['seconds']:>10.3f}{hosts_per_sec:>14}{stats['rss_after_mb']:>16.1f}"
+              f"{stats['rss_growth_mb']:>+13.1f}{stats['stage_peak_mb']:>+17.1f}")
+    print(f"Output written to {results['output_dir']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='End-to-end throughput benchmark against a simulated fleet')
+    parser.add_argument('--hosts', type=int, default=1000, help='Number of simulated hosts (default: 1000)')
+    parser.add_argument('--engine', choices=['threads', 'asyncio'], default='threads')
+    parser.add_argument('--workers', type=int, default=100, help='Threads or asyncio concurrency (default: 100)')
+    parser.add_argument('--probe', choices=['commands', 'batched'], default='commands')
+    parser.add_argument('--latency', type=float, default=5, help='Per-command round trip in ms (default: 5)')
+    parser.add_argument('--connect-latency', type=float, default=20, help='Connect/auth time in ms (default: 20)')
+    parser.add_argument('--failure-rate', type=float, default=0.02,
+                        help='Fraction of hosts failing auth or SSH negotiation (default: 0.02)')
+    parser.add_argument('--slow-banner-rate', type=float, default=0.01,
+                        help='Fraction of hosts with a slow SSH banner (default: 0.01)')
+    parser.add_argument('--slow-banner-seconds', type=float, default=2,
+                        help='Extra connect delay for slow-banner hosts (default: 2)')
+    parser.add_argument('--mounts', type=int, default=4, help='Mount points in each simulated df output (default: 4)')
+    parser.add_argument('--host-timeout', type=float, default=60, help='Per-host timeout for asyncio (default: 60)')
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--fast-dashboard', action='store_true', help='Use the incremental dashboard renderer')
+    parser.add_argument('--dpi', type=int, default=100, help='Dashboard resolution (default: 100)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output-dir', type=str, help='Where result files go (default: a new temp directory)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--verbose', action='store_true', help='Keep INFO logging on the console')
+    args = parser.parse_args()
+
+    args.stages = [stage for stage in STAGES if stage in args.stages or stage == 'collection']
+    results = run_benchmark(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+
+import argparse
+import importlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict
+
+import numpy as np
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+
+def load_monitor_module():
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    module = importlib.import_module("health_monitor")
+    logging.disable(logging.CRITICAL)
+    return module
+
+
+def build_history(module, history_dir: str, hosts: int, days: float, interval: float, seed: int,
+                  now: float) -> Dict[str, Any]:
+    store = module.HealthHistoryStore(history_dir)
+    rng = np.random.default_rng(seed)
+    timestamps = np.arange(now - days * 86400, now, interval)
+    start = time.perf_counter()
+    for index in range(hosts):
+        server_name = f"sim-{index:05d}"
+        base_load = rng.random() * 2
+        values = {
+            "load_1min": base_load + rng.random(len(timestamps)),
+            "load_5min": base_load + rng.random(len(timestamps)) * 0.5,
+            "load_15min": base_load + rng.random(len(timestamps)) * 0.25,
+            "memory_usage_percent": 30 + rng.random() * 50 + rng.random(len(timestamps)) * 5
+        }
+        store.append_rows(store._series_dir(server_name), timestamps, module.ROLLUP_METRICS, values)
+        growth = np.linspace(0, rng.random() * 10, len(timestamps))
+        store.append_rows(store._series_dir(server_name, "/"), timestamps, ["use_percent"],
+                          {"use_percent": 20 + rng.random() * 50 + growth})
+    written = time.perf_counter() - start
+    rollup = module.HistoryRollup(store, retention={"raw": None})
+    start = time.perf_counter()
+    rollup.run(now)
+    return {"store": store, "rollup": rollup, "write_seconds": written, "rollup_seconds": time.perf_counter() - start}
+
+
+def timed(function: Callable, repeat: int) -> tuple:
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark fleet-wide queries over the health history store')
+    parser.add_argument('--hosts', type=int, default=10000, help='Number of simulated hosts (default: 10000)')
+    parser.add_argument('--days', type=float, default=7, help='Days of history per host (default: 7)')
+    parser.add_argument('--interval', type=float, default=300, help='Seconds between raw samples (default: 300)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per query, best is reported (default: 3)')
+    parser.add_argument('--history-dir', type=str,
+                        help='Reuse or create history here instead of a temporary directory')
+    parser.add_argument('--target', type=float, default=1.0,
+                        help='Fail if a week-long query takes longer than this many seconds (default: 1.0)')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    module = load_monitor_module()
+    history_dir = args.history_dir or tempfile.mkdtemp(prefix='history-bench-')
+    now = time.time()
+    results = {"hosts": args.hosts, "days": args.days, "queries": {}}
+    try:
+        if os.path.isdir(os.path.join(history_dir, module.ROLLUP_DIR)):
+            store = module.HealthHistoryStore(history_dir)
+            rollup = module.HistoryRollup(store)
+        else:
+            built = build_history(module, history_dir, args.hosts, args.days, args.interval, args.seed, now)
+            store, rollup = built["store"], built["rollup"]
+            results["write_seconds"] = round(built["write_seconds"], 2)
+            results["rollup_seconds"] = round(built["rollup_seconds"], 2)
+        query = module.HistoryQuery(store, rollup)
+        week = now - args.days * 86400
+        groups = {f"sim-{index:05d}": [f"rack-{index % 40:02d}", "prod" if index % 3 else "staging"]
+                  for index in range(args.hosts)}
+        queries = {
+            "p95_load_5min_24h": lambda: query.percentiles("load_5min", [95], start=now - 86400),
+            "p95_load_5min_week": lambda: query.percentiles("load_5min", [95], start=week),
+            "top20_root_disk_growth_week": lambda: query.top_growth(n=20, start=week),
+            "memory_by_tag_week": lambda: query.group_by("memory_usage_percent", groups, start=week)
+        }
+        failures = []
+        for name, function in queries.items():
+            seconds, result = timed(function, args.repeat)
+            results["queries"][name] = {"seconds": round(seconds, 4), "rows": len(result)}
+            if name.endswith("_week") and seconds > args.target:
+                failures.append(f"{name}: {seconds:.3f}s is over the {args.target:.1f}s target")
+    finally:
+        if not args.history_dir:
+            shutil.rmtree(history_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"History: {args.hosts} host(s) x {args.days:g} day(s)")
+        if "write_seconds" in results:
+            print(f"  built in {results['write_seconds']:.1f}s, rolled up in {results['rollup_seconds']:.1f}s")
+        print(f"{'query':<32}{'seconds':>10}{'rows':>8}")
+        for name, stats in results["queries"].items():
+            print(f"{name:<32}{stats['seconds']:>10.3f}{stats['rows']:>8}")
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+
+import argparse
+import gc
+import glob
+import hashlib
+import importlib
+import logging
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURES_DIR = os.path.join(BENCH_DIR, 'fixtures')
+REPO_DIR = os.path.dirname(BENCH_DIR)
+
+
+def load_monitor():
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+    module = importlib.import_module("health_monitor")
+    logging.disable(logging.CRITICAL)
+    return module.ServerHealthMonitor.__new__(module.ServerHealthMonitor)
+
+
+def reference_parse_uptime(uptime_output: str) -> Dict[str, Any]:
+    try:
+        if not uptime_output:
+            return {"load_1min": 0, "load_5min": 0, "load_15min": 0, "uptime_string": "Unknown"}
+        parts = uptime_output.split('load average:')
+        load_avg = parts[1].strip().split(',') if len(parts) > 1 else ['0', '0', '0']
+        return {
+            "load_1min": float(load_avg[0].strip()),
+            "load_5min": float(load_avg[1].strip()),
+            "load_15min": float(load_avg[2].strip()),
+            "uptime_string": parts[0].strip() if parts else uptime_output
+        }
+    except Exception:
+        return {"load_1min": 0, "load_5min": 0, "load_15min": 0, "uptime_string": "Unknown"}
+
+
+def reference_parse_disk_usage(df_output: str) -> List[Dict[str, str]]:
+    disks = []
+    try:
+        if not df_output:
+            return disks
+        lines = df_output.split('\n')[1:]
+        for line in lines:
+            if line.strip() and not line.startswith('tmpfs') and not line.startswith('udev'):
+                parts = line.split()
+                if len(parts) >= 6:
+                    disks.append({
+                        "filesystem": parts[0],
+                        "size": parts[1],
+                        "used": parts[2],
+                        "available": parts[3],
+                        "use_percent": parts[4].rstrip('%'),
+                        "mounted_on": parts[5]
+                    })
+        return disks
+    except Exception:
+        return []
+
+
+def reference_parse_memory_usage(free_output: str) -> Dict[str, int]:
+    try:
+        if not free_output:
+            return {}
+        lines = free_output.split('\n')
+        if len(lines) < 3:
+            return {}
+        memory_line = lines[1].split()
+        swap_line = lines[2].split()
+        memory_data = {
+            "memory_total": int(memory_line[1]),
+            "memory_used": int(memory_line[2]),
+            "memory_free": int(memory_line[3]),
+            "memory_available": int(memory_line[6]) if len(memory_line) > 6 else 0
+        }
+        if len(swap_line) >= 4:
+            memory_data.update({
+                "swap_total": int(swap_line[1]),
+                "swap_used": int(swap_line[2]),
+                "swap_free": int(swap_line[3])
+            })
+        if memory_data["memory_total"] > 0:
+            memory_data["memory_usage_percent"] = round(
+                (memory_data["memory_used"] / memory_data["memory_total"]) * 100, 2
+            )
+        return memory_data
+    except Exception:
+        return {}
+
+
+def build_bind_mount_df(mount_count: int = 5000) -> str:
+    with open(os.path.join(FIXTURES_DIR, 'df_k8s_node_template.txt')) as f:
+        lines = f.read().strip().split('\n')
+    static = [line for line in lines if '{id}' not in line]
+    templates = [line for line in lines if '{id}' in line]
+    output = list(static)
+    for index in range(mount_count):
+        pod_id = hashlib.sha256(str(index).encode()).hexdigest()
+        output.append(templates[index % len(templates)].replace('{id}', pod_id))
+    return '\n'.join(output)
+
+
+def load_fixtures() -> Dict[str, Dict[str, str]]:
+    fixtures = {"uptime": {}, "df": {}, "free": {}}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.txt'))):
+        name = os.path.basename(path)[:-4]
+        kind = name.split('_', 1)[0]
+        if kind in fixtures and not name.endswith('_template'):
+            with open(path) as f:
+                fixtures[kind][name] = f.read().strip()
+    fixtures["df"]["df_5000_bind_mounts"] = build_bind_mount_df(5000)
+    return fixtures
+
+
+def count_records(result: Any) -> int:
+    return len(result) if isinstance(result, list) else 1
+
+
+def time_parser(parser: Callable, samples: List[str], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for sample in samples:
+            parser(sample)
+    return time.perf_counter() - start
+
+
+def measure(fast: Callable, reference: Callable, samples: List[str], min_time: float,
+            repeat: int = 9) -> Dict[str, float]:
+    records = sum(count_records(fast(sample)) for sample in samples)
+    iterations = 1
+    while time_parser(fast, samples, iterations) * repeat * 2 < min_time:
+        iterations *= 2
+    fast_best = reference_best = float('inf')
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            fast_best = min(fast_best, time_parser(fast, samples, iterations))
+            reference_best = min(reference_best, time_parser(reference, samples, iterations))
+    finally:
+        gc.enable()
+    return {
+        "records_per_sec": iterations * records / fast_best,
+        "reference_records_per_sec": iterations * records / reference_best
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the uptime/df/free parsers')
+    parser.add_argument('--min-time', type=float, default=1.0, help='Seconds to run each benchmark (default: 1.0)')
+    parser.add_argument('--check', action='store_true',
+                        help='Fail if a parser is slower than its reference implementation')
+    parser.add_argument('--noise', type=float, default=0.05,
+                        help='Timing noise allowed below a 1.0x speedup before --check fails (default: 0.05)')
+    args = parser.parse_args()
+
+    monitor = load_monitor()
+    fixtures = load_fixtures()
+    suites = [
+        ("uptime", monitor.parse_uptime, reference_parse_uptime, list(fixtures["uptime"].items())),
+        ("df", monitor.parse_disk_usage, reference_parse_disk_usage,
+         [(name, text) for name, text in fixtures["df"].items() if name != "df_5000_bind_mounts"]),
+        ("df_5000_bind_mounts", monitor.parse_disk_usage, reference_parse_disk_usage,
+         [("df_5000_bind_mounts", fixtures["df"]["df_5000_bind_mounts"])]),
+        ("free", monitor.parse_memory_usage, reference_parse_memory_usage, list(fixtures["free"].items()))
+    ]
+
+    failures = []
+    for name, fast, reference, samples in suites:
+        for fixture_name, text in samples:
+            if fast(text) != reference(text):
+                failures.append(f"{name}: output differs from reference on {fixture_name}")
+
+    print(f"{'parser':<22}{'records/s':>14}{'reference':>14}{'speedup':>10}")
+    for name, fast, reference, samples in suites:
+        texts = [text for _, text in samples]
+        stats = measure(fast, reference, texts, args.min_time)
+        speedup = stats["records_per_sec"] / stats["reference_records_per_sec"]
+        print(f"{name:<22}{stats['records_per_sec']:>14,.0f}{stats['reference_records_per_sec']:>14,.0f}"
+              f"{speedup:>9.2f}x")
+        if args.check and speedup < 1 - args.noise:
+            failures.append(f"{name}: slower than the reference parser ({speedup:.2f}x)")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
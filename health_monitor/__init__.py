@@ -0,0 +1,24 @@
+from .units import parse_size_to_bytes, parse_duration, to_epoch
+from .history import HISTORY_COLUMNS, DISK_HISTORY_COLUMNS, ROLLUP_DIR, FLEET_DIR, HealthHistoryStore
+from .rollup import (
+    ROLLUP_TIERS, ROLLUP_METRICS, DISK_ROLLUP_METRICS, ROLLUP_STATS, ROLLUP_RETENTION, RETENTION_CHECK_INTERVAL,
+    rollup_columns, HistoryRollup
+)
+from .query import group_percentiles, HistoryQuery
+from .streaming import CSV_HEADER, StreamingResultWriter
+from .host_table import UPTIME_FIELDS, MEMORY_FIELDS, DISK_FIELDS, HostTable
+from .report import REPORT_METRICS, failure_reason, summarize_fleet
+from .delta import DELTA_DEADBANDS, flatten_sample, DeltaRecorder
+from .breakers import CircuitBreakerRegistry
+from .alerts import DEFAULT_ALERT_RULES, ALERT_LEVELS, load_alert_rules, AlertRuleEngine
+from .anomaly import ANOMALY_METRICS, AnomalyDetector
+from .exporter import render_prometheus, MetricsExporter
+from .snapshot import SnapshotWriter
+from .profiling import PhaseTimings, StackSampler, start_profiler, stop_profiler
+from .dashboard import DashboardRenderer
+from .async_logging import DroppingQueueHandler, PerServerFileRouter, AsyncServerLogging
+from .transports import AsyncTransport, ParamikoExecutorTransport
+from .pool import SSHConnectionPool
+from .inventory import expand_host_ranges, ServerInventory
+from .monitor import PROBE_COMMANDS, PROBE_MARKER, PROBE_TIMEOUT, ServerHealthMonitor, collect_shard
+from .cli import create_sample_config, main
@@ -0,0 +1,178 @@
+import json
+from datetime import datetime
+import numpy as np
+from typing import Dict, List, Any, Optional
+import os
+
+from .host_table import HostTable
+
+
+DEFAULT_ALERT_RULES = [
+    {"name": "load_1min", "metric": "load_1min", "warn": 1.0, "crit": 2.0},
+    {"name": "load_5min", "metric": "load_5min", "warn": 1.0, "crit": 2.0},
+    {"name": "load_15min", "metric": "load_15min", "warn": 1.0, "crit": 2.0}
+]
+ALERT_OPERATORS = {">": np.greater, ">=": np.greater_equal, "<": np.less, "<=": np.less_equal}
+ALERT_LEVELS = ["ok", "warning", "critical"]
+LEVEL_LABELS = ["✅ Good", "⚠️ High", "❌ Critical"]
+
+
+def load_alert_rules(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        document = json.load(f)
+    return document["rules"] if isinstance(document, dict) else document
+
+
+class AlertRuleEngine:
+    def __init__(self, rules: Optional[List[Dict[str, Any]]] = None, state_path: Optional[str] = None):
+        self.rules = [self._normalize(rule) for rule in (rules if rules is not None else DEFAULT_ALERT_RULES)]
+        self.state_path = state_path
+        self._slots = {}
+        self._state = {rule["name"]: np.zeros((3, 0), dtype=np.int32) for rule in self.rules}
+        if state_path and os.path.exists(state_path):
+            with open(state_path) as f:
+                saved = json.load(f)
+            self._slots = {name: index for index, name in enumerate(saved["hosts"])}
+            for name, state in saved["rules"].items():
+                if name in self._state:
+                    self._state[name] = np.array(state, dtype=np.int32).reshape(3, len(self._slots))
+
+    def _normalize(self, rule: Dict[str, Any]) -> Dict[str, Any]:
+        if "metric" not in rule or ("warn" not in rule and "crit" not in rule):
+            raise ValueError(f"alert rule needs a metric and a warn or crit threshold: {rule}")
+        if rule.get("op", ">=") not in ALERT_OPERATORS:
+            raise ValueError(f"alert rule operator must be one of {', '.join(ALERT_OPERATORS)}: {rule}")
+        return {
+            "name": rule.get("name", rule["metric"]),
+            "metric": rule["metric"],
+            "op": rule.get("op", ">="),
+            "warn": float(rule.get("warn", np.nan)),
+            "crit": float(rule.get("crit", np.nan)),
+            "for": max(1, int(rule.get("for", 1))),
+            "overrides": rule.get("overrides", {})
+        }
+
+    def threshold(self, metric: str, level: str = "warn") -> Optional[float]:
+        for rule in self.rules:
+            if rule["metric"] == metric and rule[level] == rule[level]:
+                return rule[level]
+        return None
+
+    def thresholds(self, level: str = "warn") -> Dict[str, float]:
+        thresholds = {}
+        for rule in self.rules:
+            if rule[level] == rule[level]:
+                thresholds.setdefault(rule["metric"], rule[level])
+        return thresholds
+
+    def _limits(self, rule: Dict[str, Any], names: List[str], tags: Dict[str, List[str]]) -> tuple:
+        warn = np.full(len(names), rule["warn"])
+        crit = np.full(len(names), rule["crit"])
+        consecutive = np.full(len(names), rule["for"], dtype=np.int32)
+        for tag, override in rule["overrides"].items():
+            mask = np.fromiter((tag in tags.get(name, ()) for name in names), dtype=bool, count=len(names))
+            if not mask.any():
+                continue
+            if "warn" in override:
+                warn[mask] = float(override["warn"])
+            if "crit" in override:
+                crit[mask] = float(override["crit"])
+            if "for" in override:
+                consecutive[mask] = max(1, int(override["for"]))
+        return warn, crit, consecutive
+
+    def _hits(self, rule: Dict[str, Any], table: HostTable, names: List[str],
+              tags: Dict[str, List[str]]) -> tuple:
+        values = table.column(rule["metric"])
+        warn, crit, consecutive = self._limits(rule, names, tags)
+        compare = ALERT_OPERATORS[rule["op"]]
+        with np.errstate(invalid='ignore'):
+            warn_hit = compare(values, warn) & ~np.isnan(warn)
+            crit_hit = compare(values, crit) & ~np.isnan(crit)
+        observed = table.success_mask() & ~np.isnan(values)
+        return values, warn, crit, consecutive, warn_hit & observed, crit_hit & observed, observed
+
+    def classify(self, table: HostTable, tags: Optional[Dict[str, List[str]]] = None) -> Dict[str, np.ndarray]:
+        names = list(table)
+        levels = {}
+        for rule in self.rules:
+            _, _, _, _, warn_hit, crit_hit, _ = self._hits(rule, table, names, tags or {})
+            level = np.where(crit_hit, 2, np.where(warn_hit, 1, 0))
+            levels[rule["metric"]] = np.maximum(levels[rule["metric"]], level) if rule["metric"] in levels else level
+        return levels
+
+    def _host_slots(self, names: List[str]) -> np.ndarray:
+        for name in names:
+            if name not in self._slots:
+                self._slots[name] = len(self._slots)
+        for rule_name, state in self._state.items():
+            if state.shape[1] < len(self._slots):
+                padding = np.zeros((3, len(self._slots) - state.shape[1]), dtype=np.int32)
+                self._state[rule_name] = np.concatenate([state, padding], axis=1)
+        return np.fromiter((self._slots[name] for name in names), dtype=np.int64, count=len(names))
+
+    def evaluate(self, table: HostTable, tags: Optional[Dict[str, List[str]]] = None,
+                 timestamp: Optional[str] = None) -> List[Dict[str, Any]]:
+        names = list(table)
+        slots = self._host_slots(names)
+        timestamp = timestamp or datetime.now().isoformat()
+        transitions = []
+        for rule in self.rules:
+            values, warn, crit, consecutive, warn_hit, crit_hit, observed = self._hits(rule, table, names, tags or {})
+            state = self._state[rule["name"]]
+            warn_streak = np.where(observed, np.where(warn_hit | crit_hit, state[0, slots] + 1, 0), state[0, slots])
+            crit_streak = np.where(observed, np.where(crit_hit, state[1, slots] + 1, 0), state[1, slots])
+            previous = state[2, slots]
+            level = np.where(crit_streak >= consecutive, 2, np.where(warn_streak >= consecutive, 1, 0))
+            level = np.where(observed, level, previous)
+            state[0, slots] = warn_streak
+            state[1, slots] = crit_streak
+            state[2, slots] = level
+            for index in np.flatnonzero(level != previous).tolist():
+                threshold = crit[index] if level[index] == 2 else warn[index]
+                transitions.append({
+                    "timestamp": timestamp,
+                    "rule": rule["name"],
+                    "server": names[index],
+                    "metric": rule["metric"],
+                    "from": ALERT_LEVELS[previous[index]],
+                    "to": ALERT_LEVELS[level[index]],
+                    "value": round(float(values[index]), 4),
+                    "threshold": None if level[index] == 0 else float(threshold)
+                })
+        return transitions
+
+    def active(self) -> List[Dict[str, Any]]:
+        names = list(self._slots)
+        alerts = []
+        for rule in self.rules:
+            levels = self._state[rule["name"]][2]
+            for index in np.flatnonzero(levels).tolist():
+                alerts.append({"rule": rule["name"], "server": names[index], "level": ALERT_LEVELS[levels[index]]})
+        return alerts
+
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        counts = {}
+        for rule in self.rules:
+            levels = self._state[rule["name"]][2]
+            warning, critical = int((levels == 1).sum()), int((levels == 2).sum())
+            if warning or critical:
+                counts[rule["name"]] = {"warning": warning, "critical": critical}
+        return counts
+
+    def forget(self, server_names: List[str]):
+        slots = [self._slots[name] for name in server_names if name in self._slots]
+        for state in self._state.values():
+            state[:, slots] = 0
+
+    def save(self):
+        if not self.state_path:
+            return
+        state = json.dumps({
+            "hosts": list(self._slots),
+            "rules": {name: state.ravel().tolist() for name, state in self._state.items()}
+        })
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(state)
+        os.replace(temp_path, self.state_path)
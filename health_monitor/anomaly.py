@@ -0,0 +1,121 @@
+from datetime import datetime
+import numpy as np
+from typing import Dict, List, Any, Optional
+import os
+
+from .host_table import HostTable
+
+
+ANOMALY_METRICS = ["load_1min", "load_5min", "load_15min", "memory_usage_percent", "root_disk_percent"]
+ANOMALY_MIN_STD = {
+    "load_1min": 0.1,
+    "load_5min": 0.05,
+    "load_15min": 0.05,
+    "memory_usage_percent": 1.0,
+    "root_disk_percent": 0.5
+}
+
+
+class AnomalyDetector:
+    def __init__(self, state_path: Optional[str] = None, alpha: float = 0.1, threshold: float = 4.0,
+                 warmup: int = 10, metrics: Optional[List[str]] = None):
+        self.state_path = state_path
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.metrics = list(metrics or ANOMALY_METRICS)
+        self._slots = {}
+        self._last_seen = np.zeros(0)
+        self._state = {metric: np.zeros((4, 0)) for metric in self.metrics}
+        self.current = {}
+        if state_path and os.path.exists(state_path):
+            with np.load(state_path) as saved:
+                self._slots = {str(name): index for index, name in enumerate(saved["hosts"])}
+                self._last_seen = saved["last_seen"]
+                for metric in self.metrics:
+                    if metric in saved.files:
+                        self._state[metric] = saved[metric]
+
+    def _host_slots(self, names: List[str]) -> np.ndarray:
+        for name in names:
+            if name not in self._slots:
+                self._slots[name] = len(self._slots)
+        size = len(self._slots)
+        if len(self._last_seen) < size:
+            self._last_seen = np.concatenate([self._last_seen, np.full(size - len(self._last_seen), -np.inf)])
+        for metric, state in self._state.items():
+            if state.shape[1] < size:
+                self._state[metric] = np.concatenate([state, np.zeros((4, size - state.shape[1]))], axis=1)
+        return np.fromiter((self._slots[name] for name in names), dtype=np.int64, count=len(names))
+
+    def update(self, table: HostTable, timestamp: Optional[str] = None) -> List[Dict[str, Any]]:
+        names = list(table)
+        slots = self._host_slots(names)
+        timestamp = timestamp or datetime.now().isoformat()
+        sampled = table.column("timestamp")
+        fresh = table.success_mask() & ~(sampled <= self._last_seen[slots])
+        self._last_seen[slots] = np.where(fresh & ~np.isnan(sampled), sampled, self._last_seen[slots])
+        transitions = []
+        current = {}
+        for metric in self.metrics:
+            values = table.column(metric)
+            state = self._state[metric]
+            mean, variance, count, last_score = (state[row, slots] for row in range(4))
+            update = fresh & ~np.isnan(values)
+            std = np.maximum(np.sqrt(variance), ANOMALY_MIN_STD.get(metric, 0.0))
+            score = np.where(update & (count >= max(self.warmup, 1)), (values - mean) / std, 0.0)
+            score = np.where(update, score, last_score)
+            first = update & (count == 0)
+            difference = np.where(update, values - mean, 0.0)
+            increment = self.alpha * difference
+            state[0, slots] = np.where(first, values, mean + increment)
+            state[1, slots] = np.where(first, 0.0, np.where(update, (1 - self.alpha) * (variance + difference * increment),
+                                                             variance))
+            state[2, slots] = count + update
+            state[3, slots] = score
+            flagged = np.abs(last_score) >= self.threshold
+            now_flagged = np.abs(score) >= self.threshold
+            for index in np.flatnonzero(now_flagged).tolist():
+                current.setdefault(names[index], []).append({
+                    "metric": metric,
+                    "value": round(float(values[index]), 4),
+                    "baseline": round(float(mean[index]), 4),
+                    "std": round(float(std[index]), 4),
+                    "score": round(float(score[index]), 2)
+                })
+            for index in np.flatnonzero(now_flagged != flagged).tolist():
+                transitions.append({
+                    "timestamp": timestamp,
+                    "rule": f"anomaly:{metric}",
+                    "server": names[index],
+                    "metric": metric,
+                    "from": "anomaly" if flagged[index] else "ok",
+                    "to": "anomaly" if now_flagged[index] else "ok",
+                    "value": round(float(values[index]), 4),
+                    "baseline": round(float(mean[index]), 4),
+                    "score": round(float(score[index]), 2)
+                })
+        self.current = current
+        return transitions
+
+    def baseline(self, server_name: str, metric: str) -> Optional[Dict[str, float]]:
+        slot = self._slots.get(server_name)
+        if slot is None or slot >= self._state[metric].shape[1]:
+            return None
+        mean, variance, count, _ = self._state[metric][:, slot]
+        return {"mean": float(mean), "std": float(np.sqrt(variance)), "samples": int(count)}
+
+    def forget(self, server_names: List[str]):
+        slots = [self._slots[name] for name in server_names if name in self._slots]
+        for state in self._state.values():
+            state[:, slots] = 0
+        self._last_seen[slots] = -np.inf
+        for name in server_names:
+            self.current.pop(name, None)
+
+    def save(self):
+        if not self.state_path:
+            return
+        temp_path = f"{self.state_path}.tmp.npz"
+        np.savez(temp_path, hosts=np.array(list(self._slots), dtype=str), last_seen=self._last_seen, **self._state)
+        os.replace(temp_path, self.state_path)
@@ -0,0 +1,92 @@
+import logging
+import logging.handlers
+import queue
+from collections import OrderedDict
+from typing import Dict
+import os
+import threading
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+        self._dropped_lock = threading.Lock()
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped += 1
+
+
+class PerServerFileRouter(logging.Handler):
+    def __init__(self, logs_dir: str, max_open_files: int = 256, max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 3):
+        super().__init__()
+        self.logs_dir = logs_dir
+        self.max_open_files = max_open_files
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._handlers = OrderedDict()
+        self.records_written = 0
+        self.files_evicted = 0
+
+    def _handler_for(self, server_name: str) -> logging.Handler:
+        handler = self._handlers.get(server_name)
+        if handler is not None:
+            self._handlers.move_to_end(server_name)
+            return handler
+        handler = logging.handlers.RotatingFileHandler(
+            os.path.join(self.logs_dir, f'{server_name}.log'),
+            maxBytes=self.max_bytes,
+            backupCount=self.backup_count
+        )
+        handler.setFormatter(self.formatter)
+        self._handlers[server_name] = handler
+        while len(self._handlers) > self.max_open_files:
+            _, evicted = self._handlers.popitem(last=False)
+            evicted.close()
+            self.files_evicted += 1
+        return handler
+
+    def emit(self, record: logging.LogRecord):
+        server_name = record.name[len("server_"):] if record.name.startswith("server_") else record.name
+        try:
+            self._handler_for(server_name).emit(record)
+            self.records_written += 1
+        except Exception:
+            self.handleError(record)
+
+    def open_files(self) -> int:
+        return len(self._handlers)
+
+    def close(self):
+        while self._handlers:
+            _, handler = self._handlers.popitem(last=False)
+            handler.close()
+        super().close()
+
+
+class AsyncServerLogging:
+    def __init__(self, logs_dir: str, max_open_files: int = 256, max_bytes: int = 10 * 1024 * 1024,
+                 backup_count: int = 3, queue_size: int = 100000):
+        self.router = PerServerFileRouter(logs_dir, max_open_files, max_bytes, backup_count)
+        self.router.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+        self.queue_handler = DroppingQueueHandler(queue.Queue(maxsize=queue_size))
+        self.listener = logging.handlers.QueueListener(self.queue_handler.queue, self.router)
+        self.listener.start()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queued": self.queue_handler.queue.qsize(),
+            "dropped": self.queue_handler.dropped,
+            "written": self.router.records_written,
+            "open_files": self.router.open_files(),
+            "files_evicted": self.router.files_evicted
+        }
+
+    def stop(self):
+        self.listener.stop()
+        self.router.close()
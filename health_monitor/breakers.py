@@ -0,0 +1,71 @@
+import json
+from typing import Dict, Any, Optional
+import os
+import threading
+import time
+
+
+class CircuitBreakerRegistry:
+    def __init__(self, state_path: str, failure_threshold: int = 3, base_backoff: float = 60,
+                 max_backoff: float = 3600):
+        self.state_path = state_path
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._lock = threading.Lock()
+        self._probing = set()
+        self._breakers = {}
+        if os.path.exists(state_path):
+            with open(state_path) as f:
+                self._breakers = json.load(f)
+
+    def check(self, server_name: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        now = time.time() if now is None else now
+        with self._lock:
+            breaker = self._breakers.get(server_name)
+            if breaker is None or breaker["state"] == "closed":
+                return None
+            if server_name in self._probing or (breaker["state"] == "open" and now < breaker["open_until"]):
+                return dict(breaker)
+            breaker["state"] = "half_open"
+            self._probing.add(server_name)
+            return None
+
+    def record_success(self, server_name: str):
+        with self._lock:
+            self._probing.discard(server_name)
+            self._breakers.pop(server_name, None)
+
+    def release(self, server_name: str):
+        with self._lock:
+            self._probing.discard(server_name)
+
+    def record_failure(self, server_name: str, error: str, now: Optional[float] = None) -> Dict[str, Any]:
+        now = time.time() if now is None else now
+        with self._lock:
+            self._probing.discard(server_name)
+            breaker = self._breakers.setdefault(server_name, {"state": "closed", "failures": 0, "open_until": 0})
+            breaker["failures"] += 1
+            breaker["last_error"] = error
+            breaker["last_failure"] = now
+            if breaker["state"] == "half_open" or breaker["failures"] >= self.failure_threshold:
+                exponent = breaker["failures"] - self.failure_threshold
+                backoff = min(self.max_backoff, self.base_backoff * 2 ** min(max(exponent, 0), 32))
+                breaker["state"] = "open"
+                breaker["open_until"] = now + backoff
+            return dict(breaker)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {"open": 0, "half_open": 0, "closed": 0}
+            for breaker in self._breakers.values():
+                counts[breaker["state"]] += 1
+            return counts
+
+    def save(self):
+        with self._lock:
+            state = json.dumps(self._breakers)
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w') as f:
+            f.write(state)
+        os.replace(temp_path, self.state_path)
@@ -0,0 +1,243 @@
+import json
+import logging
+import sys
+import signal
+
+from .units import parse_duration
+from .rollup import ROLLUP_RETENTION
+from .report import REPORT_DETAIL_LIMIT
+from .profiling import start_profiler, stop_profiler
+from .monitor import ServerHealthMonitor
+
+
+def create_sample_config():
+    sample_config = [
+        {
+            "name": "ubuntu-vm",
+            "hostname": "192.168.1.37",
+            "username": "player01",
+            "password": "123",
+            "port": 22
+        },
+        {
+            "name": "redhat-vm", 
+            "hostname": "192.168.1.24",
+            "username": "neon",
+            "password": "neon",
+            "port": 22
+        }
+    ]
+    with open('servers_config.json', 'w') as f:
+        json.dump(sample_config, f, indent=2)
+    print("📝 Sample configuration file created: 'servers_config.json'")
+    print("💡 Edit this file with your server details and use: --config servers_config.json")
+
+
+def main():
+    import argparse
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler('server_health_main.log'),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    parser = argparse.ArgumentParser(description='Remote Server Health Dashboard')
+    parser.add_argument('--config', action='append',
+                        help='Server inventory file or glob (.json list, .json with defaults/include/servers, or '
+                             '.jsonl); repeatable. Names like web[001-500] expand to ranges')
+    parser.add_argument('--tag', action='append', help='Only check servers carrying this tag (repeatable)')
+    parser.add_argument('--output-dir', type=str, help='Directory for logs and result files (default: script directory)')
+    parser.add_argument('--no-viz', action='store_true', help='Disable visualization')
+    parser.add_argument('--create-config', action='store_true', help='Create sample configuration file')
+    parser.add_argument('--probe', choices=['commands', 'batched', 'proc'], default='commands',
+                        help='Run uptime/df/free as separate commands, as one batched command, '
+                             'or read /proc and statvfs over SFTP without spawning remote processes')
+    parser.add_argument('--workers', type=int,
+                        help='Number of servers to check in parallel (default: 1, daemon: 10, asyncio: 500)')
+    parser.add_argument('--history-dir', type=str,
+                        help='Append every sample to a columnar history store in this directory')
+    parser.add_argument('--rollup', action='store_true',
+                        help='Downsample --history-dir into 1m/1h/1d tiers of min/max/mean/last after each pass')
+    parser.add_argument('--retention', action='append', default=[], metavar='TIER=DURATION',
+                        help='How long a history tier is kept with --rollup, e.g. raw=7d or 1d=forever '
+                             '(repeatable; defaults: raw=7d, 1m=30d, 1h=400d, 1d=forever)')
+    parser.add_argument('--query', choices=['percentiles', 'top-growth', 'group-by'],
+                        help='Answer a fleet-wide question from --history-dir and exit: per-server percentiles, '
+                             'fastest growing servers, or a metric grouped by tag')
+    parser.add_argument('--metric', type=str,
+                        help='Metric for --query (default: load_5min, use_percent or memory_usage_percent)')
+    parser.add_argument('--since', type=str, default='24h', help='How far back --query looks, e.g. 24h or 7d (default: 24h)')
+    parser.add_argument('--percentile', type=float, action='append',
+                        help='Percentile reported by --query (repeatable, default: 50 95 99)')
+    parser.add_argument('--stat', choices=['max', 'mean', 'min', 'last'], default='max',
+                        help='Rollup column used by --query percentiles and group-by when the range is served from '
+                             'a 1m/1h/1d tier: each bucket counts as one sample of this statistic, so the default '
+                             'max keeps short spikes that mean would average away, and the results are labelled '
+                             'with it, e.g. p95_max; the bucket still filling comes from the partial bucket the '
+                             'rollup keeps (default: max)')
+    parser.add_argument('--limit', type=int, default=20, help='Servers listed by --query top-growth (default: 20)')
+    parser.add_argument('--mount', type=str, default='/', help='Mount point for --query top-growth (default: /)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write each server to NDJSON/CSV as soon as it finishes instead of at the end; '
+                             'results are still kept in memory for the report, alerts and dashboard')
+    parser.add_argument('--dpi', type=int, help='Dashboard image resolution (default: 300, fast dashboard: 100)')
+    parser.add_argument('--fast-dashboard', action='store_true',
+                        help='Reuse dashboard figures between passes and aggregate large fleets')
+    parser.add_argument('--dashboard-max-hosts', type=int, default=50,
+                        help='Above this many servers the fast dashboard shows histograms and top-N (default: 50)')
+    parser.add_argument('--top-n', type=int, default=20, help='Servers shown in fast dashboard top-N panels (default: 20)')
+    parser.add_argument('--async-logging', action='store_true',
+                        help='Write per-server logs from one background thread with a bounded set of open files')
+    parser.add_argument('--log-max-open-files', type=int, default=256,
+                        help='Per-server log files kept open with --async-logging (default: 256)')
+    parser.add_argument('--log-max-bytes', type=int, default=10 * 1024 * 1024,
+                        help='Rotate per-server logs at this size with --async-logging (default: 10 MB)')
+    parser.add_argument('--log-queue-size', type=int, default=100000,
+                        help='Server log records buffered with --async-logging before dropping (default: 100000)')
+    parser.add_argument('--processes', type=int, default=1,
+                        help='Split the server list across this many collector processes (default: 1)')
+    parser.add_argument('--engine', choices=['threads', 'asyncio'], default='threads',
+                        help='Collection engine: thread pool or a single asyncio event loop (default: threads)')
+    parser.add_argument('--host-timeout', type=float, default=60,
+                        help='Per-server time limit for the asyncio engine in seconds (default: 60)')
+    parser.add_argument('--delta', action='store_true',
+                        help='Also record only the metrics that changed since the last reported value to '
+                             'server_health_delta.ndjson/.csv, with periodic keyframes')
+    parser.add_argument('--keyframe-interval', type=int, default=10,
+                        help='Write a full keyframe every N passes in --delta mode (default: 10)')
+    parser.add_argument('--deadband', action='append', default=[], metavar='METRIC=VALUE',
+                        help='Minimum change reported for a metric in --delta mode, e.g. load_1min=0.2 (repeatable)')
+    parser.add_argument('--deadline', type=float,
+                        help='Time budget in seconds for collecting the whole pass; unfinished servers are '
+                             'recorded as timed_out and the partial results are saved')
+    parser.add_argument('--breaker-threshold', type=int, default=0,
+                        help='Skip a server after this many consecutive failures or timeouts until its backoff '
+                             'expires (default: 0, disabled)')
+    parser.add_argument('--breaker-backoff', type=float, default=60,
+                        help='First backoff in seconds for a server with an open circuit; doubles per failure (default: 60)')
+    parser.add_argument('--breaker-max-backoff', type=float, default=3600,
+                        help='Longest backoff in seconds for a server with an open circuit (default: 3600)')
+    parser.add_argument('--metrics-port', type=int,
+                        help='Serve the latest snapshot as Prometheus text on /metrics and JSON on /snapshot.json')
+    parser.add_argument('--metrics-host', type=str, default='127.0.0.1',
+                        help='Address the metrics endpoint listens on (default: 127.0.0.1)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Print a per-phase timing breakdown (connect, commands, parse, save, report, ...) with '
+                             'the slowest host per phase; every pass also saves it to server_health_timings.json')
+    parser.add_argument('--profile-output', type=str,
+                        help='Profile the run: .prof/.pstats writes cProfile stats for the main thread, any other '
+                             'name writes sampled stacks from all threads in collapsed flamegraph format')
+    parser.add_argument('--rules', type=str,
+                        help='JSON alert rules: metric, warn/crit thresholds, op, "for" consecutive samples and '
+                             'per-tag overrides (default: load 1.0 warning / 2.0 critical)')
+    parser.add_argument('--alerts', action='store_true',
+                        help='Evaluate the alert rules every pass and log warning/critical/ok transitions to '
+                             'server_health_alerts.ndjson')
+    parser.add_argument('--anomaly', action='store_true',
+                        help='Track an EWMA baseline per server and metric and flag samples that deviate from it')
+    parser.add_argument('--anomaly-alpha', type=float, default=0.1,
+                        help='EWMA smoothing factor, higher adapts faster (default: 0.1)')
+    parser.add_argument('--anomaly-threshold', type=float, default=4.0,
+                        help='Flag samples this many standard deviations from the baseline (default: 4.0)')
+    parser.add_argument('--anomaly-warmup', type=int, default=10,
+                        help='Samples needed before a baseline can flag anomalies (default: 10)')
+    parser.add_argument('--report', choices=['auto', 'full', 'summary'], default='auto',
+                        help=f'full lists every server, summary prints fleet aggregates and the worst servers, '
+                             f'auto switches to summary above {REPORT_DETAIL_LIMIT} servers (default: auto)')
+    parser.add_argument('--report-top', type=int, default=10,
+                        help='Worst servers listed per metric in the fleet summary (default: 10)')
+    parser.add_argument('--report-json', type=str, help='Also write the fleet summary as JSON to this path')
+    parser.add_argument('--daemon', action='store_true', help='Keep running and poll servers continuously')
+    parser.add_argument('--interval', type=float, default=60, help='Daemon polling interval in seconds (default: 60)')
+    parser.add_argument('--jitter', type=float, default=0.1,
+                        help='Random start offset as a fraction of the interval (default: 0.1)')
+    args = parser.parse_args()
+    if args.create_config:
+        create_sample_config()
+        return
+    if args.engine == 'asyncio' and args.probe == 'proc':
+        parser.error("--probe proc needs SFTP and is not supported by --engine asyncio")
+    monitor = ServerHealthMonitor(config_file=args.config, probe_mode=args.probe, history_dir=args.history_dir,
+                                  output_dir=args.output_dir)
+    if args.tag:
+        monitor.select_servers(args.tag)
+    if args.rules:
+        try:
+            monitor.load_alert_rules(args.rules)
+        except (OSError, ValueError, KeyError) as e:
+            parser.error(f"invalid --rules {args.rules!r}: {e}")
+    if args.alerts:
+        monitor.enable_alerting()
+    monitor.configure_report(args.report, args.report_top, args.report_json)
+    if args.anomaly:
+        monitor.enable_anomaly_detection(args.anomaly_alpha, args.anomaly_threshold, args.anomaly_warmup)
+    if args.metrics_port is not None:
+        monitor.enable_exporter(args.metrics_host, args.metrics_port)
+    if args.async_logging:
+        monitor.enable_async_logging(max_open_files=args.log_max_open_files, max_bytes=args.log_max_bytes,
+                                     queue_size=args.log_queue_size)
+    monitor.dashboard_dpi = args.dpi or (100 if args.fast_dashboard else 300)
+    if args.fast_dashboard:
+        monitor.enable_fast_dashboard(aggregate_threshold=args.dashboard_max_hosts, top_n=args.top_n)
+    if args.breaker_threshold > 0:
+        monitor.enable_circuit_breakers(failure_threshold=args.breaker_threshold, base_backoff=args.breaker_backoff,
+                                        max_backoff=args.breaker_max_backoff)
+    if args.rollup:
+        retention = {}
+        for item in args.retention:
+            tier, _, value = item.partition('=')
+            if tier.strip() not in ROLLUP_RETENTION:
+                parser.error(f"invalid --retention {item!r}, tier must be one of {', '.join(ROLLUP_RETENTION)}")
+            try:
+                retention[tier.strip()] = parse_duration(value)
+            except ValueError:
+                parser.error(f"invalid --retention {item!r}, expected TIER=DURATION")
+        monitor.enable_rollups(retention)
+    if args.query:
+        try:
+            since = parse_duration(args.since)
+        except ValueError:
+            parser.error(f"invalid --since {args.since!r}, expected a duration such as 24h or 7d")
+        result = monitor.run_history_query(args.query, args.metric, since or float('inf'), args.percentile,
+                                           args.limit, args.mount, args.stat)
+        monitor.close()
+        sys.exit(0 if result is not None else 1)
+    if args.delta:
+        deadbands = {}
+        for item in args.deadband:
+            metric, _, value = item.partition('=')
+            try:
+                deadbands[metric.strip()] = float(value)
+            except ValueError:
+                parser.error(f"invalid --deadband {item!r}, expected METRIC=VALUE")
+        monitor.enable_delta(keyframe_interval=args.keyframe_interval, deadbands=deadbands)
+    if args.profile:
+        monitor.enable_profile()
+    enable_viz = not args.no_viz
+    profiler = start_profiler(args.profile_output) if args.profile_output else None
+    if args.daemon:
+        signal.signal(signal.SIGTERM, lambda signum, frame: monitor.stop())
+        try:
+            monitor.run_daemon(interval=args.interval, workers=args.workers or 10, jitter=args.jitter,
+                               enable_visualization=enable_viz, stream=args.stream)
+        finally:
+            if profiler is not None:
+                stop_profiler(profiler, args.profile_output)
+        sys.exit(0)
+    workers = args.workers or (500 if args.engine == 'asyncio' else 1)
+    try:
+        results = monitor.run_health_check(enable_visualization=enable_viz, workers=workers,
+                                           stream=args.stream, processes=args.processes,
+                                           engine=args.engine, host_timeout=args.host_timeout,
+                                           deadline=args.deadline)
+    finally:
+        if profiler is not None:
+            stop_profiler(profiler, args.profile_output)
+    monitor.close()
+    successful = monitor.collected_data.count_status("success")
+    if successful == 0 and len(results) > 0:
+        sys.exit(1)
+    else:
+        sys.exit(0)
@@ -0,0 +1,163 @@
+import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import numpy as np
+from typing import Dict, List, Optional
+import time
+
+
+LOAD_BINS = np.linspace(0, 4, 17)
+PERCENT_BINS = np.linspace(0, 100, 21)
+
+
+class DashboardRenderer:
+    LOAD_PANELS = [
+        ("load_1min", '1-minute Load Average\n(Immediate CPU Demand)', 'lightblue'),
+        ("load_5min", '5-minute Load Average\n(Recent CPU Trend)', 'lightsteelblue'),
+        ("load_15min", '15-minute Load Average\n(Long-term CPU Baseline)', 'steelblue')
+    ]
+    PERCENT_PANELS = [
+        ("memory_usage", 'Memory Usage Percentage', 'lightcoral'),
+        ("disk_usage", 'Root Disk Usage Percentage', 'lightgreen')
+    ]
+
+    def __init__(self, aggregate_threshold: int = 50, top_n: int = 20, thresholds: Optional[Dict[str, float]] = None):
+        self.aggregate_threshold = aggregate_threshold
+        self.top_n = top_n
+        self.thresholds = thresholds or {}
+        self.figure = None
+        self._layout_key = None
+        self._artists = {}
+
+    def _new_figure(self):
+        plt.style.use('seaborn-v0_8')
+        self.figure = Figure(figsize=(16, 18))
+        FigureCanvasAgg(self.figure)
+        self.figure.suptitle('Server Health Dashboard', fontsize=20, fontweight='bold')
+        self._artists = {}
+        return self.figure.subplots(3, 2).flatten()
+
+    def _build_detail(self, servers: List[str]):
+        axes = self._new_figure()
+        positions = np.arange(len(servers))
+        zeros = np.zeros(len(servers))
+        panels = [(key, title, color, 'Load Average', '{:.2f}') for key, title, color in self.LOAD_PANELS]
+        panels += [(key, title, color, 'Usage (%)', '{:.1f}%') for key, title, color in self.PERCENT_PANELS]
+        for ax, (key, title, color, ylabel, label_format) in zip(axes, panels):
+            bars = ax.bar(positions, zeros, color=color, alpha=0.7)
+            ax.set_title(title, fontweight='bold', fontsize=12)
+            ax.set_ylabel(ylabel)
+            ax.set_xticks(positions)
+            ax.set_xticklabels(servers, rotation=45)
+            labels = [ax.text(x, 0, '', ha='center', va='bottom', fontsize=9) for x in positions]
+            if key.startswith('load') and key in self.thresholds:
+                ax.axhline(y=self.thresholds[key], color='red', linestyle='--', alpha=0.5, label='Overload Threshold')
+                ax.legend()
+            self._artists[key] = (ax, bars, labels, label_format)
+        ax = axes[5]
+        bars = ax.bar(positions, zeros, color='green', alpha=0.7)
+        ax.set_title('Server Connection Status', fontweight='bold', fontsize=12)
+        ax.set_ylabel('Status (1=Success, 0=Failed)')
+        ax.set_ylim(0, 1.2)
+        ax.set_xticks(positions)
+        ax.set_xticklabels(servers, rotation=45)
+        labels = [ax.text(x, 0, '', ha='center', va='bottom', fontweight='bold', fontsize=10) for x in positions]
+        self._artists["statuses"] = (ax, bars, labels, None)
+        self.figure.tight_layout()
+
+    def _update_detail(self, series: Dict[str, np.ndarray]):
+        for key, (ax, bars, labels, label_format) in self._artists.items():
+            values = series[key]
+            if key == "statuses":
+                for bar, label, status in zip(bars, labels, values):
+                    bar.set_height(status)
+                    bar.set_color('green' if status == 1 else 'red')
+                    label.set_y(status)
+                    label.set_text('ONLINE' if status == 1 else 'OFFLINE')
+                continue
+            for bar, label, value in zip(bars, labels, values):
+                bar.set_height(value)
+                label.set_y(value)
+                label.set_text(label_format.format(value))
+            top = max(float(values.max()) if len(values) else 0.0, 1.0 if key.startswith('load') else 0.0)
+            ax.set_ylim(0, top * 1.15 or 1)
+
+    def _build_aggregate(self):
+        axes = self._new_figure()
+        for ax, (key, title, color) in zip(axes[:3], self.LOAD_PANELS):
+            bars = ax.bar(LOAD_BINS[:-1], np.zeros(len(LOAD_BINS) - 1), width=np.diff(LOAD_BINS),
+                          align='edge', color=color, alpha=0.7, edgecolor='white')
+            ax.set_title(title, fontweight='bold', fontsize=12)
+            ax.set_xlabel(f'Load Average (values above {LOAD_BINS[-1]:.0f} in last bin)')
+            ax.set_ylabel('Servers')
+            if key in self.thresholds:
+                ax.axvline(x=self.thresholds[key], color='red', linestyle='--', alpha=0.5, label='Overload Threshold')
+                ax.legend()
+            self._artists[key] = (ax, bars, LOAD_BINS)
+        rows = np.arange(self.top_n)
+        for ax, (key, title, color) in zip(axes[3:5], self.PERCENT_PANELS):
+            bars = ax.barh(rows, np.zeros(self.top_n), color=color, alpha=0.7)
+            ax.set_title(f'{title}\n(Top {self.top_n} worst)', fontweight='bold', fontsize=12)
+            ax.set_xlabel('Usage (%)')
+            ax.set_xlim(0, 100)
+            ax.set_yticks(rows)
+            ax.set_yticklabels([''] * self.top_n, fontsize=8)
+            ax.invert_yaxis()
+            self._artists[key] = (ax, bars, None)
+        ax = axes[5]
+        bars = ax.bar(['ONLINE', 'OFFLINE'], [0, 0], color=['green', 'red'], alpha=0.7)
+        ax.set_title('Server Connection Status', fontweight='bold', fontsize=12)
+        ax.set_ylabel('Servers')
+        labels = [ax.text(bar.get_x() + bar.get_width() / 2., 0, '', ha='center', va='bottom',
+                          fontweight='bold', fontsize=10) for bar in bars]
+        self._artists["statuses"] = (ax, bars, labels)
+        self.figure.tight_layout()
+
+    def _update_aggregate(self, series: Dict[str, np.ndarray]):
+        online = series["statuses"] == 1
+        for key, _, _ in self.LOAD_PANELS:
+            ax, bars, bins = self._artists[key]
+            counts, _ = np.histogram(np.clip(series[key][online], bins[0], bins[-1]), bins=bins)
+            for bar, count in zip(bars, counts):
+                bar.set_height(count)
+            ax.set_ylim(0, max(int(counts.max()) if len(counts) else 0, 1) * 1.15)
+        servers = series["servers"]
+        online_index = np.flatnonzero(online)
+        for key, _, _ in self.PERCENT_PANELS:
+            ax, bars, _ = self._artists[key]
+            values = series[key][online_index]
+            count = min(self.top_n, len(values))
+            worst = online_index[np.argsort(values, kind='stable')[::-1][:count]]
+            labels = []
+            for bar, index in zip(bars, worst):
+                bar.set_width(series[key][index])
+                labels.append(f"{servers[index]} ({series[key][index]:.1f}%)")
+            for bar in bars[count:]:
+                bar.set_width(0)
+            ax.set_yticklabels(labels + [''] * (self.top_n - count), fontsize=8)
+        ax, bars, labels = self._artists["statuses"]
+        counts = [int(online.sum()), int((~online).sum())]
+        for bar, label, count in zip(bars, labels, counts):
+            bar.set_height(count)
+            label.set_y(count)
+            label.set_text(str(count))
+        ax.set_ylim(0, max(counts) * 1.2 or 1)
+
+    def render(self, series: Dict[str, list], output_path: str, dpi: int = 100) -> float:
+        start = time.perf_counter()
+        servers = list(series["servers"])
+        arrays = {key: np.asarray(values, dtype=float) for key, values in series.items() if key != "servers"}
+        arrays["servers"] = servers
+        if len(servers) > self.aggregate_threshold:
+            layout_key = ("aggregate", self.top_n)
+            if layout_key != self._layout_key:
+                self._build_aggregate()
+            self._update_aggregate(arrays)
+        else:
+            layout_key = ("detail", tuple(servers))
+            if layout_key != self._layout_key:
+                self._build_detail(servers)
+            self._update_detail(arrays)
+        self._layout_key = layout_key
+        self.figure.savefig(output_path, dpi=dpi, pil_kwargs={"compress_level": 1})
+        return time.perf_counter() - start
@@ -0,0 +1,130 @@
+import json
+import csv
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+import os
+
+from .host_table import DISK_FIELDS
+
+
+DELTA_DEADBANDS = {
+    "load_1min": 0.1,
+    "load_5min": 0.05,
+    "load_15min": 0.05,
+    "memory_used": 64,
+    "memory_free": 64,
+    "memory_available": 64,
+    "swap_used": 16,
+    "swap_free": 16,
+    "memory_usage_percent": 1.0,
+    "use_percent": 1.0
+}
+DELTA_CSV_HEADER = ['pass', 'timestamp', 'server_name', 'record', 'metric', 'value']
+
+
+def flatten_sample(server_data: Dict[str, Any]) -> Dict[str, Any]:
+    metrics = {"status": server_data["status"], "hostname": server_data["hostname"]}
+    for key, value in server_data.items():
+        if key == "error" or key.endswith("_error"):
+            metrics[key] = value
+    for key, value in server_data.get("uptime", {}).items():
+        metrics[key] = value
+    for key, value in server_data.get("memory", {}).items():
+        metrics[key] = value
+    for disk in server_data.get("disk_usage", []):
+        for field in DISK_FIELDS[:-1]:
+            metrics[f"disk:{disk['mounted_on']}:{field}"] = disk[field]
+    return metrics
+
+
+class DeltaRecorder:
+    def __init__(self, state_path: str, ndjson_path: str, csv_path: str, keyframe_interval: int = 10,
+                 deadbands: Optional[Dict[str, float]] = None):
+        self.state_path = state_path
+        self.ndjson_path = ndjson_path
+        self.csv_path = csv_path
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.deadbands = dict(DELTA_DEADBANDS)
+        self.deadbands.update(deadbands or {})
+        self.pass_number = 0
+        self._last_reported = {}
+        if os.path.exists(state_path):
+            with open(state_path) as f:
+                state = json.load(f)
+            self.pass_number = state.get("pass", 0)
+            self._last_reported = state.get("hosts", {})
+
+    def _changed(self, metric: str, old: Any, new: Any) -> bool:
+        if metric == "uptime_string":
+            return False
+        deadband = self.deadbands.get(metric.rsplit(':', 1)[-1], 0)
+        try:
+            return abs(float(new) - float(old)) > deadband if deadband else new != old
+        except (TypeError, ValueError):
+            return new != old
+
+    def _diff(self, previous: Dict[str, Any], current: Dict[str, Any]) -> tuple:
+        changes = {}
+        for metric, value in current.items():
+            if metric not in previous or self._changed(metric, previous[metric], value):
+                changes[metric] = value
+        removed = [metric for metric in previous if metric not in current]
+        return changes, removed
+
+    def record(self, collected_data: Any) -> Dict[str, Any]:
+        keyframe = self.pass_number % self.keyframe_interval == 0
+        stats = {"pass": self.pass_number, "keyframe": keyframe, "hosts": 0, "hosts_changed": 0,
+                 "metrics_total": 0, "metrics_written": 0}
+        write_header = not os.path.exists(self.csv_path) or os.path.getsize(self.csv_path) == 0
+        with open(self.ndjson_path, 'a') as ndjson_file, open(self.csv_path, 'a', newline='') as csv_file:
+            writer = csv.writer(csv_file)
+            if write_header:
+                writer.writerow(DELTA_CSV_HEADER)
+            ndjson_file.write(json.dumps({
+                "type": "pass", "pass": self.pass_number, "keyframe": keyframe,
+                "timestamp": datetime.now().isoformat()
+            }) + '\n')
+            for server_name, server_data in collected_data.items():
+                current = flatten_sample(server_data)
+                previous = self._last_reported.get(server_name)
+                stats["hosts"] += 1
+                stats["metrics_total"] += len(current)
+                if keyframe or previous is None:
+                    record_type, changes, removed = "keyframe", current, []
+                    self._last_reported[server_name] = current
+                else:
+                    changes, removed = self._diff(previous, current)
+                    if not changes and not removed:
+                        continue
+                    record_type = "delta"
+                    previous.update(changes)
+                    for metric in removed:
+                        del previous[metric]
+                stats["hosts_changed"] += 1
+                stats["metrics_written"] += len(changes) + len(removed)
+                record = {"type": record_type, "pass": self.pass_number, "server_name": server_name,
+                          "timestamp": server_data["timestamp"], "metrics": changes}
+                if removed:
+                    record["removed"] = removed
+                ndjson_file.write(json.dumps(record) + '\n')
+                writer.writerows(
+                    [self.pass_number, server_data["timestamp"], server_name, record_type, metric, value]
+                    for metric, value in changes.items()
+                )
+                writer.writerows(
+                    [self.pass_number, server_data["timestamp"], server_name, "removed", metric, ""]
+                    for metric in removed
+                )
+        self.pass_number += 1
+        self._save_state()
+        return stats
+
+    def forget(self, server_names: List[str]):
+        for server_name in server_names:
+            self._last_reported.pop(server_name, None)
+
+    def _save_state(self):
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({"pass": self.pass_number, "hosts": self._last_reported}, f)
+        os.replace(temp_path, self.state_path)
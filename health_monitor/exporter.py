@@ -0,0 +1,131 @@
+import json
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Optional
+import threading
+
+from .units import to_epoch
+
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PROMETHEUS_METRICS = [
+    ("server_health_up", "gauge", "1 if the last check of the server succeeded"),
+    ("server_health_check_status", "gauge", "Status of the last check, one series per status"),
+    ("server_health_last_check_timestamp_seconds", "gauge", "Unix time of the last check"),
+    ("server_health_load1", "gauge", "1-minute load average"),
+    ("server_health_load5", "gauge", "5-minute load average"),
+    ("server_health_load15", "gauge", "15-minute load average"),
+    ("server_health_memory_total_megabytes", "gauge", "Total memory in MB"),
+    ("server_health_memory_used_megabytes", "gauge", "Used memory in MB"),
+    ("server_health_memory_usage_percent", "gauge", "Used memory as a percentage of total"),
+    ("server_health_swap_used_megabytes", "gauge", "Used swap in MB"),
+    ("server_health_disk_usage_percent", "gauge", "Filesystem usage percentage per mount"),
+    ("server_health_servers", "gauge", "Servers in the snapshot by status"),
+    ("server_health_snapshot_timestamp_seconds", "gauge", "Unix time the snapshot was published")
+]
+
+
+def _prometheus_label(value: Any) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def render_prometheus(document: Dict[str, Any]) -> str:
+    samples = {name: [] for name, _, _ in PROMETHEUS_METRICS}
+    status_counts = {}
+    for server_name, data in document["data"].items():
+        server = f'server="{_prometheus_label(server_name)}"'
+        status = data["status"]
+        status_counts[status] = status_counts.get(status, 0) + 1
+        samples["server_health_up"].append((server, 1 if status == "success" else 0))
+        samples["server_health_check_status"].append((f'{server},status="{_prometheus_label(status)}"', 1))
+        try:
+            samples["server_health_last_check_timestamp_seconds"].append((server, to_epoch(data["timestamp"])))
+        except (TypeError, ValueError):
+            pass
+        if status != "success":
+            continue
+        uptime = data.get("uptime", {})
+        memory = data.get("memory", {})
+        for metric, key in [("server_health_load1", "load_1min"), ("server_health_load5", "load_5min"),
+                            ("server_health_load15", "load_15min")]:
+            if key in uptime:
+                samples[metric].append((server, uptime[key]))
+        for metric, key in [("server_health_memory_total_megabytes", "memory_total"),
+                            ("server_health_memory_used_megabytes", "memory_used"),
+                            ("server_health_memory_usage_percent", "memory_usage_percent"),
+                            ("server_health_swap_used_megabytes", "swap_used")]:
+            if key in memory:
+                samples[metric].append((server, memory[key]))
+        for disk in data.get("disk_usage", []):
+            try:
+                samples["server_health_disk_usage_percent"].append(
+                    (f'{server},mount="{_prometheus_label(disk["mounted_on"])}"', float(disk["use_percent"]))
+                )
+            except (TypeError, ValueError):
+                pass
+    for status, count in status_counts.items():
+        samples["server_health_servers"].append((f'status="{_prometheus_label(status)}"', count))
+    samples["server_health_snapshot_timestamp_seconds"].append(("", to_epoch(document["timestamp"])))
+    lines = []
+    for name, metric_type, help_text in PROMETHEUS_METRICS:
+        if not samples[name]:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        lines.extend(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}" for labels, value in samples[name])
+    return '\n'.join(lines) + '\n'
+
+
+class MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        response = self.server.exporter.lookup(self.path.split('?', 1)[0])
+        if response is None:
+            self.send_error(404 if self.server.exporter.published else 503)
+            return
+        body, gzipped, content_type = response
+        if 'gzip' in self.headers.get('Accept-Encoding', ''):
+            body = gzipped
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if body is gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class MetricsHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 256
+
+
+class MetricsExporter:
+    def __init__(self, host: str = "127.0.0.1", port: int = 9108):
+        self._responses = {}
+        self.published = False
+        self.server = MetricsHTTPServer((host, port), MetricsRequestHandler)
+        self.server.exporter = self
+        self._thread = threading.Thread(target=self.server.serve_forever, name="metrics-exporter", daemon=True)
+        self._thread.start()
+
+    @property
+    def address(self) -> tuple:
+        return self.server.server_address[:2]
+
+    def publish(self, document: Dict[str, Any]):
+        metrics = render_prometheus(document).encode()
+        snapshot = json.dumps(document).encode()
+        metrics_response = (metrics, gzip.compress(metrics, compresslevel=1), PROMETHEUS_CONTENT_TYPE)
+        snapshot_response = (snapshot, gzip.compress(snapshot, compresslevel=1), "application/json")
+        self._responses = {"/metrics": metrics_response, "/snapshot.json": snapshot_response}
+        self.published = True
+
+    def lookup(self, path: str) -> Optional[tuple]:
+        return self._responses.get(path)
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
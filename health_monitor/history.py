@@ -0,0 +1,210 @@
+import numpy as np
+from typing import Dict, List, Any, Optional
+import os
+import threading
+import struct
+from urllib.parse import quote, unquote
+
+from .units import parse_size_to_bytes, to_epoch
+
+
+HISTORY_COLUMNS = [
+    "status", "load_1min", "load_5min", "load_15min",
+    "memory_usage_percent", "memory_used", "memory_total", "swap_used"
+]
+DISK_HISTORY_COLUMNS = ["use_percent", "used", "size"]
+HISTORY_FLUSH_ROWS = 65536
+ROLLUP_DIR = ".rollup"
+FLEET_DIR = ".fleet"
+
+
+def _to_float(value: Any, parse=float) -> float:
+    if value is None:
+        return float('nan')
+    try:
+        return float(parse(value))
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class HealthHistoryStore:
+    def __init__(self, base_dir: str, segment_seconds: int = 86400):
+        self.base_dir = base_dir
+        self.segment_seconds = segment_seconds
+        self._lock = threading.Lock()
+        self._last_timestamp = {}
+        self._pending = {}
+        self._pending_rows = 0
+        os.makedirs(base_dir, exist_ok=True)
+
+    def _series_dir(self, server_name: str, mount: Optional[str] = None) -> str:
+        path = os.path.join(self.base_dir, quote(server_name, safe=''))
+        if mount is not None:
+            path = os.path.join(path, 'disk', quote(mount, safe=''))
+        return path
+
+    def _segment_start(self, timestamp: float) -> int:
+        return int(timestamp // self.segment_seconds * self.segment_seconds)
+
+    def _column_path(self, series_dir: str, segment: int, column: str) -> str:
+        return os.path.join(series_dir, f"{segment}.{column}.f64")
+
+    def _open_segment(self, series_dir: str, segment: int, columns: List[str]) -> float:
+        os.makedirs(series_dir, exist_ok=True)
+        paths = [self._column_path(series_dir, segment, column) for column in ["timestamp"] + columns]
+        sizes = [os.path.getsize(path) if os.path.exists(path) else 0 for path in paths]
+        rows = min(sizes) // 8
+        for path, size in zip(paths, sizes):
+            if size > rows * 8:
+                with open(path, 'r+b') as f:
+                    f.truncate(rows * 8)
+        if rows == 0:
+            return float('-inf')
+        with open(paths[0], 'rb') as f:
+            f.seek((rows - 1) * 8)
+            return struct.unpack('<d', f.read(8))[0]
+
+    def _append_row(self, series_dir: str, timestamp: float, columns: List[str], values: List[float]) -> bool:
+        segment = self._segment_start(timestamp)
+        key = (series_dir, segment)
+        if key not in self._last_timestamp:
+            self._last_timestamp[key] = self._open_segment(series_dir, segment, columns)
+        if timestamp < self._last_timestamp[key]:
+            return False
+        self._pending.setdefault(key, (columns, []))[1].append(values + [timestamp])
+        self._pending_rows += 1
+        self._last_timestamp[key] = timestamp
+        if self._pending_rows >= HISTORY_FLUSH_ROWS:
+            self._flush_pending()
+        return True
+
+    def _flush_pending(self):
+        for (series_dir, segment), (columns, rows) in self._pending.items():
+            rows = np.array(rows, dtype='<f8')
+            for position, column in enumerate(columns + ["timestamp"]):
+                with open(self._column_path(series_dir, segment, column), 'ab') as f:
+                    rows[:, position].tofile(f)
+        self._pending = {}
+        self._pending_rows = 0
+
+    def flush(self):
+        with self._lock:
+            self._flush_pending()
+
+    def append_rows(self, series_dir: str, timestamps: np.ndarray, columns: List[str],
+                    values: Dict[str, np.ndarray]) -> int:
+        segments = (timestamps // self.segment_seconds * self.segment_seconds).astype(np.int64)
+        written = 0
+        with self._lock:
+            self._flush_pending()
+            for segment in np.unique(segments).tolist():
+                key = (series_dir, segment)
+                if key not in self._last_timestamp:
+                    self._last_timestamp[key] = self._open_segment(series_dir, segment, columns)
+                mask = (segments == segment) & (timestamps > self._last_timestamp[key])
+                if not mask.any():
+                    continue
+                for column in columns:
+                    with open(self._column_path(series_dir, segment, column), 'ab') as f:
+                        values[column][mask].astype('<f8').tofile(f)
+                with open(self._column_path(series_dir, segment, "timestamp"), 'ab') as f:
+                    timestamps[mask].astype('<f8').tofile(f)
+                self._last_timestamp[key] = float(timestamps[mask][-1])
+                written += int(mask.sum())
+        return written
+
+    def last_timestamp(self, series_dir: str, columns: List[str]) -> float:
+        segments = self._segments(series_dir, float('-inf'), float('inf'))
+        if not segments:
+            return float('-inf')
+        with self._lock:
+            self._flush_pending()
+            return self._open_segment(series_dir, segments[-1], columns)
+
+    def drop_before(self, cutoff: float) -> int:
+        removed = 0
+        with self._lock:
+            self._flush_pending()
+            for root, dirs, files in os.walk(self.base_dir):
+                dirs[:] = [name for name in dirs if name != ROLLUP_DIR]
+                for name in files:
+                    if not name.endswith('.f64'):
+                        continue
+                    if int(name.split('.')[0]) + self.segment_seconds <= cutoff:
+                        os.remove(os.path.join(root, name))
+                        removed += name.endswith('.timestamp.f64')
+            self._last_timestamp = {
+                key: value for key, value in self._last_timestamp.items()
+                if key[1] + self.segment_seconds > cutoff
+            }
+        return removed
+
+    def append(self, server_data: Dict[str, Any]) -> bool:
+        timestamp = to_epoch(server_data["timestamp"])
+        success = server_data["status"] == "success"
+        uptime = server_data.get("uptime", {}) if success else {}
+        memory = server_data.get("memory", {}) if success else {}
+        values = [1.0 if success else 0.0]
+        values += [_to_float(uptime.get(column)) for column in HISTORY_COLUMNS[1:4]]
+        values += [_to_float(memory.get(column)) for column in HISTORY_COLUMNS[4:]]
+        disks = [
+            (disk["mounted_on"], [_to_float(disk.get("use_percent")), _to_float(disk.get("used"), parse_size_to_bytes),
+                                  _to_float(disk.get("size"), parse_size_to_bytes)])
+            for disk in (server_data.get("disk_usage", []) if success else [])
+            if disk.get("mounted_on")
+        ]
+        with self._lock:
+            appended = self._append_row(
+                self._series_dir(server_data["server_name"]), timestamp, HISTORY_COLUMNS, values
+            )
+            if appended:
+                for mount, disk_values in disks:
+                    self._append_row(
+                        self._series_dir(server_data["server_name"], mount), timestamp, DISK_HISTORY_COLUMNS,
+                        disk_values
+                    )
+        return appended
+
+    def _segments(self, series_dir: str, start: float, end: float) -> List[int]:
+        if not os.path.isdir(series_dir):
+            return []
+        segments = sorted({
+            int(name.split('.')[0]) for name in os.listdir(series_dir) if name.endswith('.timestamp.f64')
+        })
+        return [segment for segment in segments if segment + self.segment_seconds > start and segment <= end]
+
+    def _read_range(self, series_dir: str, columns: List[str], start: Any, end: Any) -> Dict[str, np.ndarray]:
+        start = to_epoch(start) if start is not None else float('-inf')
+        end = to_epoch(end) if end is not None else float('inf')
+        parts = {column: [] for column in ["timestamp"] + columns}
+        for segment in self._segments(series_dir, start, end):
+            paths = {column: self._column_path(series_dir, segment, column) for column in parts}
+            rows = min(os.path.getsize(path) if os.path.exists(path) else 0 for path in paths.values()) // 8
+            if rows == 0:
+                continue
+            timestamps = np.memmap(paths["timestamp"], dtype='<f8', mode='r', shape=(rows,))
+            lo = int(np.searchsorted(timestamps, start, side='left'))
+            hi = int(np.searchsorted(timestamps, end, side='right'))
+            if hi <= lo:
+                continue
+            for column, path in paths.items():
+                parts[column].append(np.array(np.memmap(path, dtype='<f8', mode='r', shape=(rows,))[lo:hi]))
+        return {column: np.concatenate(chunks) if chunks else np.empty(0) for column, chunks in parts.items()}
+
+    def query(self, server_name: str, start: Any = None, end: Any = None,
+              columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        return self._read_range(self._series_dir(server_name), columns or HISTORY_COLUMNS, start, end)
+
+    def query_disk(self, server_name: str, mount: str, start: Any = None, end: Any = None,
+                   columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+        return self._read_range(self._series_dir(server_name, mount), columns or DISK_HISTORY_COLUMNS, start, end)
+
+    def list_servers(self) -> List[str]:
+        return sorted(unquote(name) for name in os.listdir(self.base_dir)
+                      if name != ROLLUP_DIR and os.path.isdir(os.path.join(self.base_dir, name)))
+
+    def list_mounts(self, server_name: str) -> List[str]:
+        disk_dir = os.path.join(self._series_dir(server_name), 'disk')
+        if not os.path.isdir(disk_dir):
+            return []
+        return sorted(unquote(name) for name in os.listdir(disk_dir))
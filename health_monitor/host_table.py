@@ -0,0 +1,465 @@
+from array import array
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+import numpy as np
+from typing import Dict, List, Any, Optional
+import sys
+
+
+UPTIME_FIELDS = ["load_1min", "load_5min", "load_15min"]
+UPTIME_KEYS = UPTIME_FIELDS + ["uptime_string"]
+MEMORY_FIELDS = ["memory_total", "memory_used", "memory_free", "memory_available", "swap_total", "swap_used", "swap_free"]
+MEMORY_KEYS = MEMORY_FIELDS + ["memory_usage_percent"]
+DISK_FIELDS = ["filesystem", "size", "used", "available", "use_percent", "mounted_on"]
+SAMPLE_SECTIONS = ["uptime", "disk_usage", "memory"]
+SAMPLE_BASE_KEYS = {"timestamp", "server_name", "hostname", "status", "uptime", "disk_usage", "memory"}
+ALL_SECTIONS = 7
+MISSING = -1
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _compact_value(value: Any) -> Any:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _disk_value_key(value: Any) -> Any:
+    return value if value.__class__ is str else (value.__class__, value)
+
+
+class _PackedStrings:
+    def __init__(self):
+        self._blob = bytearray()
+        self._start = array('q')
+        self._length = array('i')
+        self._objects = {}
+        self._dead = 0
+
+    def append(self, value: Any):
+        self._start.append(0)
+        self._length.append(-1)
+        self.set(len(self._start) - 1, value)
+
+    def set(self, row: int, value: Any):
+        if self._length[row] > 0:
+            self._dead += self._length[row]
+        if self._length[row] == -2:
+            del self._objects[row]
+        if value is None:
+            self._length[row] = -1
+        elif value.__class__ is str:
+            data = value.encode('utf-8', 'surrogatepass')
+            self._start[row] = len(self._blob)
+            self._length[row] = len(data)
+            self._blob += data
+        else:
+            self._length[row] = -2
+            self._objects[row] = value
+        if self._dead > 65536 and self._dead > len(self._blob) // 2:
+            self._compact()
+
+    def get(self, row: int) -> Any:
+        length = self._length[row]
+        if length >= 0:
+            start = self._start[row]
+            return self._blob[start:start + length].decode('utf-8', 'surrogatepass')
+        return None if length == -1 else self._objects[row]
+
+    def _compact(self):
+        blob = bytearray()
+        for row, length in enumerate(self._length):
+            if length > 0:
+                start = self._start[row]
+                self._start[row] = len(blob)
+                blob += self._blob[start:start + length]
+        self._blob = blob
+        self._dead = 0
+
+    def copy(self) -> "_PackedStrings":
+        packed = _PackedStrings()
+        packed._blob = self._blob[:]
+        packed._start = self._start[:]
+        packed._length = self._length[:]
+        packed._objects = dict(self._objects)
+        packed._dead = self._dead
+        return packed
+
+
+class HostTable(MutableMapping):
+    def __init__(self, data: Optional[Dict[str, Dict[str, Any]]] = None):
+        self._index = {}
+        self._names = []
+        self._free_rows = []
+        self._hostnames = _PackedStrings()
+        self._statuses = []
+        self._uptime_strings = _PackedStrings()
+        self._timestamps = array('q')
+        self._sections = array('B')
+        self._loads = {field: array('d') for field in UPTIME_FIELDS}
+        self._memory = {field: array('q') for field in MEMORY_FIELDS}
+        self._memory_percent = array('d')
+        self._root_disk = array('q')
+        self._root_disk_percent = array('d')
+        self._disk_start = array('q')
+        self._disk_count = array('q')
+        self._disks = {field: array('I') for field in DISK_FIELDS}
+        self._disk_values = []
+        self._disk_codes = {}
+        self._dead_disks = 0
+        self._extras = {}
+        if data:
+            self.update(data)
+
+    def _reset_row(self, row: int):
+        self._hostnames.set(row, None)
+        self._statuses[row] = None
+        self._uptime_strings.set(row, "")
+        self._timestamps[row] = MISSING
+        self._sections[row] = 0
+        for column in self._loads.values():
+            column[row] = 0.0
+        for column in self._memory.values():
+            column[row] = MISSING
+        self._memory_percent[row] = float('nan')
+        self._root_disk[row] = MISSING
+        self._root_disk_percent[row] = float('nan')
+        self._disk_start[row] = 0
+        self._disk_count[row] = 0
+
+    def _append_row(self, name: str) -> int:
+        if self._free_rows:
+            row = self._free_rows.pop()
+            self._names[row] = name
+            self._reset_row(row)
+            return row
+        row = len(self._names)
+        self._names.append(name)
+        self._hostnames.append(None)
+        self._statuses.append(None)
+        self._uptime_strings.append("")
+        self._timestamps.append(MISSING)
+        self._sections.append(0)
+        for column in self._loads.values():
+            column.append(0.0)
+        for column in self._memory.values():
+            column.append(MISSING)
+        self._memory_percent.append(float('nan'))
+        self._root_disk.append(MISSING)
+        self._root_disk_percent.append(float('nan'))
+        self._disk_start.append(0)
+        self._disk_count.append(0)
+        return row
+
+    def _encode_timestamp(self, value: Any) -> int:
+        try:
+            micros = (datetime.fromisoformat(value) - EPOCH) // ONE_MICROSECOND
+        except (TypeError, ValueError):
+            return MISSING
+        return micros if (EPOCH + timedelta(microseconds=micros)).isoformat() == value else MISSING
+
+    def _set_uptime(self, row: int, uptime: Any) -> bool:
+        if not isinstance(uptime, dict) or list(uptime) != UPTIME_KEYS:
+            return False
+        if not all(_is_number(uptime[field]) for field in UPTIME_FIELDS):
+            return False
+        for field in UPTIME_FIELDS:
+            self._loads[field][row] = uptime[field]
+        self._uptime_strings.set(row, uptime["uptime_string"])
+        return True
+
+    def _set_memory(self, row: int, memory: Any) -> bool:
+        if not isinstance(memory, dict) or list(memory) != [key for key in MEMORY_KEYS if key in memory]:
+            return False
+        if not all(isinstance(memory.get(field, 0), int) and memory.get(field, 0) >= 0 for field in MEMORY_FIELDS):
+            return False
+        if not _is_number(memory.get("memory_usage_percent", 0)):
+            return False
+        for field in MEMORY_FIELDS:
+            self._memory[field][row] = memory.get(field, MISSING)
+        self._memory_percent[row] = memory.get("memory_usage_percent", float('nan'))
+        return True
+
+    def _set_disks(self, row: int, disks: Any) -> bool:
+        if not isinstance(disks, list) or not all(isinstance(disk, dict) and list(disk) == DISK_FIELDS for disk in disks):
+            return False
+        codes = []
+        known = self._disk_codes.get
+        for disk in disks:
+            for field in DISK_FIELDS:
+                value = disk[field]
+                code = known(value) if value.__class__ is str else None
+                if code is None:
+                    code = self._disk_code(value)
+                    if code is None:
+                        return False
+                codes.append(code)
+        start = len(self._disks["mounted_on"])
+        root = MISSING
+        for column, field in enumerate(DISK_FIELDS):
+            self._disks[field].extend(codes[column::len(DISK_FIELDS)])
+        for offset, disk in enumerate(disks):
+            if disk["mounted_on"] == "/":
+                root = start + offset
+                break
+        self._disk_start[row] = start
+        self._disk_count[row] = len(disks)
+        self._root_disk[row] = root
+        try:
+            self._root_disk_percent[row] = float(disks[root - start]["use_percent"]) if root != MISSING else float('nan')
+        except (TypeError, ValueError):
+            self._root_disk_percent[row] = float('nan')
+        return True
+
+    def _disk_code(self, value: Any) -> Optional[int]:
+        if value.__class__ is not str and value is not None and not isinstance(value, (int, float)):
+            return None
+        key = _disk_value_key(value)
+        code = self._disk_codes.get(key)
+        if code is None:
+            code = self._disk_codes[key] = len(self._disk_values)
+            self._disk_values.append(value)
+        return code
+
+    def _disk_value(self, field: str, index: int) -> Any:
+        return self._disk_values[self._disks[field][index]]
+
+    def __setitem__(self, name: str, server_data: Dict[str, Any]):
+        row = self._index.get(name)
+        if row is None:
+            row = self._append_row(name)
+            self._index[name] = row
+        else:
+            self._dead_disks += self._disk_count[row]
+            self._disk_count[row] = 0
+        extras = {key: value for key, value in server_data.items() if key not in SAMPLE_BASE_KEYS}
+        if server_data.get("server_name") != name:
+            extras["server_name"] = server_data.get("server_name")
+        timestamp = self._encode_timestamp(server_data.get("timestamp"))
+        if timestamp == MISSING:
+            extras["timestamp"] = server_data.get("timestamp")
+        self._timestamps[row] = timestamp
+        self._hostnames.set(row, server_data.get("hostname"))
+        self._statuses[row] = _compact_value(server_data.get("status"))
+        sections = 0
+        for bit, (section, setter) in enumerate(zip(SAMPLE_SECTIONS, (self._set_uptime, self._set_disks, self._set_memory))):
+            if section not in server_data:
+                continue
+            if setter(row, server_data[section]):
+                sections |= 1 << bit
+            else:
+                extras[section] = server_data[section]
+        self._sections[row] = sections
+        if extras:
+            self._extras[row] = extras
+        else:
+            self._extras.pop(row, None)
+        if self._dead_disks > 4096 and self._dead_disks > len(self._disks["mounted_on"]) // 2:
+            self._compact_disks()
+
+    def _compact_disks(self):
+        disks = {field: array('I') for field in DISK_FIELDS}
+        values = []
+        remap = {}
+        for row in self._index.values():
+            start, count = self._disk_start[row], self._disk_count[row]
+            new_start = len(disks["mounted_on"])
+            for field in DISK_FIELDS:
+                column = disks[field]
+                for code in self._disks[field][start:start + count]:
+                    new_code = remap.get(code)
+                    if new_code is None:
+                        new_code = remap[code] = len(values)
+                        values.append(self._disk_values[code])
+                    column.append(new_code)
+            if self._root_disk[row] != MISSING:
+                self._root_disk[row] += new_start - start
+            self._disk_start[row] = new_start
+        self._disks = disks
+        self._disk_values = values
+        self._disk_codes = {_disk_value_key(value): code for code, value in enumerate(values)}
+        self._dead_disks = 0
+
+    def _disk_list(self, row: int) -> List[Dict[str, Any]]:
+        start = self._disk_start[row]
+        values = self._disk_values
+        columns = [[values[code] for code in self._disks[field][start:start + self._disk_count[row]]]
+                   for field in DISK_FIELDS]
+        return [dict(zip(DISK_FIELDS, row_values)) for row_values in zip(*columns)]
+
+    def _row_timestamp(self, row: int) -> Any:
+        timestamp = self._timestamps[row]
+        if timestamp == MISSING:
+            return self._extras[row]["timestamp"]
+        return (EPOCH + timedelta(microseconds=timestamp)).isoformat()
+
+    def _row_dict(self, row: int) -> Dict[str, Any]:
+        extras = self._extras.get(row, {})
+        sections = self._sections[row]
+        data = {
+            "timestamp": self._row_timestamp(row),
+            "server_name": extras.get("server_name", self._names[row]),
+            "hostname": self._hostnames.get(row),
+            "status": self._statuses[row]
+        }
+        if sections & 1:
+            data["uptime"] = {field: self._loads[field][row] for field in UPTIME_FIELDS}
+            data["uptime"]["uptime_string"] = self._uptime_strings.get(row)
+        elif "uptime" in extras:
+            data["uptime"] = extras["uptime"]
+        if sections & 2:
+            data["disk_usage"] = self._disk_list(row)
+        elif "disk_usage" in extras:
+            data["disk_usage"] = extras["disk_usage"]
+        if sections & 4:
+            data["memory"] = {
+                field: self._memory[field][row] for field in MEMORY_FIELDS if self._memory[field][row] != MISSING
+            }
+            if self._memory_percent[row] == self._memory_percent[row]:
+                data["memory"]["memory_usage_percent"] = self._memory_percent[row]
+        elif "memory" in extras:
+            data["memory"] = extras["memory"]
+        for key, value in extras.items():
+            if key not in SAMPLE_BASE_KEYS:
+                data[key] = value
+        return data
+
+    def __getitem__(self, name: str) -> Dict[str, Any]:
+        return self._row_dict(self._index[name])
+
+    def copy(self) -> "HostTable":
+        table = HostTable.__new__(HostTable)
+        for key, value in self.__dict__.items():
+            if isinstance(value, dict):
+                value = {k: v[:] if isinstance(v, (array, list)) else v for k, v in value.items()}
+            elif isinstance(value, (array, list)):
+                value = value[:]
+            elif isinstance(value, _PackedStrings):
+                value = value.copy()
+            setattr(table, key, value)
+        return table
+
+    def __delitem__(self, name: str):
+        row = self._index.pop(name)
+        self._names[row] = None
+        self._dead_disks += self._disk_count[row]
+        self._reset_row(row)
+        self._extras.pop(row, None)
+        self._free_rows.append(row)
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self._index
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: self._row_dict(row) for name, row in self._index.items()}
+
+    def count_status(self, status: str) -> int:
+        statuses = self._statuses
+        return sum(1 for row in self._index.values() if statuses[row] == status)
+
+    def status_counts(self) -> Dict[str, int]:
+        counts = {}
+        statuses = self._statuses
+        for row in self._index.values():
+            counts[statuses[row]] = counts.get(statuses[row], 0) + 1
+        return counts
+
+    def failures(self):
+        for name, row in self._index.items():
+            status = self._statuses[row]
+            if status != "success":
+                yield name, status, self._extras.get(row, {}).get("error")
+            elif self._sections[row] != ALL_SECTIONS:
+                yield name, "partial", "Incomplete probe output"
+
+    def _rows(self) -> np.ndarray:
+        return np.fromiter(self._index.values(), dtype=np.int64, count=len(self._index))
+
+    def column(self, field: str) -> np.ndarray:
+        if not self._index:
+            return np.empty(0)
+        if field in self._loads:
+            values = np.frombuffer(self._loads[field], dtype=np.float64)
+        elif field in self._memory:
+            values = np.frombuffer(self._memory[field], dtype=np.int64).astype(np.float64)
+            values[values == MISSING] = np.nan
+        elif field == "memory_usage_percent":
+            values = np.frombuffer(self._memory_percent, dtype=np.float64)
+        elif field == "root_disk_percent":
+            values = np.frombuffer(self._root_disk_percent, dtype=np.float64)
+        elif field == "timestamp":
+            values = np.frombuffer(self._timestamps, dtype=np.int64) / 1e6
+            values[values == MISSING / 1e6] = np.nan
+        else:
+            raise KeyError(field)
+        return values[self._rows()]
+
+    def success_mask(self) -> np.ndarray:
+        statuses = self._statuses
+        sections = self._sections
+        return np.fromiter(
+            (statuses[row] == "success" and sections[row] == ALL_SECTIONS for row in self._index.values()),
+            dtype=bool, count=len(self._index)
+        )
+
+    def dashboard_series(self) -> Dict[str, Any]:
+        success = self.success_mask()
+        series = {"servers": list(self._index)}
+        for key, field in [("load_1min", "load_1min"), ("load_5min", "load_5min"), ("load_15min", "load_15min"),
+                           ("memory_usage", "memory_usage_percent"), ("disk_usage", "root_disk_percent")]:
+            series[key] = np.where(success, np.nan_to_num(self.column(field)), 0.0)
+        series["statuses"] = success.astype(int)
+        return series
+
+    def csv_rows(self, fallback):
+        for name, row in self._index.items():
+            if self._statuses[row] != "success" or self._sections[row] != ALL_SECTIONS:
+                yield fallback(name, self._row_dict(row))
+                continue
+            memory = [self._memory[field][row] for field in MEMORY_FIELDS]
+            memory = [value if value != MISSING else 0 for value in memory]
+            memory_percent = self._memory_percent[row]
+            root = self._root_disk[row]
+            yield [
+                name,
+                self._row_timestamp(row),
+                self._statuses[row],
+                self._hostnames.get(row),
+                self._loads["load_1min"][row],
+                self._loads["load_5min"][row],
+                self._loads["load_15min"][row],
+                self._uptime_strings.get(row),
+                *memory[:4],
+                memory_percent if memory_percent == memory_percent else 0,
+                *memory[4:],
+                self._disk_value("use_percent", root) if root != MISSING else 0
+            ]
+
+    def report_rows(self):
+        for name, row in self._index.items():
+            status = self._statuses[row]
+            if status != "success" or self._sections[row] != ALL_SECTIONS:
+                data = self._row_dict(row)
+                yield name, data["hostname"], status, data, None
+                continue
+            root = self._root_disk[row]
+            memory_percent = self._memory_percent[row]
+            detail = (
+                self._loads["load_1min"][row],
+                self._loads["load_5min"][row],
+                self._loads["load_15min"][row],
+                max(self._memory["memory_used"][row], 0),
+                max(self._memory["memory_total"][row], 0),
+                memory_percent if memory_percent == memory_percent else 0,
+                self._disk_value("use_percent", root) if root != MISSING else "N/A"
+            )
+            yield name, self._hostnames.get(row), status, None, detail
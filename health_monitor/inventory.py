@@ -0,0 +1,179 @@
+import json
+import logging
+from typing import Dict, List, Any, Optional
+import os
+import re
+import glob
+import itertools
+
+
+HOST_RANGE_PATTERN = re.compile(r'\[(\d+)-(\d+)\]')
+
+
+def expand_host_ranges(entry: Dict[str, Any]) -> List[Dict[str, Any]]:
+    tokens = list(dict.fromkeys(match.group(0) for match in HOST_RANGE_PATTERN.finditer(str(entry.get("name", "")))))
+    if not tokens:
+        return [entry]
+    ranges = []
+    for token in tokens:
+        start, end = HOST_RANGE_PATTERN.fullmatch(token).groups()
+        width = len(start) if len(start) > 1 and start[0] == '0' else 0
+        step = 1 if int(end) >= int(start) else -1
+        ranges.append([str(value).zfill(width) for value in range(int(start), int(end) + step, step)])
+    expanded = []
+    for values in itertools.product(*ranges):
+        server = {}
+        for key, value in entry.items():
+            if isinstance(value, str):
+                for token, replacement in zip(tokens, values):
+                    value = value.replace(token, replacement)
+            server[key] = value
+        expanded.append(server)
+    return expanded
+
+
+class ServerInventory:
+    def __init__(self, sources: List[str], logger: Optional[logging.Logger] = None):
+        self.sources = list(sources)
+        self.logger = logger or logging.getLogger()
+        self.servers = []
+        self._files = {}
+        self._by_name = {}
+        self._by_tag = {}
+
+    def _read_entries(self, path: str) -> tuple:
+        entries = []
+        includes = []
+        if path.endswith(('.jsonl', '.ndjson')):
+            with open(path) as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entries.append(json.loads(line))
+            return entries, includes
+        with open(path) as f:
+            document = json.load(f)
+        if isinstance(document, list):
+            return document, includes
+        defaults = document.get("defaults", {})
+        includes = document.get("include", [])
+        if isinstance(includes, str):
+            includes = [includes]
+        for entry in document.get("servers", []):
+            entries.append({**defaults, **entry})
+        return entries, includes
+
+    def _parse_file(self, path: str, stamp: tuple) -> Dict[str, Any]:
+        servers = []
+        skipped = 0
+        entries, includes = self._read_entries(path)
+        for entry in entries:
+            if not isinstance(entry, dict) or "name" not in entry or "hostname" not in entry:
+                skipped += 1
+                continue
+            for server in expand_host_ranges(entry):
+                tags = server.get("tags")
+                if isinstance(tags, str):
+                    server["tags"] = [tags]
+                servers.append(server)
+        if skipped:
+            self.logger.warning(f"Skipped {skipped} inventory entries without name/hostname in {path}")
+        include_dir = os.path.dirname(path)
+        return {
+            "stamp": stamp,
+            "servers": servers,
+            "includes": [os.path.join(include_dir, pattern) for pattern in includes]
+        }
+
+    def _visit(self, path: str, files: Dict[str, Any], reparsed: List[str]):
+        path = os.path.abspath(path)
+        if path in files:
+            return
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            self.logger.error(f"Cannot read inventory file {path}: {e}")
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(path)
+        if cached is not None and cached["stamp"] == stamp:
+            files[path] = cached
+        else:
+            try:
+                files[path] = self._parse_file(path, stamp)
+                reparsed.append(path)
+            except Exception as e:
+                self.logger.error(f"Failed to load inventory file {path}: {e}")
+                if cached is None:
+                    return
+                files[path] = cached
+        for pattern in files[path]["includes"]:
+            for included in sorted(glob.glob(pattern)):
+                self._visit(included, files, reparsed)
+
+    def reload(self) -> Optional[Dict[str, Any]]:
+        files = {}
+        reparsed = []
+        for source in self.sources:
+            matches = sorted(glob.glob(source)) if glob.has_magic(source) else [source]
+            for path in matches:
+                self._visit(path, files, reparsed)
+        if not reparsed and list(files) == list(self._files):
+            return None
+        previous = self._by_name
+        servers = []
+        by_name = {}
+        by_tag = {}
+        duplicates = 0
+        for entry in files.values():
+            for server in entry["servers"]:
+                if server["name"] in by_name:
+                    duplicates += 1
+                    continue
+                by_name[server["name"]] = server
+                servers.append(server)
+                for tag in server.get("tags", []):
+                    by_tag.setdefault(tag, []).append(server)
+        if duplicates:
+            self.logger.warning(f"Ignored {duplicates} duplicate server name(s) in inventory")
+        touched = {server["name"] for path in reparsed for server in files[path]["servers"]}
+        changes = {
+            "files": len(files),
+            "files_parsed": len(reparsed),
+            "added": [name for name in by_name if name not in previous],
+            "removed": [name for name in previous if name not in by_name],
+            "changed": [name for name in touched if name in previous and previous[name] != by_name.get(name)]
+        }
+        self._files = files
+        self.servers = servers
+        self._by_name = by_name
+        self._by_tag = by_tag
+        return changes
+
+    def load(self) -> List[Dict[str, Any]]:
+        self.reload()
+        return self.servers
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        return self._by_name.get(name)
+
+    def __contains__(self, name: Any) -> bool:
+        return name in self._by_name
+
+    def __len__(self) -> int:
+        return len(self.servers)
+
+    def with_tag(self, tag: str) -> List[Dict[str, Any]]:
+        return list(self._by_tag.get(tag, []))
+
+    def tags(self) -> List[str]:
+        return sorted(self._by_tag)
+
+    def select(self, tags: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        if not tags:
+            return self.servers
+        wanted = set(tags)
+        return [server for server in self.servers if wanted.intersection(server.get("tags", []))]
+
+    def file_count(self) -> int:
+        return len(self._files)
@@ -0,0 +1,1791 @@
+import paramiko
+import json
+import csv
+import logging
+from datetime import datetime
+import matplotlib.pyplot as plt
+import numpy as np
+from typing import Dict, List, Any, Optional
+import os
+import sys
+import threading
+import asyncio
+import time
+import heapq
+import random
+import socket
+import copy
+import shlex
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+
+from .history import ROLLUP_DIR, HealthHistoryStore
+from .rollup import HistoryRollup
+from .query import HistoryQuery
+from .streaming import CSV_HEADER, StreamingResultWriter
+from .host_table import HostTable
+from .report import REPORT_DETAIL_LIMIT, summarize_fleet
+from .delta import DeltaRecorder
+from .breakers import CircuitBreakerRegistry
+from .alerts import ALERT_LEVELS, LEVEL_LABELS, load_alert_rules, AlertRuleEngine
+from .anomaly import AnomalyDetector
+from .exporter import MetricsExporter
+from .snapshot import SnapshotWriter
+from .profiling import PhaseTimings
+from .dashboard import DashboardRenderer
+from .async_logging import AsyncServerLogging
+from .transports import AsyncTransport, ParamikoExecutorTransport
+from .pool import SSHConnectionPool
+from .inventory import ServerInventory
+
+
+DEFAULT_OUTPUT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE_COMMANDS = {
+    "uptime": "uptime",
+    "disk": "df -h",
+    "memory": "free -m"
+}
+PROBE_MARKER = "@@HEALTH_PROBE:{}@@"
+PROBE_TIMEOUT = 30
+MAX_STATVFS_PER_HOST = 256
+SFTP_STATVFS_PARAMIKO_MAJORS = range(2, 6)
+SFTP_STATVFS_SUPPORTED = (
+    int(paramiko.__version__.split('.')[0]) in SFTP_STATVFS_PARAMIKO_MAJORS and hasattr(paramiko.SFTPClient, "_request")
+)
+SHARD_DEADLINE_GRACE = 5
+DF_SKIPPED_FILESYSTEMS = ('tmpfs', 'udev')
+PSEUDO_FILESYSTEMS = {
+    "proc", "sysfs", "devtmpfs", "tmpfs", "devpts", "cgroup", "cgroup2", "securityfs", "pstore",
+    "bpf", "debugfs", "tracefs", "configfs", "fusectl", "mqueue", "hugetlbfs", "autofs",
+    "binfmt_misc", "rpc_pipefs", "nsfs", "efivarfs", "ramfs", "squashfs"
+}
+NETWORK_FILESYSTEMS = {
+    "nfs", "nfs4", "cifs", "smb3", "smbfs", "ncpfs", "afs", "9p", "ceph", "glusterfs", "lustre", "gpfs",
+    "fuse.sshfs", "fuse.glusterfs", "fuse.s3fs", "fuse.rclone", "davfs"
+}
+
+
+class ServerHealthMonitor:
+    def __init__(self, config_file: Any = None, connection_pool: Optional[SSHConnectionPool] = None,
+                 probe_mode: str = "commands", history_dir: Optional[str] = None,
+                 output_dir: Optional[str] = None):
+        self.script_dir = os.path.abspath(output_dir) if output_dir else DEFAULT_OUTPUT_DIR
+        os.makedirs(self.script_dir, exist_ok=True)
+        logs_dir = os.path.join(self.script_dir, 'logs')
+        os.makedirs(logs_dir, exist_ok=True)
+        self.setup_logging()
+        self.inventory = None
+        self.inventory_tags = None
+        self._retired_servers = set()
+        self.servers = self._load_servers(config_file)
+        self.collected_data = HostTable()
+        self.failed_connections = []
+        self.connection_pool = connection_pool
+        self.probe_mode = probe_mode
+        self.history_store = HealthHistoryStore(history_dir) if history_dir else None
+        self.history_rollup = None
+        self.result_writer = None
+        self.dashboard_renderer = None
+        self.delta_recorder = None
+        self.circuit_breakers = None
+        self.alert_rules = AlertRuleEngine()
+        self.alert_log = None
+        self.anomaly_detector = None
+        self.report_mode = "auto"
+        self.report_top_n = 10
+        self.report_json = None
+        self.exporter = None
+        self.async_logging = None
+        self.async_logging_options = None
+        self.dashboard_dpi = 300
+        self._state_lock = threading.Lock()
+        self._analysis_lock = threading.Lock()
+        self.snapshot_writer = None
+        self._logger_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._deadline = None
+        self._deadline_seconds = None
+        self._result_claims = {}
+        self._claims_lock = threading.Lock()
+        self._active_clients = {}
+        self.timings = PhaseTimings()
+        self.show_timings = False
+        
+    def setup_logging(self):
+        for handler in logging.root.handlers[:]:
+            logging.root.removeHandler(handler)
+        main_log_path = os.path.join(self.script_dir, 'server_health_main.log')
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.FileHandler(main_log_path),
+                logging.StreamHandler(sys.stdout)
+            ]
+        )
+        self.main_logger = logging.getLogger()
+        
+    def _load_servers(self, config_file: Any = None) -> List[Dict[str, Any]]:
+        if config_file:
+            sources = [config_file] if isinstance(config_file, str) else list(config_file)
+            try:
+                inventory = ServerInventory(sources, self.main_logger)
+                servers = inventory.load()
+                if inventory.file_count():
+                    self.inventory = inventory
+                    self.main_logger.info(
+                        f"Loaded {len(servers)} server(s) from {inventory.file_count()} inventory file(s)"
+                    )
+                    return servers
+                self.main_logger.warning(f"No inventory files found for {', '.join(sources)}")
+            except Exception as e:
+                self.main_logger.error(f"Failed to load config file: {e}")
+        return [
+            {
+                "name": "ubuntu-vm",
+                "hostname": "192.168.1.37",
+                "username": "neo", 
+                "password": "marshall",
+                "port": 22
+            },
+            {
+                "name": "redhat-vm", 
+                "hostname": "192.168.1.24",
+                "username": "neon",
+                "password": "neon",
+                "port": 22
+            }
+        ]
+    
+    def select_servers(self, tags: Optional[List[str]] = None):
+        self.inventory_tags = tags or None
+        if self.inventory is not None:
+            self.servers = self.inventory.select(self.inventory_tags)
+        elif tags:
+            wanted = set(tags)
+            self.servers = [server for server in self.servers if wanted.intersection(server.get("tags", []))]
+
+    def reload_inventory(self) -> bool:
+        if self.inventory is None:
+            return False
+        try:
+            changes = self.inventory.reload()
+        except Exception as e:
+            self.main_logger.error(f"Failed to reload inventory: {e}")
+            return False
+        if changes is None:
+            return False
+        servers = self.inventory.select(self.inventory_tags)
+        current = {server["name"] for server in servers}
+        retired = [server["name"] for server in self.servers if server["name"] not in current]
+        with self._state_lock:
+            self.servers = servers
+            self._retired_servers.difference_update(current)
+            self._retired_servers.update(retired)
+            for server_name in retired:
+                if server_name in self.collected_data:
+                    del self.collected_data[server_name]
+            with self._analysis_lock:
+                self.alert_rules.forget(retired)
+                if self.anomaly_detector is not None:
+                    self.anomaly_detector.forget(retired)
+                if self.delta_recorder is not None:
+                    self.delta_recorder.forget(retired)
+            retired_names = set(retired)
+            self.failed_connections = [f for f in self.failed_connections if f["server"] not in retired_names]
+        self.main_logger.info(
+            f"Inventory reloaded: {changes['files_parsed']}/{changes['files']} file(s) parsed, "
+            f"{len(changes['added'])} added, {len(changes['removed'])} removed, {len(changes['changed'])} changed"
+        )
+        return True
+
+    def get_server_logger(self, server_name: str) -> logging.Logger:
+        logger_name = f"server_{server_name}"
+        server_logger = logging.getLogger(logger_name)
+        with self._logger_lock:
+            if self.async_logging is not None:
+                if self.async_logging.queue_handler not in server_logger.handlers:
+                    for handler in server_logger.handlers[:]:
+                        server_logger.removeHandler(handler)
+                        handler.close()
+                    server_logger.setLevel(logging.INFO)
+                    server_logger.propagate = False
+                    server_logger.addHandler(self.async_logging.queue_handler)
+            elif not server_logger.handlers:
+                server_logger.setLevel(logging.INFO)
+                server_logger.propagate = False
+                log_filename = os.path.join(self.script_dir, 'logs', f'{server_name}.log')
+                file_handler = logging.FileHandler(log_filename)
+                formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+                file_handler.setFormatter(formatter)
+                server_logger.addHandler(file_handler)
+        return server_logger
+
+    def _record_failed_connection(self, server_name: str, error: str):
+        if not self._claim_result(server_name, "result"):
+            return
+        with self._state_lock:
+            self.failed_connections.append({
+                "server": server_name,
+                "error": error,
+                "timestamp": datetime.now().isoformat()
+            })
+    
+    def _open_ssh_client(self, server_config: Dict[str, Any]) -> paramiko.SSHClient:
+        ssh_client = paramiko.SSHClient()
+        ssh_client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        self._active_clients[server_config["name"]] = ssh_client
+        try:
+            with self.timings.time("ssh_connect", server_config["name"]):
+                ssh_client.connect(
+                    hostname=server_config["hostname"],
+                    username=server_config["username"],
+                    password=server_config["password"],
+                    port=server_config.get("port", 22),
+                    timeout=15,
+                    banner_timeout=20
+                )
+        except Exception:
+            self._active_clients.pop(server_config["name"], None)
+            ssh_client.close()
+            raise
+        if self._active_clients.get(server_config["name"]) is not ssh_client:
+            ssh_client.close()
+            raise paramiko.SSHException("Connection abandoned at the pass deadline")
+        return ssh_client
+
+    def enable_async_logging(self, max_open_files: int = 256, max_bytes: int = 10 * 1024 * 1024,
+                             backup_count: int = 3, queue_size: int = 100000):
+        self.async_logging_options = {
+            "max_open_files": max_open_files,
+            "max_bytes": max_bytes,
+            "backup_count": backup_count,
+            "queue_size": queue_size
+        }
+        self.async_logging = AsyncServerLogging(
+            os.path.join(self.script_dir, 'logs'), max_open_files, max_bytes, backup_count, queue_size
+        )
+
+    def shard_options(self) -> Dict[str, Any]:
+        return {
+            "output_dir": self.script_dir,
+            "async_logging": self.async_logging_options if self.async_logging is not None else None
+        }
+
+    def close(self):
+        self.flush_history()
+        if self.connection_pool is not None:
+            self.connection_pool.close_all()
+        if self.exporter is not None:
+            self.exporter.close()
+            self.exporter = None
+        if self.async_logging is not None:
+            self.async_logging.stop()
+            stats = self.async_logging.stats()
+            self.main_logger.info(
+                f"Server logging: {stats['written']} record(s) written, {stats['dropped']} dropped, "
+                f"{stats['files_evicted']} log file(s) evicted"
+            )
+            if stats["dropped"]:
+                self.main_logger.warning(f"Dropped {stats['dropped']} server log record(s) - logging queue was full")
+            self.async_logging = None
+
+    def execute_remote_command(self, ssh_client: paramiko.SSHClient, command: str) -> tuple:
+        try:
+            stdin, stdout, stderr = ssh_client.exec_command(command, timeout=PROBE_TIMEOUT)
+            output = stdout.read().decode().strip()
+            error = stderr.read().decode().strip()
+            if error and "Warning" not in error:
+                logging.warning(f"Command '{command}' returned error: {error}")
+            return output, error
+        except Exception as e:
+            logging.error(f"Failed to execute command '{command}': {e}")
+            return "", str(e)
+    
+    def build_batched_probe_command(self) -> str:
+        parts = []
+        for section, command in PROBE_COMMANDS.items():
+            marker = PROBE_MARKER.format(section)
+            parts.append(f"echo '{marker}'; echo '{marker}' >&2; {command}")
+        return "; ".join(parts)
+
+    def split_probe_output(self, output: str) -> Dict[str, str]:
+        markers = {PROBE_MARKER.format(section): section for section in PROBE_COMMANDS}
+        sections = {section: [] for section in PROBE_COMMANDS}
+        current = None
+        for line in output.splitlines():
+            stripped = line.strip()
+            if stripped in markers:
+                current = markers[stripped]
+            elif current is not None:
+                sections[current].append(line)
+        return {section: '\n'.join(lines).strip() for section, lines in sections.items()}
+
+    def execute_batched_probe(self, ssh_client: paramiko.SSHClient) -> Dict[str, tuple]:
+        command = self.build_batched_probe_command()
+        try:
+            stdin, stdout, stderr = ssh_client.exec_command(command, timeout=PROBE_TIMEOUT)
+            outputs = self.split_probe_output(stdout.read().decode())
+            errors = self.split_probe_output(stderr.read().decode())
+        except Exception as e:
+            logging.error(f"Failed to execute batched probe: {e}")
+            return {section: ("", str(e)) for section in PROBE_COMMANDS}
+        for section, error in errors.items():
+            if error and "Warning" not in error:
+                logging.warning(f"Command '{PROBE_COMMANDS[section]}' returned error: {error}")
+        return {section: (outputs[section], errors[section]) for section in PROBE_COMMANDS}
+
+    def _read_remote_file(self, sftp: paramiko.SFTPClient, path: str) -> str:
+        with sftp.open(path, 'r') as remote_file:
+            return remote_file.read().decode()
+
+    def _sftp_statvfs(self, sftp: paramiko.SFTPClient, path: str) -> Dict[str, int]:
+        t, msg = sftp._request(paramiko.sftp.CMD_EXTENDED, "statvfs@openssh.com", path)
+        if t != paramiko.sftp.CMD_EXTENDED_REPLY:
+            raise paramiko.SSHException(f"Unexpected statvfs response for {path}")
+        fields = ["f_bsize", "f_frsize", "f_blocks", "f_bfree", "f_bavail",
+                  "f_files", "f_ffree", "f_favail", "f_fsid", "f_flag", "f_namemax"]
+        return {field: msg.get_int64() for field in fields}
+
+    def _df_statvfs(self, ssh_client: paramiko.SSHClient, paths: List[str]) -> Dict[str, Dict[str, int]]:
+        output, error = self.execute_remote_command(
+            ssh_client, "df -P -k -- " + " ".join(shlex.quote(path) for path in paths)
+        )
+        if not output:
+            raise paramiko.SSHException(f"df failed: {error or 'no output'}")
+        stats = {}
+        for line in output.splitlines()[1:]:
+            parts = line.split(None, 5)
+            if len(parts) < 6 or not parts[1].isdigit():
+                continue
+            blocks, used, available = int(parts[1]), int(parts[2]), int(parts[3])
+            stats[parts[5]] = {"f_frsize": 1024, "f_blocks": blocks, "f_bfree": blocks - used, "f_bavail": available}
+        return stats
+
+    def format_proc_uptime(self, proc_uptime: str) -> str:
+        seconds = int(float(proc_uptime.split()[0]))
+        days, remainder = divmod(seconds, 86400)
+        hours, remainder = divmod(remainder, 3600)
+        minutes = remainder // 60
+        clock = f"{hours}:{minutes:02d}" if hours else f"{minutes} min"
+        if days:
+            return f"up {days} day{'s' if days != 1 else ''}, {clock},"
+        return f"up {clock},"
+
+    def parse_proc_loadavg(self, loadavg: str, proc_uptime: str = "") -> Dict[str, Any]:
+        try:
+            load_avg = loadavg.split()
+            return {
+                "load_1min": float(load_avg[0]),
+                "load_5min": float(load_avg[1]),
+                "load_15min": float(load_avg[2]),
+                "uptime_string": self.format_proc_uptime(proc_uptime) if proc_uptime else "Unknown"
+            }
+        except Exception as e:
+            logging.error(f"Error parsing /proc/loadavg: {e}")
+            return {"load_1min": 0, "load_5min": 0, "load_15min": 0, "uptime_string": "Unknown"}
+
+    def parse_proc_meminfo(self, meminfo: str) -> Dict[str, int]:
+        try:
+            fields = {}
+            for line in meminfo.splitlines():
+                key, _, value = line.partition(':')
+                if value:
+                    fields[key] = int(value.split()[0])
+            total = fields["MemTotal"]
+            free = fields["MemFree"]
+            if "MemAvailable" in fields:
+                used = total - fields["MemAvailable"]
+            else:
+                used = total - free - fields.get("Buffers", 0) - fields.get("Cached", 0) - fields.get("SReclaimable", 0)
+            memory_data = {
+                "memory_total": total // 1024,
+                "memory_used": used // 1024,
+                "memory_free": free // 1024,
+                "memory_available": fields.get("MemAvailable", 0) // 1024
+            }
+            if "SwapTotal" in fields:
+                memory_data.update({
+                    "swap_total": fields["SwapTotal"] // 1024,
+                    "swap_used": (fields["SwapTotal"] - fields.get("SwapFree", 0)) // 1024,
+                    "swap_free": fields.get("SwapFree", 0) // 1024
+                })
+            if memory_data["memory_total"] > 0:
+                memory_data["memory_usage_percent"] = round(
+                    (memory_data["memory_used"] / memory_data["memory_total"]) * 100, 2
+                )
+            return memory_data
+        except Exception as e:
+            logging.error(f"Error parsing /proc/meminfo: {e}")
+            return {}
+
+    def parse_proc_mounts(self, mounts: str) -> List[tuple]:
+        entries = []
+        seen = set()
+        devices = set()
+        for line in mounts.splitlines():
+            parts = line.split()
+            if len(parts) < 3:
+                continue
+            filesystem, mount_point, fs_type = parts[0], parts[1], parts[2]
+            if fs_type in PSEUDO_FILESYSTEMS or filesystem.startswith('tmpfs') or filesystem.startswith('udev'):
+                continue
+            if fs_type in NETWORK_FILESYSTEMS:
+                continue
+            mount_point = mount_point.encode().decode('unicode_escape') if '\\' in mount_point else mount_point
+            if mount_point in seen or filesystem in devices:
+                continue
+            seen.add(mount_point)
+            if filesystem.startswith('/'):
+                devices.add(filesystem)
+            entries.append((filesystem, mount_point))
+        return entries
+
+    def read_proc_disks(self, sftp: paramiko.SFTPClient, ssh_client: paramiko.SSHClient) -> List[Dict[str, Any]]:
+        disks = []
+        mounts = self.parse_proc_mounts(self._read_remote_file(sftp, '/proc/mounts'))
+        if len(mounts) > MAX_STATVFS_PER_HOST:
+            logging.warning(f"{len(mounts)} mount points found, checking only the first {MAX_STATVFS_PER_HOST}")
+            mounts = mounts[:MAX_STATVFS_PER_HOST]
+        df_stats = None
+        if not SFTP_STATVFS_SUPPORTED and mounts:
+            df_stats = self._df_statvfs(ssh_client, [mount_point for _, mount_point in mounts])
+        for filesystem, mount_point in mounts:
+            try:
+                stats = self._sftp_statvfs(sftp, mount_point) if df_stats is None else df_stats[mount_point]
+            except socket.timeout:
+                raise
+            except Exception as e:
+                logging.warning(f"statvfs failed for {mount_point}: {e}")
+                continue
+            if stats["f_blocks"] == 0:
+                continue
+            size = stats["f_blocks"] * stats["f_frsize"]
+            used = (stats["f_blocks"] - stats["f_bfree"]) * stats["f_frsize"]
+            available = stats["f_bavail"] * stats["f_frsize"]
+            usable = used + available
+            use_percent = -(-used * 100 // usable) if usable else 0
+            disks.append({
+                "filesystem": filesystem,
+                "size": size,
+                "used": used,
+                "available": available,
+                "use_percent": str(use_percent),
+                "mounted_on": mount_point
+            })
+        return disks
+
+    def execute_proc_probe(self, ssh_client: paramiko.SSHClient) -> Dict[str, Any]:
+        result = {
+            "uptime": {"load_1min": 0, "load_5min": 0, "load_15min": 0, "uptime_string": "Unknown"},
+            "disk_usage": [],
+            "memory": {},
+            "uptime_error": "",
+            "disk_error": "",
+            "memory_error": ""
+        }
+        try:
+            sftp = ssh_client.open_sftp()
+            sftp.get_channel().settimeout(PROBE_TIMEOUT)
+        except Exception as e:
+            logging.error(f"Failed to open SFTP session: {e}")
+            result.update({"uptime_error": str(e), "disk_error": str(e), "memory_error": str(e)})
+            return result
+        try:
+            try:
+                result["uptime"] = self.parse_proc_loadavg(
+                    self._read_remote_file(sftp, '/proc/loadavg'),
+                    self._read_remote_file(sftp, '/proc/uptime')
+                )
+            except Exception as e:
+                logging.error(f"Failed to read /proc/loadavg: {e}")
+                result["uptime_error"] = str(e)
+            try:
+                result["memory"] = self.parse_proc_meminfo(self._read_remote_file(sftp, '/proc/meminfo'))
+            except Exception as e:
+                logging.error(f"Failed to read /proc/meminfo: {e}")
+                result["memory_error"] = str(e)
+            try:
+                result["disk_usage"] = self.read_proc_disks(sftp, ssh_client)
+            except Exception as e:
+                logging.error(f"Failed to read mount points: {e}")
+                result["disk_error"] = str(e)
+        finally:
+            sftp.close()
+        return result
+
+    def parse_uptime(self, uptime_output: str) -> Dict[str, Any]:
+        try:
+            head, separator, tail = uptime_output.partition('load average:')
+            if not separator:
+                if not uptime_output:
+                    return {"load_1min": 0, "load_5min": 0, "load_15min": 0, "uptime_string": "Unknown"}
+                return {"load_1min": 0.0, "load_5min": 0.0, "load_15min": 0.0, "uptime_string": head.strip()}
+            if 'load average:' in tail:
+                tail = tail.split('load average:', 1)[0]
+            load_avg = tail.split(',', 3)
+            return {
+                "load_1min": float(load_avg[0]),
+                "load_5min": float(load_avg[1]),
+                "load_15min": float(load_avg[2]),
+                "uptime_string": head.strip()
+            }
+        except Exception as e:
+            logging.error(f"Error parsing uptime: {e}")
+            return {"load_1min": 0, "load_5min": 0, "load_15min": 0, "uptime_string": "Unknown"}
+    
+    def parse_disk_usage(self, df_output: str) -> List[Dict[str, str]]:
+        disks = []
+        try:
+            if not df_output:
+                return disks
+            lines = df_output.split('\n')
+            del lines[0]
+            append = disks.append
+            for line in lines:
+                if line.startswith(DF_SKIPPED_FILESYSTEMS):
+                    continue
+                parts = line.split()
+                if len(parts) >= 6:
+                    append({
+                        "filesystem": parts[0],
+                        "size": parts[1],
+                        "used": parts[2],
+                        "available": parts[3],
+                        "use_percent": parts[4].rstrip('%'),
+                        "mounted_on": parts[5]
+                    })
+            return disks
+        except Exception as e:
+            logging.error(f"Error parsing disk usage: {e}")
+            return []
+    
+    def parse_memory_usage(self, free_output: str) -> Dict[str, int]:
+        try:
+            lines = free_output.split('\n', 3)
+            if len(lines) < 3:
+                return {}
+            memory_line = lines[1].split()
+            swap_line = lines[2].split()
+            total = int(memory_line[1])
+            used = int(memory_line[2])
+            memory_data = {
+                "memory_total": total,
+                "memory_used": used,
+                "memory_free": int(memory_line[3]),
+                "memory_available": int(memory_line[6]) if len(memory_line) > 6 else 0
+            }
+            if len(swap_line) >= 4:
+                memory_data["swap_total"] = int(swap_line[1])
+                memory_data["swap_used"] = int(swap_line[2])
+                memory_data["swap_free"] = int(swap_line[3])
+            if total > 0:
+                memory_data["memory_usage_percent"] = round((used / total) * 100, 2)
+            return memory_data
+        except Exception as e:
+            logging.error(f"Error parsing memory usage: {e}")
+            return {}
+    
+    def _record_probe_errors(self, server_data: Dict[str, Any], server_logger: logging.Logger,
+                             uptime_error: str, df_error: str, free_error: str):
+        if uptime_error and "Warning" not in uptime_error:
+            server_data["uptime_error"] = uptime_error
+            server_logger.warning(f"Uptime command error: {uptime_error}")
+        if df_error and "Warning" not in df_error:
+            server_data["disk_error"] = df_error
+            server_logger.warning(f"Disk usage command error: {df_error}")
+        if free_error and "Warning" not in free_error:
+            server_data["memory_error"] = free_error
+            server_logger.warning(f"Memory usage command error: {free_error}")
+
+    def _mark_collection_failed(self, server_data: Dict[str, Any], server_logger: logging.Logger, error: Exception):
+        server_name = server_data["server_name"]
+        if isinstance(error, paramiko.AuthenticationException):
+            error_msg = f"Authentication failed for {server_name}"
+            server_logger.error(error_msg)
+            self.main_logger.error(f"{server_name}: Authentication failed")
+            server_data["status"] = "failed"
+            server_data["error"] = "Authentication failed"
+            self._record_failed_connection(server_name, "Authentication failed")
+        elif isinstance(error, paramiko.SSHException):
+            error_msg = f"SSH connection failed for {server_name}: {error}"
+            server_logger.error(error_msg)
+            self.main_logger.error(f"{server_name}: SSH connection failed")
+            server_data["status"] = "failed"
+            server_data["error"] = str(error)
+            self._record_failed_connection(server_name, str(error))
+        else:
+            error_msg = f"Unexpected error connecting to {server_name}: {error}"
+            server_logger.error(error_msg)
+            self.main_logger.error(f"{server_name}: Connection failed - {error}")
+            server_data["status"] = "failed"
+            server_data["error"] = str(error)
+            self._record_failed_connection(server_name, str(error))
+
+    async def _run_async(self, transport: AsyncTransport, session: Any, command: str) -> tuple:
+        try:
+            output, error = await transport.run(session, command, PROBE_TIMEOUT)
+            return output, error
+        except Exception as e:
+            logging.error(f"Failed to execute command '{command}': {e}")
+            return "", str(e)
+
+    async def _probe_async(self, server_config: Dict[str, Any], server_data: Dict[str, Any],
+                           server_logger: logging.Logger, transport: AsyncTransport):
+        server_name = server_config["name"]
+        server_logger.info(f"Connecting to {server_config['hostname']}")
+        with self.timings.time("connect", server_name):
+            session = await transport.connect(server_config)
+        try:
+            server_logger.info("Successfully connected to server")
+            self.main_logger.info(f"Connected to {server_config['name']}")
+            if self.probe_mode == "batched":
+                with self.timings.time("probe:batched", server_name):
+                    output, error = await self._run_async(transport, session, self.build_batched_probe_command())
+                outputs = self.split_probe_output(output)
+                errors = self.split_probe_output(error)
+                uptime_output, uptime_error = outputs["uptime"], errors["uptime"]
+                df_output, df_error = outputs["disk"], errors["disk"]
+                free_output, free_error = outputs["memory"], errors["memory"]
+                server_logger.info(
+                    f"Batched probe executed - Output lengths: uptime={len(uptime_output)}, "
+                    f"df={len(df_output)}, free={len(free_output)}"
+                )
+            else:
+                with self.timings.time("command:uptime", server_name):
+                    uptime_output, uptime_error = await self._run_async(transport, session, "uptime")
+                uptime_output, uptime_error = uptime_output.strip(), uptime_error.strip()
+                server_logger.info(f"Uptime command executed - Output length: {len(uptime_output)}")
+                with self.timings.time("command:df", server_name):
+                    df_output, df_error = await self._run_async(transport, session, "df -h")
+                df_output, df_error = df_output.strip(), df_error.strip()
+                server_logger.info(f"Disk usage command executed - Output length: {len(df_output)}")
+                with self.timings.time("command:free", server_name):
+                    free_output, free_error = await self._run_async(transport, session, "free -m")
+                free_output, free_error = free_output.strip(), free_error.strip()
+                server_logger.info(f"Memory usage command executed - Output length: {len(free_output)}")
+            with self.timings.time("parse", server_name):
+                server_data["uptime"] = self.parse_uptime(uptime_output)
+                server_data["disk_usage"] = self.parse_disk_usage(df_output)
+                server_data["memory"] = self.parse_memory_usage(free_output)
+            self._record_probe_errors(server_data, server_logger, uptime_error, df_error, free_error)
+        finally:
+            self._active_clients.pop(server_config["name"], None)
+            await transport.close(session)
+            server_logger.info("SSH connection closed")
+
+    async def collect_server_data_async(self, server_config: Dict[str, Any], transport: AsyncTransport,
+                                        host_timeout: float = 60) -> Dict[str, Any]:
+        suppressed = self._suppressed_result(server_config)
+        if suppressed is not None:
+            return suppressed
+        server_name = server_config["name"]
+        server_logger = self.get_server_logger(server_name)
+        server_data = {
+            "timestamp": datetime.now().isoformat(),
+            "server_name": server_name,
+            "hostname": server_config["hostname"],
+            "status": "success"
+        }
+        server_logger.info(f"Starting health check for {server_name}")
+        self.main_logger.info(f"Checking server: {server_name}")
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(
+                self._probe_async(server_config, server_data, server_logger, transport), host_timeout
+            )
+            server_logger.info("Health check completed successfully")
+            self.main_logger.info(f"Successfully collected data from {server_name}")
+        except asyncio.TimeoutError:
+            self._mark_collection_failed(
+                server_data, server_logger, TimeoutError(f"Health check timed out after {host_timeout}s")
+            )
+        except Exception as e:
+            self._mark_collection_failed(server_data, server_logger, e)
+        self.timings.record("host_total", time.perf_counter() - started, server_name)
+        return server_data
+
+    def collect_server_data(self, server_config: Dict[str, Any]) -> Dict[str, Any]:
+        suppressed = self._suppressed_result(server_config)
+        if suppressed is not None:
+            return suppressed
+        server_name = server_config["name"]
+        server_logger = self.get_server_logger(server_name)
+        server_data = {
+            "timestamp": datetime.now().isoformat(),
+            "server_name": server_name,
+            "hostname": server_config["hostname"],
+            "status": "success"
+        }
+        server_logger.info(f"Starting health check for {server_name}")
+        self.main_logger.info(f"Checking server: {server_name}")
+        ssh_client = None
+        started = time.perf_counter()
+        try:
+            server_logger.info(f"Connecting to {server_config['hostname']}")
+            with self.timings.time("connect", server_name):
+                if self.connection_pool is not None:
+                    ssh_client, reused = self.connection_pool.acquire(server_config, self._open_ssh_client)
+                else:
+                    ssh_client, reused = self._open_ssh_client(server_config), False
+            server_logger.info("Reusing pooled connection" if reused else "Successfully connected to server")
+            self.main_logger.info(f"Connected to {server_name}")
+            self._active_clients[server_name] = ssh_client
+            if self.probe_mode == "proc":
+                with self.timings.time("probe:proc", server_name):
+                    probe = self.execute_proc_probe(ssh_client)
+                server_data["uptime"] = probe["uptime"]
+                server_data["disk_usage"] = probe["disk_usage"]
+                server_data["memory"] = probe["memory"]
+                uptime_error = probe["uptime_error"]
+                df_error = probe["disk_error"]
+                free_error = probe["memory_error"]
+                server_logger.info(f"/proc probe executed - {len(probe['disk_usage'])} mount(s) read")
+            elif self.probe_mode == "batched":
+                with self.timings.time("probe:batched", server_name):
+                    probe = self.execute_batched_probe(ssh_client)
+                uptime_output, uptime_error = probe["uptime"]
+                df_output, df_error = probe["disk"]
+                free_output, free_error = probe["memory"]
+                server_logger.info(
+                    f"Batched probe executed - Output lengths: uptime={len(uptime_output)}, "
+                    f"df={len(df_output)}, free={len(free_output)}"
+                )
+            else:
+                with self.timings.time("command:uptime", server_name):
+                    uptime_output, uptime_error = self.execute_remote_command(ssh_client, "uptime")
+                server_logger.info(f"Uptime command executed - Output length: {len(uptime_output)}")
+                with self.timings.time("command:df", server_name):
+                    df_output, df_error = self.execute_remote_command(ssh_client, "df -h")
+                server_logger.info(f"Disk usage command executed - Output length: {len(df_output)}")
+                with self.timings.time("command:free", server_name):
+                    free_output, free_error = self.execute_remote_command(ssh_client, "free -m")
+                server_logger.info(f"Memory usage command executed - Output length: {len(free_output)}")
+            if self.probe_mode != "proc":
+                with self.timings.time("parse", server_name):
+                    server_data["uptime"] = self.parse_uptime(uptime_output)
+                    server_data["disk_usage"] = self.parse_disk_usage(df_output)
+                    server_data["memory"] = self.parse_memory_usage(free_output)
+            self._record_probe_errors(server_data, server_logger, uptime_error, df_error, free_error)
+            server_logger.info("Health check completed successfully")
+            self.main_logger.info(f"Successfully collected data from {server_name}")
+        except Exception as e:
+            self._mark_collection_failed(server_data, server_logger, e)
+        finally:
+            self._active_clients.pop(server_name, None)
+            if ssh_client is not None:
+                if self.connection_pool is not None and server_data["status"] == "success":
+                    self.connection_pool.release(server_config, ssh_client)
+                    server_logger.info("SSH connection returned to pool")
+                elif self.connection_pool is not None:
+                    self.connection_pool.discard(ssh_client)
+                    server_logger.info("SSH connection closed")
+                else:
+                    ssh_client.close()
+                    server_logger.info("SSH connection closed")
+            self.timings.record("host_total", time.perf_counter() - started, server_name)
+        return server_data
+    
+    def snapshot_document(self) -> Dict[str, Any]:
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "servers_checked": len(self.servers),
+            "successful_connections": self.collected_data.count_status("success"),
+            "failed_connections": len(self.failed_connections),
+            "suppressed_connections": self.collected_data.count_status("suppressed"),
+            "timed_out_connections": self.collected_data.count_status("timed_out"),
+            "data": self.collected_data.to_dict(),
+            "failed_connections_detail": list(self.failed_connections),
+            "alerts": self.alert_rules.active() if self.alert_log is not None else [],
+            "anomalies": self.anomaly_detector.current if self.anomaly_detector is not None else {}
+        }
+
+    def enable_exporter(self, host: str = "127.0.0.1", port: int = 9108):
+        self.exporter = MetricsExporter(host, port)
+        address = self.exporter.address
+        self.main_logger.info(f"Serving /metrics and /snapshot.json on http://{address[0]}:{address[1]}")
+
+    def publish_snapshot(self, document: Optional[Dict[str, Any]] = None):
+        if self.exporter is None:
+            return
+        try:
+            start = time.perf_counter()
+            self.exporter.publish(document or self.snapshot_document())
+            self.main_logger.info(f"Published metrics snapshot in {time.perf_counter() - start:.2f}s")
+        except Exception as e:
+            self.main_logger.error(f"Failed to publish metrics snapshot: {e}")
+
+    def save_to_json(self, filename: str = "server_health_data.json"):
+        try:
+            output_data = self.snapshot_document()
+            filepath = os.path.join(self.script_dir, filename)
+            with open(filepath, 'w') as f:
+                json.dump(output_data, f, indent=2)
+            self.main_logger.info(f"Data saved to {filepath}")
+        except Exception as e:
+            self.main_logger.error(f"Failed to save JSON: {e}")
+    
+    def save_timings(self, filename: str = "server_health_timings.json"):
+        try:
+            filepath = os.path.join(self.script_dir, filename)
+            with open(filepath + '.tmp', 'w') as f:
+                json.dump({"timestamp": datetime.now().isoformat(), "timings": self.timings.summary()}, f, indent=2)
+            os.replace(filepath + '.tmp', filepath)
+            self.main_logger.info(f"Phase timings saved to {filepath}")
+        except Exception as e:
+            self.main_logger.error(f"Failed to save timings: {e}")
+
+    def csv_row(self, server_name: str, data: Dict[str, Any]) -> List[Any]:
+        if data["status"] == "success":
+            root_disk_usage = 0
+            for disk in data["disk_usage"]:
+                if disk["mounted_on"] == "/":
+                    root_disk_usage = disk["use_percent"]
+                    break
+            return [
+                server_name,
+                data["timestamp"],
+                data["status"],
+                data["hostname"],
+                data["uptime"]["load_1min"],
+                data["uptime"]["load_5min"],
+                data["uptime"]["load_15min"],
+                data["uptime"]["uptime_string"],
+                data["memory"].get("memory_total", 0),
+                data["memory"].get("memory_used", 0),
+                data["memory"].get("memory_free", 0),
+                data["memory"].get("memory_available", 0),
+                data["memory"].get("memory_usage_percent", 0),
+                data["memory"].get("swap_total", 0),
+                data["memory"].get("swap_used", 0),
+                data["memory"].get("swap_free", 0),
+                root_disk_usage
+            ]
+        return [
+            server_name,
+            data["timestamp"],
+            data["status"],
+            data["hostname"],
+            0, 0, 0, "Unknown",
+            0, 0, 0, 0, 0,
+            0, 0, 0, 0
+        ]
+
+    def save_to_csv(self, filename: str = "server_health_data.csv"):
+        try:
+            filepath = os.path.join(self.script_dir, filename)
+            with open(filepath, 'w', newline='') as csvfile:
+                writer = csv.writer(csvfile)
+                writer.writerow(CSV_HEADER)
+                writer.writerows(self.collected_data.csv_rows(self.csv_row))
+            self.main_logger.info(f"Data saved to {filepath}")
+        except Exception as e:
+            self.main_logger.error(f"Failed to save CSV: {e}")
+    
+    def enable_delta(self, keyframe_interval: int = 10, deadbands: Optional[Dict[str, float]] = None):
+        self.delta_recorder = DeltaRecorder(
+            os.path.join(self.script_dir, 'server_health_delta_state.json'),
+            os.path.join(self.script_dir, 'server_health_delta.ndjson'),
+            os.path.join(self.script_dir, 'server_health_delta.csv'),
+            keyframe_interval=keyframe_interval,
+            deadbands=deadbands
+        )
+
+    def save_delta(self) -> Optional[Dict[str, Any]]:
+        try:
+            with self._analysis_lock:
+                stats = self.delta_recorder.record(self.collected_data)
+        except Exception as e:
+            self.main_logger.error(f"Failed to save delta: {e}")
+            return None
+        kind = "keyframe" if stats["keyframe"] else "delta"
+        self.main_logger.info(
+            f"Delta pass {stats['pass']} ({kind}): {stats['hosts_changed']}/{stats['hosts']} host(s) changed, "
+            f"{stats['metrics_written']}/{stats['metrics_total']} metric(s) written to {self.delta_recorder.ndjson_path}"
+        )
+        print(f"🔁 Delta pass {stats['pass']} ({kind}): {stats['hosts_changed']}/{stats['hosts']} host(s) changed, "
+              f"{stats['metrics_written']}/{stats['metrics_total']} metric(s) written")
+        return stats
+
+    def save_results(self):
+        if self.delta_recorder is not None:
+            self.save_delta()
+        self.save_to_json()
+        self.save_to_csv()
+
+    def _dashboard_series(self) -> Dict[str, Any]:
+        return self.collected_data.dashboard_series()
+
+    def enable_fast_dashboard(self, aggregate_threshold: int = 50, top_n: int = 20):
+        self.dashboard_renderer = DashboardRenderer(aggregate_threshold=aggregate_threshold, top_n=top_n,
+                                                    thresholds=self.alert_rules.thresholds("warn"))
+
+    def _threshold_line(self, ax, metric: str):
+        threshold = self.alert_rules.threshold(metric, "warn")
+        if threshold is not None:
+            ax.axhline(y=threshold, color='red', linestyle='--', alpha=0.5, label='Overload Threshold')
+            ax.legend()
+
+    def visualize_data(self, output_file: str = "server_health_dashboard.png", dpi: Optional[int] = None):
+        if not self.collected_data:
+            self.main_logger.warning("No data to visualize")
+            return
+        dpi = dpi or self.dashboard_dpi
+        if self.dashboard_renderer is not None:
+            try:
+                filepath = os.path.join(self.script_dir, output_file)
+                elapsed = self.dashboard_renderer.render(self._dashboard_series(), filepath, dpi)
+                self.main_logger.info(f"Visualization saved as {filepath} (rendered in {elapsed:.2f}s)")
+            except Exception as e:
+                self.main_logger.error(f"Failed to create visualization: {e}")
+            return
+        try:
+            series = self._dashboard_series()
+            servers = series["servers"]
+            load_1min = series["load_1min"]
+            load_5min = series["load_5min"]
+            load_15min = series["load_15min"]
+            memory_usage = series["memory_usage"]
+            disk_usage = series["disk_usage"]
+            statuses = series["statuses"]
+            render_start = time.perf_counter()
+            plt.switch_backend('Agg')
+            plt.style.use('seaborn-v0_8')
+            fig, ((ax1, ax2), (ax3, ax4), (ax5, ax6)) = plt.subplots(3, 2, figsize=(16, 18))
+            fig.suptitle('Server Health Dashboard', fontsize=20, fontweight='bold')
+            bars1 = ax1.bar(servers, load_1min, color='lightblue', alpha=0.7)
+            ax1.set_title('1-minute Load Average\n(Immediate CPU Demand)', fontweight='bold', fontsize=12)
+            ax1.set_ylabel('Load Average')
+            ax1.tick_params(axis='x', rotation=45)
+            for bar in bars1:
+                height = bar.get_height()
+                ax1.text(bar.get_x() + bar.get_width()/2., height, f'{height:.2f}', ha='center', va='bottom', fontsize=9)
+            self._threshold_line(ax1, "load_1min")
+            bars2 = ax2.bar(servers, load_5min, color='lightsteelblue', alpha=0.7)
+            ax2.set_title('5-minute Load Average\n(Recent CPU Trend)', fontweight='bold', fontsize=12)
+            ax2.set_ylabel('Load Average')
+            ax2.tick_params(axis='x', rotation=45)
+            for bar in bars2:
+                height = bar.get_height()
+                ax2.text(bar.get_x() + bar.get_width()/2., height, f'{height:.2f}', ha='center', va='bottom', fontsize=9)
+            self._threshold_line(ax2, "load_5min")
+            bars3 = ax3.bar(servers, load_15min, color='steelblue', alpha=0.7)
+            ax3.set_title('15-minute Load Average\n(Long-term CPU Baseline)', fontweight='bold', fontsize=12)
+            ax3.set_ylabel('Load Average')
+            ax3.tick_params(axis='x', rotation=45)
+            for bar in bars3:
+                height = bar.get_height()
+                ax3.text(bar.get_x() + bar.get_width()/2., height, f'{height:.2f}', ha='center', va='bottom', fontsize=9)
+            self._threshold_line(ax3, "load_15min")
+            bars4 = ax4.bar(servers, memory_usage, color='lightcoral', alpha=0.7)
+            ax4.set_title('Memory Usage Percentage', fontweight='bold', fontsize=12)
+            ax4.set_ylabel('Usage (%)')
+            ax4.tick_params(axis='x', rotation=45)
+            for bar in bars4:
+                height = bar.get_height()
+                ax4.text(bar.get_x() + bar.get_width()/2., height, f'{height:.1f}%', ha='center', va='bottom', fontsize=9)
+            bars5 = ax5.bar(servers, disk_usage, color='lightgreen', alpha=0.7)
+            ax5.set_title('Root Disk Usage Percentage', fontweight='bold', fontsize=12)
+            ax5.set_ylabel('Usage (%)')
+            ax5.tick_params(axis='x', rotation=45)
+            for bar in bars5:
+                height = bar.get_height()
+                ax5.text(bar.get_x() + bar.get_width()/2., height, f'{height:.1f}%', ha='center', va='bottom', fontsize=9)
+            colors = ['green' if s == 1 else 'red' for s in statuses]
+            bars6 = ax6.bar(servers, statuses, color=colors, alpha=0.7)
+            ax6.set_title('Server Connection Status', fontweight='bold', fontsize=12)
+            ax6.set_ylabel('Status (1=Success, 0=Failed)')
+            ax6.set_ylim(0, 1.2)
+            ax6.tick_params(axis='x', rotation=45)
+            for bar, status in zip(bars6, statuses):
+                height = bar.get_height()
+                status_text = 'ONLINE' if status == 1 else 'OFFLINE'
+                ax6.text(bar.get_x() + bar.get_width()/2., height, status_text, ha='center', va='bottom', fontweight='bold', fontsize=10)
+            plt.tight_layout()
+            filepath = os.path.join(self.script_dir, output_file)
+            plt.savefig(filepath, dpi=dpi, bbox_inches='tight')
+            plt.close(fig)
+            elapsed = time.perf_counter() - render_start
+            self.main_logger.info(f"Visualization saved as {filepath} (rendered in {elapsed:.2f}s)")
+        except Exception as e:
+            self.main_logger.error(f"Failed to create visualization: {e}")
+    
+    def configure_report(self, mode: str = "auto", top_n: int = 10, json_path: Optional[str] = None):
+        self.report_mode = mode
+        self.report_top_n = top_n
+        self.report_json = json_path
+
+    def _detail_report_lines(self, levels: Dict[str, np.ndarray]) -> List[str]:
+        lines = ["\nDetailed Results:", "-" * 70]
+        anomalies = self.anomaly_detector.current if self.anomaly_detector is not None else {}
+        no_levels = np.zeros(len(self.collected_data), dtype=int)
+        load_levels = [levels.get(metric, no_levels) for metric in ("load_1min", "load_5min", "load_15min")]
+        for index, (server_name, hostname, status, data, detail) in enumerate(self.collected_data.report_rows()):
+            status_icon = {"success": "✅", "suppressed": "⏸️", "timed_out": "⏱️"}.get(status, "❌")
+            lines.append(f"{status_icon} {server_name} ({hostname}): {status.upper()}")
+            if detail is not None:
+                load_1min, load_5min, load_15min, mem_used, mem_total, mem_percent, disk_percent = detail
+                load_1min_status, load_5min_status, load_15min_status = (
+                    LEVEL_LABELS[level[index]] for level in load_levels
+                )
+                lines.append(f"   📊 Load: 1min={load_1min:.2f} ({load_1min_status}), 5min={load_5min:.2f} ({load_5min_status}), 15min={load_15min:.2f} ({load_15min_status})")
+                lines.append(f"   🧠 Memory: {mem_used}/{mem_total} MB ({mem_percent}%) | 💾 Root Disk: {disk_percent}% used")
+                if server_name in anomalies:
+                    lines.append("   📈 Anomaly: " + ", ".join(
+                        f"{anomaly['metric']}={anomaly['value']:g} (baseline {anomaly['baseline']:g}, z={anomaly['score']:+.1f})"
+                        for anomaly in anomalies[server_name]
+                    ))
+            elif status == "suppressed":
+                lines.append(f"   ⏸️ Suppressed after {data.get('consecutive_failures', '?')} consecutive failure(s), "
+                             f"next probe at {data.get('retry_at', 'unknown')} (last error: {data.get('error', 'Unknown error')})")
+            elif status == "timed_out":
+                lines.append(f"   ⏱️ {data.get('error', 'Pass deadline reached')}")
+            else:
+                lines.append(f"   💥 Error: {data.get('error', 'Unknown error')}")
+            lines.append("")
+        return lines
+
+    def _fleet_report_lines(self, summary: Dict[str, Any]) -> List[str]:
+        lines = [f"\nFleet Summary ({summary['hosts']} server(s), top {self.report_top_n} worst per metric):", "-" * 70]
+        lines.append("Status: " + ", ".join(f"{status} {count}" for status, count in
+                                             sorted(summary["statuses"].items(), key=lambda item: -item[1])))
+        for metric, counts in summary.get("levels", {}).items():
+            lines.append(f"{metric} levels: " + ", ".join(f"{LEVEL_LABELS[index]} {counts[level]}"
+                                                         for index, level in enumerate(ALERT_LEVELS)))
+        for metric, worst in summary["worst"].items():
+            if not worst:
+                continue
+            unit = "%" if metric.endswith("percent") else ""
+            lines.append(f"\n🔥 Worst {metric}:")
+            lines.extend(f"  {rank:>3}. {entry['server']:<32}{entry['value']:>10.2f}{unit}"
+                         for rank, entry in enumerate(worst, 1))
+        if summary.get("groups"):
+            lines.append("\n🏷️ By tag:")
+            lines.append(f"  {'tag':<24}{'servers':>8}{'online':>8}{'load1 avg':>11}{'load1 max':>11}"
+                         f"{'mem% avg':>10}{'disk% max':>11}")
+            for group, entry in summary["groups"].items():
+                load = entry.get("load_1min", {})
+                memory = entry.get("memory_usage_percent", {})
+                disk = entry.get("root_disk_percent", {})
+                lines.append(f"  {group:<24}{entry['hosts']:>8}{entry['successful']:>8}"
+                             f"{load.get('mean', float('nan')):>11.2f}{load.get('max', float('nan')):>11.2f}"
+                             f"{memory.get('mean', float('nan')):>10.1f}{disk.get('max', float('nan')):>11.1f}")
+        if summary["failure_reasons"]:
+            lines.append("\n💥 Failures by reason:")
+            for reason in summary["failure_reasons"]:
+                examples = ", ".join(reason["servers"][:3])
+                more = f" +{reason['count'] - 3} more" if reason["count"] > 3 else ""
+                lines.append(f"  {reason['count']:>6}  {reason['status']}: {reason['reason']} ({examples}{more})")
+        lines.append("")
+        return lines
+
+    def write_report_document(self, summary: Dict[str, Any]):
+        try:
+            temp_path = f"{self.report_json}.tmp"
+            with open(temp_path, 'w') as f:
+                json.dump(summary, f, indent=2)
+            os.replace(temp_path, self.report_json)
+            self.main_logger.info(f"Summary report document written to {self.report_json}")
+        except Exception as e:
+            self.main_logger.error(f"Failed to write summary report document: {e}")
+
+    def generate_summary_report(self):
+        successful = self.collected_data.count_status("success")
+        suppressed = self.collected_data.count_status("suppressed")
+        timed_out = self.collected_data.count_status("timed_out")
+        total = len(self.servers)
+        lines = ["", "="*70, "                   SERVER HEALTH CHECK SUMMARY", "="*70]
+        lines.append(f"Total servers checked: {total}")
+        lines.append(f"Successful connections: {successful}")
+        lines.append(f"Failed connections: {total - successful - suppressed - timed_out}")
+        if suppressed:
+            lines.append(f"Suppressed (circuit open): {suppressed}")
+        if timed_out:
+            lines.append(f"Timed out (pass deadline): {timed_out}")
+        lines.append(f"Success rate: {(successful/total)*100:.1f}%")
+        if self.alert_log is not None:
+            alert_counts = self.alert_rules.counts()
+            summary = ", ".join(f"{rule} {counts['critical']} critical/{counts['warning']} warning"
+                                for rule, counts in alert_counts.items())
+            lines.append(f"🚨 Active alerts: {summary if alert_counts else 'none'}")
+        if self.anomaly_detector is not None:
+            lines.append(f"📈 Anomalous servers: {len(self.anomaly_detector.current)} "
+                         f"(|z| >= {self.anomaly_detector.threshold:g} against EWMA baseline)")
+        levels = self.alert_rules.classify(self.collected_data, self.server_tags())
+        detailed = self.report_mode == "full" or (
+            self.report_mode == "auto" and len(self.collected_data) <= REPORT_DETAIL_LIMIT
+        )
+        fleet_summary = None
+        if not detailed or self.report_json:
+            fleet_summary = summarize_fleet(self.collected_data, self.report_top_n, self.server_tags(), levels)
+            if self.anomaly_detector is not None:
+                fleet_summary["anomalies"] = self.anomaly_detector.current
+        if detailed:
+            lines.extend(self._detail_report_lines(levels))
+        else:
+            lines.extend(self._fleet_report_lines(fleet_summary))
+        lines.append("="*70)
+        lines.append("LOAD INTERPRETATION GUIDE:")
+        warn = self.alert_rules.threshold("load_1min", "warn")
+        crit = self.alert_rules.threshold("load_1min", "crit")
+        if warn is not None and crit is not None:
+            lines.append(f"  ✅ Good: <{warn:.1f}   ⚠️ High: {warn:.1f}-{crit:.1f}   ❌ Critical: >{crit:.1f}")
+        lines.append("  Load >1.0 means processes were waiting for CPU time")
+        lines.append("="*70)
+        sys.stdout.write('\n'.join(lines) + '\n')
+        sys.stdout.flush()
+        if self.report_json:
+            self.write_report_document(fleet_summary)
+    
+    def enable_circuit_breakers(self, failure_threshold: int = 3, base_backoff: float = 60,
+                                max_backoff: float = 3600):
+        self.circuit_breakers = CircuitBreakerRegistry(
+            os.path.join(self.script_dir, 'server_health_breakers.json'),
+            failure_threshold=failure_threshold,
+            base_backoff=base_backoff,
+            max_backoff=max_backoff
+        )
+
+    def _suppressed_result(self, server_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.circuit_breakers is None:
+            return None
+        breaker = self.circuit_breakers.check(server_config["name"])
+        if breaker is None:
+            return None
+        retry_at = datetime.fromtimestamp(breaker["open_until"]).isoformat()
+        self.main_logger.info(f"{server_config['name']}: Skipped - circuit open until {retry_at}")
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "server_name": server_config["name"],
+            "hostname": server_config["hostname"],
+            "status": "suppressed",
+            "error": breaker.get("last_error", "Unknown error"),
+            "consecutive_failures": breaker["failures"],
+            "retry_at": retry_at
+        }
+
+    def _update_circuit_breaker(self, server_data: Dict[str, Any]):
+        if self.circuit_breakers is None:
+            return
+        server_name = server_data["server_name"]
+        if server_data["status"] == "success":
+            self.circuit_breakers.record_success(server_name)
+        elif server_data["status"] in ("failed", "timed_out"):
+            breaker = self.circuit_breakers.record_failure(server_name, server_data.get("error", "Unknown error"))
+            if breaker["state"] == "open":
+                retry_at = datetime.fromtimestamp(breaker["open_until"]).isoformat()
+                self.main_logger.warning(
+                    f"{server_name}: Circuit open after {breaker['failures']} consecutive failure(s), "
+                    f"next probe at {retry_at}"
+                )
+        elif server_data["status"] != "suppressed":
+            self.circuit_breakers.release(server_name)
+
+    def server_tags(self) -> Dict[str, List[str]]:
+        return {server["name"]: server.get("tags", []) for server in self.servers}
+
+    def load_alert_rules(self, rules_file: str):
+        self.alert_rules = AlertRuleEngine(load_alert_rules(rules_file), self.alert_rules.state_path)
+        if self.dashboard_renderer is not None:
+            self.dashboard_renderer.thresholds = self.alert_rules.thresholds("warn")
+        self.main_logger.info(f"Loaded {len(self.alert_rules.rules)} alert rule(s) from {rules_file}")
+
+    def enable_alerting(self):
+        state_path = os.path.join(self.script_dir, 'server_health_alerts_state.json')
+        self.alert_rules = AlertRuleEngine(self.alert_rules.rules, state_path)
+        self.alert_log = os.path.join(self.script_dir, 'server_health_alerts.ndjson')
+
+    def evaluate_alerts(self) -> List[Dict[str, Any]]:
+        if self.alert_log is None or not self.collected_data:
+            return []
+        try:
+            with self.timings.time("pass:alerts"):
+                transitions = self.alert_rules.evaluate(self.collected_data, self.server_tags())
+                self.alert_rules.save()
+                if transitions:
+                    with open(self.alert_log, 'a') as f:
+                        f.writelines(json.dumps(transition) + '\n' for transition in transitions)
+            for transition in transitions:
+                message = (f"Alert {transition['rule']} on {transition['server']}: {transition['from']} -> "
+                           f"{transition['to']} (value {transition['value']}")
+                message += f", threshold {transition['threshold']})" if transition["threshold"] is not None else ")"
+                if transition["to"] == "ok":
+                    self.main_logger.info(message)
+                else:
+                    self.main_logger.warning(message)
+            return transitions
+        except Exception as e:
+            self.main_logger.error(f"Failed to evaluate alert rules: {e}")
+            return []
+
+    def enable_anomaly_detection(self, alpha: float = 0.1, threshold: float = 4.0, warmup: int = 10):
+        self.anomaly_detector = AnomalyDetector(
+            os.path.join(self.script_dir, 'server_health_anomaly_state.npz'),
+            alpha=alpha,
+            threshold=threshold,
+            warmup=warmup
+        )
+
+    def update_anomalies(self) -> List[Dict[str, Any]]:
+        if self.anomaly_detector is None or not self.collected_data:
+            return []
+        try:
+            with self.timings.time("pass:anomaly"):
+                transitions = self.anomaly_detector.update(self.collected_data)
+                self.anomaly_detector.save()
+                if transitions and self.alert_log is not None:
+                    with open(self.alert_log, 'a') as f:
+                        f.writelines(json.dumps(transition) + '\n' for transition in transitions)
+            for transition in transitions:
+                message = (f"Anomaly {transition['metric']} on {transition['server']}: {transition['from']} -> "
+                           f"{transition['to']} (value {transition['value']}, baseline {transition['baseline']}, "
+                           f"z {transition['score']})")
+                if transition["to"] == "ok":
+                    self.main_logger.info(message)
+                else:
+                    self.main_logger.warning(message)
+            return transitions
+        except Exception as e:
+            self.main_logger.error(f"Failed to update anomaly baselines: {e}")
+            return []
+
+    def save_circuit_breakers(self):
+        if self.circuit_breakers is None:
+            return
+        try:
+            self.circuit_breakers.save()
+        except Exception as e:
+            self.main_logger.error(f"Failed to save circuit breaker state: {e}")
+
+    def _record_history(self, server_data: Dict[str, Any]):
+        if self.history_store is None:
+            return
+        try:
+            if not self.history_store.append(server_data):
+                self.main_logger.warning(f"{server_data['server_name']}: out-of-order sample not stored in history")
+        except Exception as e:
+            self.main_logger.error(f"Failed to append history for {server_data['server_name']}: {e}")
+
+    def flush_history(self):
+        if self.history_store is None:
+            return
+        try:
+            self.history_store.flush()
+        except Exception as e:
+            self.main_logger.error(f"Failed to flush history: {e}")
+
+    def enable_rollups(self, retention: Optional[Dict[str, Optional[float]]] = None):
+        if self.history_store is None:
+            self.main_logger.error("History rollups need a history store (--history-dir)")
+            return
+        self.history_rollup = HistoryRollup(self.history_store, retention)
+
+    def history_query(self) -> Optional[HistoryQuery]:
+        if self.history_store is None:
+            self.main_logger.error("History queries need a history store (--history-dir)")
+            return None
+        rollup = self.history_rollup
+        if rollup is None and os.path.isdir(os.path.join(self.history_store.base_dir, ROLLUP_DIR)):
+            rollup = HistoryRollup(self.history_store)
+        return HistoryQuery(self.history_store, rollup)
+
+    def run_history_query(self, kind: str, metric: Optional[str] = None, since: float = 86400,
+                          percentiles: Optional[List[float]] = None, limit: int = 20,
+                          mount: Optional[str] = "/", stat: str = "max") -> Optional[Any]:
+        query = self.history_query()
+        if query is None:
+            return None
+        start = time.time() - since
+        begin = time.perf_counter()
+        if kind == "percentiles":
+            result = query.percentiles(metric or "load_5min", percentiles or [50, 95, 99], start=start, stat=stat)
+        elif kind == "top-growth":
+            result = query.top_growth(metric or "use_percent", limit, start=start, mount=mount)
+        else:
+            groups = {server["name"]: server.get("tags") or ["untagged"] for server in self.servers}
+            result = query.group_by(metric or "memory_usage_percent", groups, percentiles or [50, 95], start=start,
+                                    stat=stat)
+        self.main_logger.info(f"History query {kind} answered in {time.perf_counter() - begin:.3f}s")
+        print(json.dumps(result, indent=2))
+        return result
+
+    def roll_up_history(self) -> Optional[Dict[str, int]]:
+        if self.history_rollup is None:
+            return None
+        try:
+            with self.timings.time("pass:rollup"):
+                written = self.history_rollup.run()
+            summary = ", ".join(f"{name}={count}" for name, count in written.items())
+            self.main_logger.info(f"History rollup: {summary}")
+            return written
+        except Exception as e:
+            self.main_logger.error(f"Failed to roll up history: {e}")
+            return None
+
+    def _publish_result(self, server_data: Dict[str, Any]):
+        self._record_history(server_data)
+        self._update_circuit_breaker(server_data)
+        if self.result_writer is not None:
+            try:
+                self.result_writer.write(server_data)
+            except Exception as e:
+                self.main_logger.error(f"Failed to stream result for {server_data['server_name']}: {e}")
+
+    def _publish_future(self, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        server_data = future.result()
+        if self._claim_result(server_data["server_name"], "result"):
+            self._publish_result(server_data)
+
+    def _claim_result(self, server_name: str, claimant: str) -> bool:
+        with self._claims_lock:
+            return self._result_claims.setdefault(server_name, claimant) == claimant
+
+    def set_pass_deadline(self, seconds: Optional[float], remaining: Optional[float] = None):
+        self._deadline_seconds = seconds
+        if seconds is None:
+            self._deadline = None
+        else:
+            self._deadline = time.monotonic() + (seconds if remaining is None else remaining)
+
+    def _deadline_remaining(self) -> Optional[float]:
+        if self._deadline is None:
+            return None
+        return max(0.0, self._deadline - time.monotonic())
+
+    def _timed_out_result(self, server: Dict[str, Any], started: bool) -> Dict[str, Any]:
+        phase = "finished" if started else "started"
+        self.main_logger.warning(f"{server['name']}: Pass deadline reached before the check {phase}")
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "server_name": server["name"],
+            "hostname": server["hostname"],
+            "status": "timed_out",
+            "error": f"Pass deadline of {self._deadline_seconds}s reached before the check {phase}"
+        }
+
+    def _abandon_active_client(self, server_name: str):
+        ssh_client = self._active_clients.pop(server_name, None)
+        if ssh_client is None:
+            return
+        try:
+            ssh_client.close()
+        except Exception as e:
+            self.main_logger.error(f"{server_name}: Failed to close abandoned connection - {e}")
+
+    def start_streaming(self, ndjson_filename: str = "server_health_data.ndjson",
+                        csv_filename: str = "server_health_data.csv"):
+        ndjson_path = os.path.join(self.script_dir, ndjson_filename)
+        csv_path = os.path.join(self.script_dir, csv_filename)
+        self.result_writer = StreamingResultWriter(ndjson_path, csv_path, self.csv_row)
+        self.main_logger.info(f"Streaming results to {ndjson_path} and {csv_path}")
+
+    def finish_streaming(self):
+        if self.result_writer is None:
+            return
+        with self._state_lock:
+            failed_detail = list(self.failed_connections)
+        self.result_writer.close({
+            "timestamp": datetime.now().isoformat(),
+            "servers_checked": len(self.servers),
+            "successful_connections": self.result_writer.successful,
+            "failed_connections": len(failed_detail),
+            "records_written": self.result_writer.records_written,
+            "failed_connections_detail": failed_detail
+        })
+        self.main_logger.info(f"Streamed {self.result_writer.records_written} record(s) with summary trailer")
+        self.result_writer = None
+
+    def collect_all(self, workers: int = 1):
+        self._result_claims = {}
+        if self.connection_pool is not None:
+            evicted = self.connection_pool.evict_idle()
+            if evicted:
+                self.main_logger.info(f"Evicted {evicted} idle pooled connection(s)")
+        if workers <= 1 and self._deadline is None:
+            for server in self.servers:
+                print(f"   📡 Connecting to {server['name']}...")
+                server_data = self.collect_server_data(server)
+                self.collected_data[server["name"]] = server_data
+                self._publish_result(server_data)
+            return self.collected_data
+        workers = max(1, workers)
+        self.main_logger.info(f"Collecting from {len(self.servers)} server(s) with {workers} workers")
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="health")
+        abandoned = False
+        try:
+            futures = []
+            for server in self.servers:
+                print(f"   📡 Connecting to {server['name']}...")
+                future = executor.submit(self.collect_server_data, server)
+                future.add_done_callback(self._publish_future)
+                futures.append((server, future))
+            done, _ = wait([future for _, future in futures], timeout=self._deadline_remaining())
+            for server, future in futures:
+                if future in done or not self._claim_result(server["name"], "deadline"):
+                    self.collected_data[server["name"]] = future.result()
+                    continue
+                abandoned = True
+                started = not future.cancel()
+                server_data = self._timed_out_result(server, started)
+                self.collected_data[server["name"]] = server_data
+                self._publish_result(server_data)
+                if started:
+                    self._abandon_active_client(server["name"])
+        finally:
+            executor.shutdown(wait=not abandoned, cancel_futures=True)
+        return self.collected_data
+
+    async def collect_all_async(self, transport: Optional[AsyncTransport] = None, concurrency: int = 500,
+                                host_timeout: float = 60) -> Dict[str, Any]:
+        if self.probe_mode == "proc":
+            raise ValueError("The asyncio engine does not support the proc probe")
+        owned_transport = transport is None
+        if owned_transport:
+            transport = ParamikoExecutorTransport(self._open_ssh_client, max_workers=min(concurrency, 256))
+        semaphore = asyncio.Semaphore(concurrency)
+        started = set()
+
+        async def check(server: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                started.add(server["name"])
+                server_data = await self.collect_server_data_async(server, transport, host_timeout)
+            self._publish_result(server_data)
+            return server_data
+
+        self.main_logger.info(
+            f"Collecting from {len(self.servers)} server(s) on asyncio with up to {concurrency} in flight"
+        )
+        tasks = [asyncio.ensure_future(check(server)) for server in self.servers]
+        try:
+            if tasks:
+                await asyncio.wait(tasks, timeout=self._deadline_remaining())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            if owned_transport:
+                transport.shutdown()
+        for server, task in zip(self.servers, tasks):
+            if task.cancelled():
+                server_data = self._timed_out_result(server, server["name"] in started)
+                self._publish_result(server_data)
+            else:
+                server_data = task.result()
+            self.collected_data[server["name"]] = server_data
+        return self.collected_data
+
+    def _collect(self, workers: int = 1, processes: int = 1, engine: str = "threads", host_timeout: float = 60,
+                 deadline: Optional[float] = None):
+        self._result_claims = {}
+        self.set_pass_deadline(deadline)
+        try:
+            if engine == "asyncio":
+                return asyncio.run(self.collect_all_async(concurrency=workers, host_timeout=host_timeout))
+            if processes > 1:
+                return self.collect_sharded(processes, workers)
+            return self.collect_all(workers)
+        finally:
+            self.set_pass_deadline(None)
+            self.save_circuit_breakers()
+            timed_out = self.collected_data.count_status("timed_out")
+            if timed_out:
+                self.main_logger.warning(f"Pass deadline of {deadline}s reached: {timed_out} server(s) timed out")
+                print(f"⏱️  Pass deadline of {deadline}s reached: {timed_out} server(s) timed out")
+
+    def collect_sharded(self, processes: int, workers: int = 1):
+        results = {}
+        pending = []
+        for server in self.servers:
+            suppressed = self._suppressed_result(server)
+            if suppressed is None:
+                pending.append(server)
+            else:
+                results[server["name"]] = suppressed
+                self._publish_result(suppressed)
+        shard_count = min(processes, len(pending))
+        shards = [pending[index::shard_count] for index in range(shard_count)]
+        self.main_logger.info(
+            f"Collecting from {len(pending)} server(s) in {shard_count} process(es) with {workers} worker(s) each"
+        )
+        context = multiprocessing.get_context("spawn")
+        executor = ProcessPoolExecutor(max_workers=max(1, shard_count), mp_context=context)
+        abandoned = False
+        try:
+            remaining = self._deadline_remaining()
+            futures = {
+                executor.submit(
+                    collect_shard, shard, workers, self.probe_mode, remaining, self._deadline_seconds,
+                    self.shard_options()
+                ): shard for shard in shards
+            }
+            pending = set(futures)
+            shard_timeout = None if remaining is None else remaining + SHARD_DEADLINE_GRACE
+            try:
+                for future in as_completed(futures, timeout=shard_timeout):
+                    pending.discard(future)
+                    self._absorb_shard(future, futures[future], results)
+            except FuturesTimeoutError:
+                for future in pending:
+                    if future.done():
+                        self._absorb_shard(future, futures[future], results)
+                        continue
+                    abandoned = True
+                    future.cancel()
+                    for server in futures[future]:
+                        server_data = self._timed_out_result(server, True)
+                        results[server["name"]] = server_data
+                        self._publish_result(server_data)
+        finally:
+            executor.shutdown(wait=not abandoned and self._deadline is None, cancel_futures=True)
+        for server in self.servers:
+            if server["name"] in results:
+                self.collected_data[server["name"]] = results[server["name"]]
+        return self.collected_data
+
+    def _absorb_shard(self, future, shard: List[Dict[str, Any]], results: Dict[str, Any]):
+        try:
+            shard_data, shard_failures, shard_timings = future.result()
+            self.timings.merge(shard_timings)
+        except Exception as e:
+            self.main_logger.error(f"Collection shard crashed: {e}")
+            shard_data = {server["name"]: self._failed_result(server, str(e)) for server in shard}
+            shard_failures = [
+                {"server": server["name"], "error": str(e), "timestamp": datetime.now().isoformat()}
+                for server in shard
+            ]
+        with self._state_lock:
+            self.failed_connections.extend(shard_failures)
+        for server_name, server_data in shard_data.items():
+            results[server_name] = server_data
+            self._publish_result(server_data)
+
+    def run_health_check(self, enable_visualization: bool = True, workers: int = 1, stream: bool = False,
+                         processes: int = 1, engine: str = "threads", host_timeout: float = 60,
+                         deadline: Optional[float] = None):
+        self.main_logger.info("Starting server health check...")
+        print("🚀 Starting Remote Server Health Dashboard...")
+        print(f"📁 Output directory: {self.script_dir}")
+        if not self.servers:
+            self.main_logger.error("No servers configured!")
+            print("❌ No servers configured. Please add servers to the configuration.")
+            return {}
+        print(f"🔍 Checking {len(self.servers)} server(s)...")
+        self.timings.reset()
+        if stream:
+            self.start_streaming()
+            try:
+                with self.timings.time("pass:collection"):
+                    self._collect(workers, processes, engine, host_timeout, deadline)
+                self.evaluate_alerts()
+                self.update_anomalies()
+            finally:
+                with self.timings.time("pass:save"):
+                    self.finish_streaming()
+        else:
+            with self.timings.time("pass:collection"):
+                self._collect(workers, processes, engine, host_timeout, deadline)
+            self.evaluate_alerts()
+            self.update_anomalies()
+            with self.timings.time("pass:save"):
+                self.save_results()
+        self.flush_history()
+        self.roll_up_history()
+        with self.timings.time("pass:publish"):
+            self.publish_snapshot()
+        with self.timings.time("pass:report"):
+            self.generate_summary_report()
+        if enable_visualization:
+            successful_servers = self.collected_data.count_status("success")
+            if successful_servers > 0:
+                print("📊 Generating visualizations...")
+                with self.timings.time("pass:visualize"):
+                    self.visualize_data()
+                print(f"   ✅ Dashboard saved as 'server_health_dashboard.png'")
+                print(f"   📊 Now tracking: 1-min, 5-min, and 15-min load averages separately")
+            else:
+                print("⚠️  No successful connections - skipping visualization")
+        self.save_timings()
+        if self.show_timings:
+            self.print_timings()
+        self.main_logger.info("Server health check completed")
+        print("✅ Health check completed!")
+        return self.collected_data
+
+    def enable_profile(self):
+        self.show_timings = True
+
+    def print_timings(self):
+        print("\n⏱️  PHASE TIMINGS")
+        print("=" * 50)
+        print(self.timings.format_table())
+
+    def stop(self):
+        self._stop_event.set()
+
+    def _failed_result(self, server: Dict[str, Any], error: str) -> Dict[str, Any]:
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "server_name": server["name"],
+            "hostname": server["hostname"],
+            "status": "failed",
+            "error": error
+        }
+
+    def _store_daemon_result(self, server: Dict[str, Any], in_flight: set, future):
+        server_name = server["name"]
+        try:
+            server_data = future.result()
+        except Exception as e:
+            self.main_logger.error(f"{server_name}: Scheduled check crashed - {e}")
+            server_data = self._failed_result(server, str(e))
+        with self._state_lock:
+            in_flight.discard(server_name)
+            if server_name in self._retired_servers:
+                return
+            self.collected_data[server_name] = server_data
+            latest_failure = [f for f in self.failed_connections if f["server"] == server_name][-1:]
+            self.failed_connections = [f for f in self.failed_connections if f["server"] != server_name]
+            if server_data["status"] != "success":
+                self.failed_connections.extend(latest_failure)
+        self._publish_result(server_data)
+
+    def _snapshot_view(self) -> "ServerHealthMonitor":
+        view = copy.copy(self)
+        view.collected_data = self.collected_data.copy()
+        view.failed_connections = list(self.failed_connections)
+        view.servers = list(self.servers)
+        view._retired_servers = set(self._retired_servers)
+        view._result_claims = dict(self._result_claims)
+        view._active_clients = {}
+        view.timings = PhaseTimings()
+        view.timings.merge(self.timings.drain())
+        return view
+
+    def _write_daemon_snapshot(self, enable_visualization: bool = False):
+        with self._state_lock:
+            if not self.collected_data:
+                return
+            view = self._snapshot_view()
+        if self.snapshot_writer is None:
+            self._write_snapshot_view((view, enable_visualization))
+        else:
+            self.snapshot_writer.submit((view, enable_visualization))
+
+    def _write_snapshot_view(self, job: tuple):
+        view, enable_visualization = job
+        with self._analysis_lock:
+            view.evaluate_alerts()
+            view.update_anomalies()
+        if view.result_writer is None:
+            view.save_results()
+        view.publish_snapshot()
+        if enable_visualization:
+            view.visualize_data()
+        view.save_circuit_breakers()
+        view.flush_history()
+        view.roll_up_history()
+        view.save_timings()
+        if view.show_timings:
+            view.main_logger.info(f"Phase timings since last snapshot:\n{view.timings.format_table()}")
+        successful = view.collected_data.count_status("success")
+        view.main_logger.info(f"Daemon snapshot: {successful}/{len(view.collected_data)} server(s) healthy")
+
+    def _reschedule(self, schedule: List[tuple], previous_servers: List[Dict[str, Any]], interval: float) -> List[tuple]:
+        due_by_name = {previous_servers[index]["name"]: due for due, index in schedule}
+        now = time.monotonic()
+        rebuilt = []
+        for index, server in enumerate(self.servers):
+            due = due_by_name.get(server["name"])
+            if due is None:
+                due = now + random.uniform(0, float(server.get("interval", interval)))
+            rebuilt.append((due, index))
+        heapq.heapify(rebuilt)
+        return rebuilt
+
+    def run_daemon(self, interval: float = 60, workers: int = 10, jitter: float = 0.1,
+                   enable_visualization: bool = False, stream: bool = False):
+        if not self.servers:
+            self.main_logger.error("No servers configured!")
+            print("❌ No servers configured. Please add servers to the configuration.")
+            return
+        if self.connection_pool is None:
+            self.connection_pool = SSHConnectionPool(idle_timeout=max(300, interval * 3))
+        self._stop_event.clear()
+        self.main_logger.info(f"Starting daemon: {len(self.servers)} server(s), interval={interval}s, workers={workers}")
+        print(f"🚀 Daemon started - checking {len(self.servers)} server(s) every {interval}s (Ctrl+C to stop)")
+        schedule = []
+        now = time.monotonic()
+        for index, server in enumerate(self.servers):
+            server_interval = float(server.get("interval", interval))
+            offset = server_interval * index / len(self.servers)
+            offset += random.uniform(0, jitter * server_interval)
+            heapq.heappush(schedule, (now + offset, index))
+        in_flight = set()
+        next_snapshot = now + interval
+        self._result_claims = {}
+        if stream:
+            self.start_streaming()
+        self.snapshot_writer = SnapshotWriter(self._write_snapshot_view, self.main_logger)
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="health")
+        try:
+            while not self._stop_event.is_set():
+                now = time.monotonic()
+                while schedule and schedule[0][0] <= now:
+                    due, index = heapq.heappop(schedule)
+                    server = self.servers[index]
+                    server_interval = float(server.get("interval", interval))
+                    next_due = due + server_interval
+                    if next_due <= now:
+                        next_due = now + random.uniform(0, jitter * server_interval)
+                    heapq.heappush(schedule, (next_due, index))
+                    with self._state_lock:
+                        if server["name"] in in_flight:
+                            self.main_logger.warning(f"{server['name']}: previous check still running, skipping")
+                            continue
+                        in_flight.add(server["name"])
+                    future = executor.submit(self.collect_server_data, server)
+                    future.add_done_callback(
+                        lambda f, server=server: self._store_daemon_result(server, in_flight, f)
+                    )
+                if now >= next_snapshot:
+                    previous_servers = self.servers
+                    if self.reload_inventory():
+                        schedule = self._reschedule(schedule, previous_servers, interval)
+                    self._write_daemon_snapshot(enable_visualization)
+                    evicted = self.connection_pool.evict_idle()
+                    if evicted:
+                        self.main_logger.info(f"Evicted {evicted} idle pooled connection(s)")
+                    next_snapshot += interval
+                wait = min(schedule[0][0] if schedule else next_snapshot, next_snapshot) - time.monotonic()
+                self._stop_event.wait(max(0, wait))
+        except KeyboardInterrupt:
+            print("\n🛑 Stopping daemon...")
+        finally:
+            self._stop_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+            self.finish_streaming()
+            self._write_daemon_snapshot(enable_visualization)
+            self.snapshot_writer.close()
+            self.snapshot_writer = None
+            self.close()
+        self.main_logger.info("Daemon stopped")
+        print("✅ Daemon stopped")
+
+
+def collect_shard(servers: List[Dict[str, Any]], workers: int, probe_mode: str,
+                  deadline_remaining: Optional[float] = None, deadline: Optional[float] = None,
+                  options: Optional[Dict[str, Any]] = None) -> tuple:
+    options = options or {}
+    monitor = ServerHealthMonitor(probe_mode=probe_mode, output_dir=options.get("output_dir"))
+    if options.get("async_logging"):
+        monitor.enable_async_logging(**options["async_logging"])
+    monitor.servers = servers
+    monitor.set_pass_deadline(deadline, deadline_remaining)
+    try:
+        monitor.collect_all(workers)
+    finally:
+        monitor.close()
+    return monitor.collected_data.to_dict(), monitor.failed_connections, monitor.timings.samples()
@@ -0,0 +1,98 @@
+import paramiko
+from typing import Dict, Any
+import threading
+import time
+
+
+class SSHConnectionPool:
+    def __init__(self, idle_timeout: float = 300, keepalive_interval: int = 15):
+        self.idle_timeout = idle_timeout
+        self.keepalive_interval = keepalive_interval
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.stats = {"created": 0, "reused": 0, "evicted": 0}
+
+    @staticmethod
+    def pool_key(server_config: Dict[str, Any]) -> tuple:
+        return (server_config["hostname"], server_config.get("port", 22), server_config["username"])
+
+    def _is_alive(self, ssh_client: paramiko.SSHClient) -> bool:
+        transport = ssh_client.get_transport()
+        if transport is None or not transport.is_active():
+            return False
+        try:
+            transport.send_ignore()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, ssh_client: paramiko.SSHClient):
+        try:
+            ssh_client.close()
+        except Exception:
+            pass
+        with self._lock:
+            self.stats["evicted"] += 1
+
+    def acquire(self, server_config: Dict[str, Any], connect) -> tuple:
+        key = self.pool_key(server_config)
+        while True:
+            with self._lock:
+                entries = self._idle.get(key)
+                entry = entries.pop() if entries else None
+            if entry is None:
+                break
+            ssh_client, last_used = entry
+            if time.monotonic() - last_used <= self.idle_timeout and self._is_alive(ssh_client):
+                with self._lock:
+                    self.stats["reused"] += 1
+                return ssh_client, True
+            self._discard(ssh_client)
+        ssh_client = connect(server_config)
+        transport = ssh_client.get_transport()
+        if transport is not None and self.keepalive_interval:
+            transport.set_keepalive(self.keepalive_interval)
+        with self._lock:
+            self.stats["created"] += 1
+        return ssh_client, False
+
+    def release(self, server_config: Dict[str, Any], ssh_client: paramiko.SSHClient):
+        transport = ssh_client.get_transport()
+        if transport is None or not transport.is_active():
+            self._discard(ssh_client)
+            return
+        with self._lock:
+            self._idle.setdefault(self.pool_key(server_config), []).append((ssh_client, time.monotonic()))
+
+    def discard(self, ssh_client: paramiko.SSHClient):
+        self._discard(ssh_client)
+
+    def evict_idle(self) -> int:
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for key in list(self._idle):
+                keep = []
+                for ssh_client, last_used in self._idle[key]:
+                    if now - last_used > self.idle_timeout:
+                        expired.append(ssh_client)
+                    else:
+                        keep.append((ssh_client, last_used))
+                if keep:
+                    self._idle[key] = keep
+                else:
+                    del self._idle[key]
+        for ssh_client in expired:
+            self._discard(ssh_client)
+        return len(expired)
+
+    def idle_count(self) -> int:
+        with self._lock:
+            return sum(len(entries) for entries in self._idle.values())
+
+    def close_all(self):
+        with self._lock:
+            entries = [entry for key_entries in self._idle.values() for entry in key_entries]
+            self._idle.clear()
+        for ssh_client, _ in entries:
+            self._discard(ssh_client)
@@ -0,0 +1,167 @@
+from array import array
+import numpy as np
+from typing import Dict, List, Any, Optional
+import os
+import sys
+import threading
+import time
+import cProfile
+from contextlib import contextmanager
+
+
+PHASE_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 60]
+SLOWEST_HOSTS = 5
+
+
+class PhaseTimings:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._hosts = {}
+
+    @contextmanager
+    def time(self, phase: str, host: Optional[str] = None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - start, host)
+
+    def record(self, phase: str, seconds: float, host: Optional[str] = None):
+        with self._lock:
+            samples = self._samples.get(phase)
+            if samples is None:
+                samples = self._samples[phase] = array('d')
+                self._hosts[phase] = []
+            samples.append(seconds)
+            self._hosts[phase].append(host)
+
+    def reset(self):
+        with self._lock:
+            self._samples = {}
+            self._hosts = {}
+
+    def samples(self) -> Dict[str, tuple]:
+        with self._lock:
+            return {phase: (array('d', values), list(self._hosts[phase])) for phase, values in self._samples.items()}
+
+    def drain(self) -> Dict[str, tuple]:
+        with self._lock:
+            samples = {phase: (values, self._hosts[phase]) for phase, values in self._samples.items()}
+            self._samples = {}
+            self._hosts = {}
+        return samples
+
+    def merge(self, samples: Dict[str, tuple]):
+        with self._lock:
+            for phase, (values, hosts) in samples.items():
+                self._samples.setdefault(phase, array('d')).extend(values)
+                self._hosts.setdefault(phase, []).extend(hosts)
+
+    def _slowest(self, values: np.ndarray, hosts: List[Optional[str]]) -> List[Dict[str, Any]]:
+        slowest = []
+        for index in np.argsort(-values, kind='stable').tolist():
+            if hosts[index] is None:
+                continue
+            slowest.append({"server": hosts[index], "seconds": round(float(values[index]), 6)})
+            if len(slowest) == SLOWEST_HOSTS:
+                break
+        return slowest
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            phases = {phase: (np.array(samples), list(self._hosts[phase])) for phase, samples in self._samples.items()}
+        summary = {}
+        for phase, (values, hosts) in phases.items():
+            counts = np.searchsorted(np.sort(values), PHASE_BUCKETS, side='right')
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            summary[phase] = {
+                "count": int(len(values)),
+                "total_seconds": round(float(values.sum()), 6),
+                "mean_seconds": round(float(values.mean()), 6),
+                "p50_seconds": round(float(p50), 6),
+                "p95_seconds": round(float(p95), 6),
+                "p99_seconds": round(float(p99), 6),
+                "max_seconds": round(float(values.max()), 6),
+                "buckets": {**{str(bound): int(count) for bound, count in zip(PHASE_BUCKETS, counts)},
+                            "+Inf": int(len(values))}
+            }
+            slowest = self._slowest(values, hosts)
+            if slowest:
+                summary[phase]["slowest"] = slowest
+        return summary
+
+    def format_table(self) -> str:
+        summary = self.summary()
+        lines = [f"{'phase':<24}{'count':>8}{'total s':>11}{'mean ms':>11}{'p50 ms':>10}{'p95 ms':>10}"
+                 f"{'p99 ms':>10}{'max ms':>10}  slowest host"]
+        for phase in sorted(summary, key=lambda name: (not name.startswith("pass:"), name)):
+            stats = summary[phase]
+            lines.append(
+                f"{phase:<24}{stats['count']:>8}{stats['total_seconds']:>11.3f}{stats['mean_seconds'] * 1000:>11.1f}"
+                f"{stats['p50_seconds'] * 1000:>10.1f}{stats['p95_seconds'] * 1000:>10.1f}"
+                f"{stats['p99_seconds'] * 1000:>10.1f}{stats['max_seconds'] * 1000:>10.1f}"
+                f"  {stats['slowest'][0]['server'] if 'slowest' in stats else '-'}"
+            )
+        return '\n'.join(lines)
+
+
+class StackSampler:
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.stacks = {}
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self.interval):
+            for thread in threading.enumerate():
+                names[thread.ident] = thread.name
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                thread_name = names.get(thread_id, str(thread_id)).split('_')[0]
+                key = ';'.join([thread_name] + stack[::-1])
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path: str):
+        with open(path, 'w') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def start_profiler(path: str):
+    if path.endswith(('.prof', '.pstats')):
+        profiler = cProfile.Profile()
+        profiler.enable()
+    else:
+        profiler = StackSampler()
+        profiler.start()
+    return profiler
+
+
+def stop_profiler(profiler, path: str):
+    if isinstance(profiler, cProfile.Profile):
+        profiler.disable()
+        profiler.dump_stats(path)
+        print(f"⏱️  cProfile stats written to {path}")
+    else:
+        profiler.stop()
+        profiler.write_collapsed(path)
+        print(f"⏱️  {profiler.samples} stack sample(s) written to {path} (collapsed format for flamegraph.pl/speedscope)")
@@ -0,0 +1,142 @@
+import numpy as np
+from typing import Dict, List, Any, Optional
+import time
+
+from .units import to_epoch
+from .history import HealthHistoryStore
+from .rollup import HistoryRollup
+
+
+def group_percentiles(groups: np.ndarray, values: np.ndarray, group_count: int, percentiles: List[float]) -> np.ndarray:
+    order = np.argsort(values)
+    group_keys = groups[order].astype(np.uint16 if group_count <= 65536 else np.int64)
+    ordered = values[order[np.argsort(group_keys, kind='stable')]]
+    counts = np.bincount(groups, minlength=group_count)
+    offsets = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    result = np.full((group_count, len(percentiles)), np.nan)
+    present = counts > 0
+    for column, percentile in enumerate(percentiles):
+        position = (counts[present] - 1) * (percentile / 100.0)
+        lower = np.floor(position).astype(np.int64)
+        upper = np.ceil(position).astype(np.int64)
+        fraction = position - lower
+        base = offsets[present]
+        result[present, column] = ordered[base + lower] * (1 - fraction) + ordered[base + upper] * fraction
+    return result
+
+
+class HistoryQuery:
+    def __init__(self, store: HealthHistoryStore, rollup: Optional[HistoryRollup] = None):
+        self.store = store
+        self.rollup = rollup
+
+    def load(self, metric: str, start: Any = None, end: Any = None, servers: Optional[List[str]] = None,
+             mount: Optional[str] = None, stat: str = "max", max_points: int = 100) -> Dict[str, Any]:
+        now = time.time()
+        start = to_epoch(start) if start is not None else float('-inf')
+        end = to_epoch(end) if end is not None else now
+        tier = self.rollup.select_tier(start, end, max_points, now) if self.rollup is not None else "raw"
+        if tier != "raw":
+            kind = "disk" if mount is not None else "host"
+            series = self.rollup.fleet_series(kind)
+            if servers is None:
+                servers = sorted({server_name for server_name, series_mount in series if series_mount == mount})
+            position = {server_name: index for index, server_name in enumerate(servers)}
+            lookup = np.array([position.get(server_name, -1) if series_mount == mount else -1
+                               for server_name, series_mount in series] + [-1], dtype=np.int64)
+            data = self.rollup.read_fleet(tier, kind, [f"{metric}_{stat}"], start, end, include_open=True)
+            host = lookup[np.minimum(data["series"].astype(np.int64), len(series))]
+            timestamp, value = data["timestamp"], data[f"{metric}_{stat}"]
+        else:
+            servers = list(servers) if servers is not None else self.store.list_servers()
+            hosts, timestamps, values = [], [], []
+            for index, server_name in enumerate(servers):
+                data = self.store._read_range(self.store._series_dir(server_name, mount), [metric], start, end)
+                if len(data["timestamp"]):
+                    hosts.append(np.full(len(data["timestamp"]), index, dtype=np.int64))
+                    timestamps.append(data["timestamp"])
+                    values.append(data[metric])
+            host = np.concatenate(hosts) if hosts else np.empty(0, dtype=np.int64)
+            timestamp = np.concatenate(timestamps) if timestamps else np.empty(0)
+            value = np.concatenate(values) if values else np.empty(0)
+        valid = (host >= 0) & ~np.isnan(value)
+        return {"servers": servers, "tier": tier, "host": host[valid], "timestamp": timestamp[valid],
+                "value": value[valid]}
+
+    def percentiles(self, metric: str, percentiles: List[float] = (50, 95, 99), start: Any = None, end: Any = None,
+                    servers: Optional[List[str]] = None, mount: Optional[str] = None,
+                    stat: str = "max") -> Dict[str, Dict[str, float]]:
+        samples = self.load(metric, start, end, servers, mount, stat)
+        names = samples["servers"]
+        result = group_percentiles(samples["host"], samples["value"], len(names), list(percentiles))
+        counts = np.bincount(samples["host"], minlength=len(names))
+        suffix = "" if samples["tier"] == "raw" else f"_{stat}"
+        return {
+            names[index]: {f"p{percentile:g}{suffix}": round(float(result[index, column]), 4)
+                           for column, percentile in enumerate(percentiles)}
+            for index in np.flatnonzero(counts)
+        }
+
+    def top_growth(self, metric: str = "use_percent", n: int = 20, start: Any = None, end: Any = None,
+                   servers: Optional[List[str]] = None, mount: Optional[str] = "/",
+                   stat: str = "last") -> List[Dict[str, Any]]:
+        samples = self.load(metric, start, end, servers, mount, stat)
+        names, host = samples["servers"], samples["host"]
+        days = samples["timestamp"] / 86400.0
+        values = samples["value"]
+        counts = np.bincount(host, minlength=len(names)).astype(float)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean_days = np.bincount(host, days, len(names)) / counts
+            mean_values = np.bincount(host, values, len(names)) / counts
+            offsets = days - mean_days[host]
+            covariance = np.bincount(host, offsets * (values - mean_values[host]), len(names))
+            variance = np.bincount(host, offsets * offsets, len(names))
+            slopes = covariance / variance
+        last = np.full(len(names), np.nan)
+        order = np.lexsort((samples["timestamp"], host))
+        present = counts > 0
+        last[present] = values[order][np.cumsum(counts).astype(np.int64)[present] - 1]
+        candidates = np.flatnonzero((counts >= 2) & (variance > 0))
+        if len(candidates) > n:
+            candidates = candidates[np.argpartition(-slopes[candidates], n - 1)[:n]]
+        candidates = candidates[np.argsort(-slopes[candidates], kind='stable')]
+        return [
+            {"server": names[index], "growth_per_day": round(float(slopes[index]), 4),
+             "latest": round(float(last[index]), 2), "samples": int(counts[index])}
+            for index in candidates
+        ]
+
+    def group_by(self, metric: str, groups: Dict[str, List[str]], percentiles: List[float] = (50, 95),
+                 start: Any = None, end: Any = None, mount: Optional[str] = None,
+                 stat: str = "max") -> Dict[str, Dict[str, Any]]:
+        servers = sorted(groups)
+        samples = self.load(metric, start, end, servers, mount, stat)
+        group_names = sorted({group for members in groups.values() for group in members})
+        group_index = {group: index for index, group in enumerate(group_names)}
+        pair_counts = np.array([len(groups[server]) for server in servers], dtype=np.int64)
+        pair_groups = np.array([group_index[group] for server in servers for group in groups[server]], dtype=np.int64)
+        pair_offsets = np.concatenate([[0], np.cumsum(pair_counts)[:-1]])
+        repeats = pair_counts[samples["host"]]
+        sample_index = np.repeat(np.arange(len(samples["host"])), repeats)
+        within = np.arange(len(sample_index)) - np.repeat(np.cumsum(repeats) - repeats, repeats)
+        sample_groups = pair_groups[pair_offsets[samples["host"][sample_index]] + within]
+        values = samples["value"][sample_index]
+        count = np.bincount(sample_groups, minlength=len(group_names))
+        total = np.bincount(sample_groups, values, len(group_names))
+        maximum = np.full(len(group_names), -np.inf)
+        np.maximum.at(maximum, sample_groups, values)
+        has_data = np.bincount(samples["host"], minlength=len(servers)) > 0
+        hosts = np.bincount(pair_groups, has_data[np.repeat(np.arange(len(servers)), pair_counts)], len(group_names))
+        result = group_percentiles(sample_groups, values, len(group_names), list(percentiles))
+        suffix = "" if samples["tier"] == "raw" else f"_{stat}"
+        summary = {}
+        for index in np.flatnonzero(count):
+            summary[group_names[index]] = {
+                "hosts": int(hosts[index]),
+                "samples": int(count[index]),
+                f"mean{suffix}": round(float(total[index] / count[index]), 4),
+                "max": round(float(maximum[index]), 4),
+                **{f"p{percentile:g}{suffix}": round(float(result[index, column]), 4)
+                   for column, percentile in enumerate(percentiles)}
+            }
+        return summary
@@ -0,0 +1,83 @@
+from datetime import datetime
+import numpy as np
+from typing import Dict, List, Any, Optional
+import re
+
+from .host_table import HostTable
+from .alerts import ALERT_LEVELS
+
+
+REPORT_METRICS = ["load_1min", "load_5min", "load_15min", "memory_usage_percent", "root_disk_percent"]
+REPORT_DETAIL_LIMIT = 200
+FAILURE_REASON_NOISE = re.compile(r'\d+(?:\.\d+)*')
+
+
+def failure_reason(error: Any) -> str:
+    if not error:
+        return "Unknown error"
+    return FAILURE_REASON_NOISE.sub("N", str(error).split('\n', 1)[0])[:120]
+
+
+def summarize_fleet(table: HostTable, top_n: int = 10, groups: Optional[Dict[str, List[str]]] = None,
+                    levels: Optional[Dict[str, np.ndarray]] = None) -> Dict[str, Any]:
+    names = list(table)
+    success = table.success_mask()
+    online = np.flatnonzero(success)
+    summary = {"timestamp": datetime.now().isoformat(), "hosts": len(names), "statuses": table.status_counts()}
+    worst = {}
+    columns = {}
+    for metric in REPORT_METRICS:
+        values = table.column(metric)
+        columns[metric] = values
+        candidates = online[~np.isnan(values[online])]
+        count = min(top_n, len(candidates))
+        if count == 0:
+            worst[metric] = []
+            continue
+        picked = candidates[np.argpartition(-values[candidates], count - 1)[:count]]
+        picked = picked[np.argsort(-values[picked], kind='stable')]
+        worst[metric] = [{"server": names[index], "value": round(float(values[index]), 4)} for index in picked]
+    summary["worst"] = worst
+    if levels:
+        summary["levels"] = {
+            metric: dict(zip(ALERT_LEVELS, np.bincount(level[success], minlength=len(ALERT_LEVELS)).tolist()))
+            for metric, level in levels.items()
+        }
+    reasons = {}
+    for name, status, error in table.failures():
+        reason = reasons.setdefault((status, failure_reason(error)), {"count": 0, "servers": []})
+        reason["count"] += 1
+        if len(reason["servers"]) < top_n:
+            reason["servers"].append(name)
+    summary["failure_reasons"] = [
+        {"status": status, "reason": reason, **details}
+        for (status, reason), details in sorted(reasons.items(), key=lambda item: -item[1]["count"])
+    ]
+    if groups:
+        membership = [groups.get(name) or ["untagged"] for name in names]
+        group_names = sorted({group for members in membership for group in members})
+        group_index = {group: index for index, group in enumerate(group_names)}
+        pair_hosts = np.fromiter((row for row, members in enumerate(membership) for _ in members), dtype=np.int64)
+        pair_groups = np.fromiter((group_index[group] for members in membership for group in members), dtype=np.int64)
+        size = len(group_names)
+        hosts = np.bincount(pair_groups, minlength=size)
+        pair_online = success[pair_hosts]
+        online_count = np.bincount(pair_groups, pair_online, size)
+        stats = {}
+        for metric in REPORT_METRICS:
+            values = columns[metric][pair_hosts]
+            usable = pair_online & ~np.isnan(values)
+            used = np.bincount(pair_groups[usable], minlength=size)
+            total = np.bincount(pair_groups[usable], values[usable], size)
+            maximum = np.full(size, -np.inf)
+            np.maximum.at(maximum, pair_groups[usable], values[usable])
+            stats[metric] = (used, total, maximum)
+        summary["groups"] = {}
+        for index, group in enumerate(group_names):
+            entry = {"hosts": int(hosts[index]), "successful": int(online_count[index])}
+            for metric, (used, total, maximum) in stats.items():
+                if used[index]:
+                    entry[metric] = {"mean": round(float(total[index] / used[index]), 4),
+                                     "max": round(float(maximum[index]), 4)}
+            summary["groups"][group] = entry
+    return summary
@@ -0,0 +1,357 @@
+import json
+import numpy as np
+from typing import Dict, List, Any, Optional
+import os
+import threading
+import time
+
+from .units import to_epoch
+from .history import ROLLUP_DIR, FLEET_DIR, HealthHistoryStore
+
+
+FLEET_FLUSH_ROWS = 65536
+ROLLUP_TIERS = [("1m", 60, 86400), ("1h", 3600, 30 * 86400), ("1d", 86400, 365 * 86400)]
+ROLLUP_METRICS = ["load_1min", "load_5min", "load_15min", "memory_usage_percent"]
+DISK_ROLLUP_METRICS = ["use_percent"]
+ROLLUP_STATS = ["min", "max", "mean", "last", "count"]
+ROLLUP_RETENTION = {"raw": 7 * 86400, "1m": 30 * 86400, "1h": 400 * 86400, "1d": None}
+RETENTION_CHECK_INTERVAL = 3600
+
+
+def rollup_columns(metrics: List[str]) -> List[str]:
+    return [f"{metric}_{stat}" for metric in metrics for stat in ROLLUP_STATS]
+
+
+class HistoryRollup:
+    def __init__(self, store: HealthHistoryStore, retention: Optional[Dict[str, Optional[float]]] = None,
+                 grace: float = 60):
+        self.store = store
+        self.retention = dict(ROLLUP_RETENTION)
+        self.retention.update(retention or {})
+        self.grace = grace
+        self.tiers = [
+            (name, width, HealthHistoryStore(os.path.join(store.base_dir, ROLLUP_DIR, name), segment_seconds))
+            for name, width, segment_seconds in ROLLUP_TIERS
+        ]
+        self._marks = {}
+        self._lock = threading.Lock()
+        self._next_retention = self._load_next_retention()
+        self._fleet_series = {kind: self._load_fleet_series(kind) for kind in ("host", "disk")}
+        self._fleet_index = {
+            kind: {(server_name, mount): index for index, (server_name, mount) in enumerate(series)}
+            for kind, series in self._fleet_series.items()
+        }
+        self._fleet_dirty = False
+        self._partials = None
+
+    def _retention_state_path(self) -> str:
+        return os.path.join(self.store.base_dir, ROLLUP_DIR, "retention.json")
+
+    def _load_next_retention(self) -> float:
+        path = self._retention_state_path()
+        if not os.path.exists(path):
+            return 0.0
+        with open(path) as f:
+            return float(json.load(f)["next_retention"])
+
+    def _save_next_retention(self):
+        path = self._retention_state_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path + '.tmp', 'w') as f:
+            json.dump({"next_retention": self._next_retention}, f)
+        os.replace(path + '.tmp', path)
+
+    def _fleet_series_path(self, kind: str) -> str:
+        return os.path.join(self.store.base_dir, ROLLUP_DIR, f"{kind}_series.json")
+
+    def _load_fleet_series(self, kind: str) -> List[tuple]:
+        path = self._fleet_series_path(kind)
+        if not os.path.exists(path):
+            return []
+        with open(path) as f:
+            return [tuple(entry) for entry in json.load(f)]
+
+    def _save_fleet_series(self):
+        for kind, series in self._fleet_series.items():
+            path = self._fleet_series_path(kind)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path + '.tmp', 'w') as f:
+                json.dump(series, f)
+            os.replace(path + '.tmp', path)
+        self._fleet_dirty = False
+
+    def _fleet_id(self, kind: str, server_name: str, mount: Optional[str]) -> int:
+        key = (server_name, mount)
+        if key not in self._fleet_index[kind]:
+            self._fleet_index[kind][key] = len(self._fleet_series[kind])
+            self._fleet_series[kind].append(key)
+            self._fleet_dirty = True
+        return self._fleet_index[kind][key]
+
+    def fleet_series(self, kind: str = "host") -> List[tuple]:
+        return list(self._fleet_series[kind])
+
+    def _append_fleet(self, index: int, kind: str, batch: List[tuple]):
+        tier_store = self.tiers[index][2]
+        fleet_dir = os.path.join(tier_store.base_dir, FLEET_DIR, kind)
+        os.makedirs(fleet_dir, exist_ok=True)
+        timestamps = np.concatenate([timestamps for _, timestamps, _ in batch])
+        columns = {"series": np.concatenate([np.full(len(timestamps), series_id, dtype=float)
+                                             for series_id, timestamps, _ in batch])}
+        for column in batch[0][2]:
+            columns[column] = np.concatenate([values[column] for _, _, values in batch])
+        columns["timestamp"] = timestamps
+        segments = timestamps // tier_store.segment_seconds * tier_store.segment_seconds
+        for segment in np.unique(segments).tolist():
+            mask = segments == segment
+            for column, values in columns.items():
+                with open(tier_store._column_path(fleet_dir, int(segment), column), 'ab') as f:
+                    values[mask].astype('<f8').tofile(f)
+
+    def _flush_fleet(self, index: int, kind: str, batches: Dict[tuple, List[tuple]], pending: Dict[tuple, int]):
+        batch = batches.pop((index, kind), None)
+        pending.pop((index, kind), None)
+        if not batch:
+            return
+        if self._fleet_dirty:
+            self._save_fleet_series()
+        self._append_fleet(index, kind, batch)
+
+    def _open_path(self, index: int, kind: str) -> str:
+        return os.path.join(self.tiers[index][2].base_dir, FLEET_DIR, kind, "open.npz")
+
+    def _save_open(self, index: int, kind: str, rows: Dict[str, np.ndarray]):
+        path = self._open_path(index, kind)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp.npz"
+        np.savez(temp_path, **rows)
+        os.replace(temp_path, path)
+
+    def read_fleet(self, tier: str, kind: str, columns: List[str], start: float, end: float,
+                   include_open: bool = False) -> Dict[str, np.ndarray]:
+        index = [name for name, _, _ in self.tiers].index(tier)
+        tier_store = self.tiers[index][2]
+        fleet_dir = os.path.join(tier_store.base_dir, FLEET_DIR, kind)
+        parts = {column: [] for column in ["timestamp", "series"] + columns}
+        for segment in tier_store._segments(fleet_dir, start, end):
+            paths = {column: tier_store._column_path(fleet_dir, segment, column) for column in parts}
+            rows = min(os.path.getsize(path) for path in paths.values()) // 8
+            timestamps = np.fromfile(paths["timestamp"], dtype='<f8', count=rows)
+            mask = (timestamps >= start) & (timestamps <= end)
+            for column, path in paths.items():
+                parts[column].append(np.fromfile(path, dtype='<f8', count=rows)[mask])
+        open_path = self._open_path(index, kind)
+        if include_open and os.path.exists(open_path):
+            with np.load(open_path) as saved:
+                timestamps = saved["timestamp"]
+                mask = (timestamps >= start) & (timestamps <= end)
+                for column in parts:
+                    parts[column].append(saved[column][mask])
+        return {column: np.concatenate(chunks) if chunks else np.empty(0) for column, chunks in parts.items()}
+
+    def _series(self):
+        for server_name in self.store.list_servers():
+            yield server_name, None
+            for mount in self.store.list_mounts(server_name):
+                yield server_name, mount
+
+    def _source(self, index: int, server_name: str, mount: Optional[str], metrics: List[str],
+                start: float, end: float) -> Dict[str, np.ndarray]:
+        if index > 0:
+            lower = self.tiers[index - 1][2]
+            return lower._read_range(lower._series_dir(server_name, mount), rollup_columns(metrics), start, end)
+        data = self.store._read_range(self.store._series_dir(server_name, mount), metrics, start, end)
+        rows = {"timestamp": data["timestamp"]}
+        for metric in metrics:
+            values = data[metric]
+            rows.update({f"{metric}_{stat}": values for stat in ROLLUP_STATS[:4]})
+            rows[f"{metric}_count"] = (~np.isnan(values)).astype(float)
+        return rows
+
+    def _aggregate(self, rows: Dict[str, np.ndarray], metrics: List[str], width: int) -> tuple:
+        buckets = rows["timestamp"] // width * width
+        boundaries = buckets[1:] != buckets[:-1]
+        if "series" in rows:
+            boundaries |= rows["series"][1:] != rows["series"][:-1]
+        starts = np.flatnonzero(np.r_[True, boundaries])
+        positions = np.arange(len(buckets))
+        values = {}
+        for metric in metrics:
+            count = rows[f"{metric}_count"]
+            mean = rows[f"{metric}_mean"]
+            last = rows[f"{metric}_last"]
+            counts = np.add.reduceat(count, starts)
+            totals = np.add.reduceat(np.where(count > 0, mean * count, 0.0), starts)
+            last_index = np.maximum.reduceat(np.where(~np.isnan(last), positions, -1), starts)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                values[f"{metric}_mean"] = totals / counts
+            values[f"{metric}_min"] = np.fmin.reduceat(rows[f"{metric}_min"], starts)
+            values[f"{metric}_max"] = np.fmax.reduceat(rows[f"{metric}_max"], starts)
+            values[f"{metric}_last"] = np.where(last_index >= 0, last[last_index], np.nan)
+            values[f"{metric}_count"] = counts
+        if "series" in rows:
+            values["series"] = rows["series"][starts]
+        return buckets[starts], values
+
+    def _merge(self, parts: List[Optional[Dict[str, np.ndarray]]], metrics: List[str],
+               width: int) -> Dict[str, np.ndarray]:
+        parts = [part for part in parts if part is not None]
+        rows = {
+            column: np.concatenate([part[column] for part in parts] + [np.empty(0)])
+            for column in ["series", "timestamp"] + rollup_columns(metrics)
+        }
+        if not len(rows["timestamp"]):
+            return rows
+        order = np.lexsort((rows["timestamp"], rows["series"]))
+        timestamps, values = self._aggregate({column: data[order] for column, data in rows.items()}, metrics, width)
+        return {"timestamp": timestamps, **values}
+
+    def _complete(self, width: int, now: float) -> float:
+        return (now - self.grace) // width * width
+
+    def _load_partials(self, now: float) -> Dict[tuple, Dict[str, np.ndarray]]:
+        partials = {}
+        for kind, metrics in (("host", ROLLUP_METRICS), ("disk", DISK_ROLLUP_METRICS)):
+            for index in range(1, len(self.tiers)):
+                width = self.tiers[index][1]
+                lower = self.read_fleet(self.tiers[index - 1][0], kind, rollup_columns(metrics),
+                                        self._complete(width, now), float('inf'))
+                partials[(index, kind)] = self._merge([lower], metrics, width)
+        return partials
+
+    def _update_open(self, fresh: Dict[tuple, List[Dict[str, np.ndarray]]], now: float):
+        for kind, metrics in (("host", ROLLUP_METRICS), ("disk", DISK_ROLLUP_METRICS)):
+            lower_open = None
+            for index, (_, width, _) in enumerate(self.tiers):
+                parts = fresh.get((index, kind), [])
+                if index == 0:
+                    rows = self._merge(parts, metrics, width)
+                else:
+                    partial = self._merge([self._partials.get((index, kind))] + parts, metrics, width)
+                    keep = partial["timestamp"] >= self._complete(width, now)
+                    self._partials[(index, kind)] = {column: data[keep] for column, data in partial.items()}
+                    rows = self._merge([self._partials[(index, kind)], lower_open], metrics, width)
+                self._save_open(index, kind, rows)
+                lower_open = rows
+
+    def _rollup_series(self, index: int, server_name: str, mount: Optional[str], metrics: List[str],
+                       now: float) -> tuple:
+        name, width, tier_store = self.tiers[index]
+        series_dir = tier_store._series_dir(server_name, mount)
+        columns = rollup_columns(metrics)
+        mark = self._marks.get(series_dir)
+        if mark is None:
+            mark = self._marks[series_dir] = tier_store.last_timestamp(series_dir, columns)
+        complete = self._complete(width, now)
+        end = complete if index else now
+        if mark + width >= end:
+            return None, None
+        rows = self._source(index, server_name, mount, metrics, mark + width, end)
+        keep = rows["timestamp"] < complete
+        tail = None if index else {column: data[~keep] for column, data in rows.items()}
+        if not keep.any():
+            return None, tail
+        timestamps, values = self._aggregate({column: data[keep] for column, data in rows.items()}, metrics, width)
+        tier_store.append_rows(series_dir, timestamps, columns, values)
+        self._marks[series_dir] = float(timestamps[-1])
+        return (timestamps, values), tail
+
+    def run(self, now: Optional[float] = None) -> Dict[str, int]:
+        now = time.time() if now is None else now
+        written = {name: 0 for name, _, _ in self.tiers}
+        self.store.flush()
+        with self._lock:
+            if self._partials is None:
+                self._partials = self._load_partials(now)
+            batches, pending, fresh = {}, {}, {}
+            for server_name, mount in self._series():
+                kind = "disk" if mount is not None else "host"
+                metrics = DISK_ROLLUP_METRICS if mount is not None else ROLLUP_METRICS
+                series_id = self._fleet_id(kind, server_name, mount)
+                for index, (name, _, _) in enumerate(self.tiers):
+                    rolled, tail = self._rollup_series(index, server_name, mount, metrics, now)
+                    if tail is not None and len(tail["timestamp"]):
+                        tail["series"] = np.full(len(tail["timestamp"]), series_id, dtype=float)
+                        fresh.setdefault((0, kind), []).append(tail)
+                    if rolled is None:
+                        continue
+                    written[name] += len(rolled[0])
+                    batch = batches.setdefault((index, kind), [])
+                    batch.append((series_id,) + rolled)
+                    pending[(index, kind)] = pending.get((index, kind), 0) + len(rolled[0])
+                    if pending[(index, kind)] >= FLEET_FLUSH_ROWS:
+                        self._flush_fleet(index, kind, batches, pending)
+                    if index + 1 < len(self.tiers):
+                        timestamps, values = rolled
+                        keep = timestamps >= self._complete(self.tiers[index + 1][1], now)
+                        if keep.any():
+                            fresh.setdefault((index + 1, kind), []).append({
+                                "series": np.full(int(keep.sum()), series_id, dtype=float),
+                                "timestamp": timestamps[keep],
+                                **{column: data[keep] for column, data in values.items()}
+                            })
+            for index, kind in list(batches):
+                self._flush_fleet(index, kind, batches, pending)
+            if self._fleet_dirty:
+                self._save_fleet_series()
+            self._update_open(fresh, now)
+            if now >= self._next_retention:
+                written["segments_expired"] = self.enforce_retention(now)
+                self._next_retention = now + RETENTION_CHECK_INTERVAL
+                self._save_next_retention()
+        return written
+
+    def enforce_retention(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        stores = {"raw": self.store, **{name: tier_store for name, _, tier_store in self.tiers}}
+        removed = 0
+        for name, seconds in self.retention.items():
+            if seconds is not None and name in stores:
+                removed += stores[name].drop_before(now - seconds)
+        return removed
+
+    def select_tier(self, start: Any = None, end: Any = None, max_points: int = 1000,
+                    now: Optional[float] = None) -> str:
+        now = time.time() if now is None else now
+        start = to_epoch(start) if start is not None else float('-inf')
+        end = to_epoch(end) if end is not None else now
+        step = (end - start) / max(max_points, 1)
+        tiers = [("raw", 0)] + [(name, width) for name, width, _ in self.tiers]
+        eligible = [
+            (name, width) for name, width in tiers
+            if self.retention.get(name) is None or start >= now - self.retention[name]
+        ] or tiers[-1:]
+        fitting = [name for name, width in eligible if width <= step]
+        return fitting[-1] if fitting else eligible[0][0]
+
+    def _read_tier(self, index: int, server_name: str, mount: Optional[str], metric: str,
+                   start: float, end: float) -> Dict[str, np.ndarray]:
+        if index == 0:
+            data = self.store._read_range(self.store._series_dir(server_name, mount), [metric], start, end)
+            values = data[metric]
+            result = {stat: values for stat in ROLLUP_STATS[:4]}
+            result["count"] = (~np.isnan(values)).astype(float)
+            result["timestamp"] = data["timestamp"]
+            return result
+        _, width, tier_store = self.tiers[index - 1]
+        data = tier_store._read_range(
+            tier_store._series_dir(server_name, mount), rollup_columns([metric]), start, end
+        )
+        result = {stat: data[f"{metric}_{stat}"] for stat in ROLLUP_STATS}
+        result["timestamp"] = data["timestamp"]
+        covered = float(result["timestamp"][-1]) + width if len(result["timestamp"]) else start
+        if covered <= end:
+            tail = self._read_tier(index - 1, server_name, mount, metric, covered, end)
+            result = {column: np.concatenate([values, tail[column]]) for column, values in result.items()}
+        return result
+
+    def query(self, server_name: str, metric: str, start: Any = None, end: Any = None, max_points: int = 1000,
+              mount: Optional[str] = None, tier: Optional[str] = None) -> Dict[str, Any]:
+        now = time.time()
+        tier = tier or self.select_tier(start, end, max_points, now)
+        index = ["raw"] + [name for name, _, _ in self.tiers]
+        start = to_epoch(start) if start is not None else float('-inf')
+        end = to_epoch(end) if end is not None else now
+        result = self._read_tier(index.index(tier), server_name, mount, metric, start, end)
+        result["tier"] = tier
+        return result
@@ -0,0 +1,42 @@
+import logging
+from typing import Any
+import threading
+
+
+class SnapshotWriter:
+    def __init__(self, write, logger: logging.Logger):
+        self._write = write
+        self._logger = logger
+        self._condition = threading.Condition()
+        self._pending = None
+        self._closed = False
+        self.coalesced = 0
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job: Any):
+        with self._condition:
+            if self._pending is not None:
+                self.coalesced += 1
+                self._logger.warning("Previous daemon snapshot still being written, coalescing with the next one")
+            self._pending = job
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closed:
+                    self._condition.wait()
+                if self._pending is None:
+                    return
+                job, self._pending = self._pending, None
+            try:
+                self._write(job)
+            except Exception as e:
+                self._logger.error(f"Failed to write daemon snapshot: {e}")
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        self._thread.join()
@@ -0,0 +1,45 @@
+import json
+import csv
+from typing import Dict, Any
+import threading
+
+
+CSV_HEADER = [
+    'server_name', 'timestamp', 'status', 'hostname',
+    'load_1min', 'load_5min', 'load_15min', 'uptime_string',
+    'memory_total_mb', 'memory_used_mb', 'memory_free_mb',
+    'memory_available_mb', 'memory_usage_percent',
+    'swap_total_mb', 'swap_used_mb', 'swap_free_mb',
+    'root_disk_usage_percent'
+]
+
+
+class StreamingResultWriter:
+    def __init__(self, ndjson_path: str, csv_path: str, row_builder):
+        self._lock = threading.Lock()
+        self._row_builder = row_builder
+        self._ndjson_file = open(ndjson_path, 'w')
+        self._csv_file = open(csv_path, 'w', newline='')
+        self._csv_writer = csv.writer(self._csv_file)
+        self._csv_writer.writerow(CSV_HEADER)
+        self._csv_file.flush()
+        self.records_written = 0
+        self.successful = 0
+
+    def write(self, server_data: Dict[str, Any]):
+        line = json.dumps({"type": "server", **server_data})
+        row = self._row_builder(server_data["server_name"], server_data)
+        with self._lock:
+            self._ndjson_file.write(line + '\n')
+            self._ndjson_file.flush()
+            self._csv_writer.writerow(row)
+            self._csv_file.flush()
+            self.records_written += 1
+            if server_data["status"] == "success":
+                self.successful += 1
+
+    def close(self, summary: Dict[str, Any]):
+        with self._lock:
+            self._ndjson_file.write(json.dumps({"type": "summary", **summary}) + '\n')
+            self._ndjson_file.close()
+            self._csv_file.close()
@@ -0,0 +1,53 @@
+import paramiko
+from typing import Dict, Any
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncTransport(ABC):
+    @abstractmethod
+    async def connect(self, server_config: Dict[str, Any]) -> Any:
+        pass
+
+    @abstractmethod
+    async def run(self, session: Any, command: str, timeout: float = 30) -> tuple:
+        pass
+
+    @abstractmethod
+    async def close(self, session: Any):
+        pass
+
+
+def _close_client_when_done(future):
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
+
+
+class ParamikoExecutorTransport(AsyncTransport):
+    def __init__(self, connect, max_workers: int = 64):
+        self._connect = connect
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ssh-io")
+
+    async def connect(self, server_config: Dict[str, Any]) -> paramiko.SSHClient:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(self.executor, self._connect, server_config)
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(_close_client_when_done)
+            raise
+
+    def _exec(self, ssh_client: paramiko.SSHClient, command: str, timeout: float) -> tuple:
+        stdin, stdout, stderr = ssh_client.exec_command(command, timeout=timeout)
+        return stdout.read().decode(), stderr.read().decode()
+
+    async def run(self, session: paramiko.SSHClient, command: str, timeout: float = 30) -> tuple:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._exec, session, command, timeout)
+
+    async def close(self, session: paramiko.SSHClient):
+        await asyncio.get_running_loop().run_in_executor(None, session.close)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
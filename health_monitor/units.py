@@ -0,0 +1,34 @@
+from datetime import datetime
+from typing import Any, Optional
+
+
+DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+
+def parse_size_to_bytes(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().replace(',', '.')
+    if not text:
+        return 0.0
+    units = "KMGTPE"
+    if text[-1].upper() in units:
+        return float(text[:-1]) * 1024 ** (units.index(text[-1].upper()) + 1)
+    return float(text)
+
+
+def parse_duration(value: str) -> Optional[float]:
+    text = value.strip().lower()
+    if text in ("forever", "none", "inf"):
+        return None
+    if text and text[-1] in DURATION_UNITS:
+        return float(text[:-1]) * DURATION_UNITS[text[-1]]
+    return float(text)
+
+
+def to_epoch(value: Any) -> float:
+    if isinstance(value, datetime):
+        return value.timestamp()
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
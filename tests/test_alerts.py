@@ -0,0 +1,71 @@
+import pytest
+
+import health_monitor
+
+
+def sample(name, load):
+    return {"timestamp": "2026-01-01T10:00:00", "server_name": name, "hostname": name, "status": "success",
+            "uptime": {"load_1min": load, "load_5min": load, "load_15min": load, "uptime_string": "up 3 days"},
+            "disk_usage": [{"filesystem": "/dev/sda1", "size": "20G", "used": "8G", "available": "12G",
+                            "use_percent": "40", "mounted_on": "/"}],
+            "memory": {"memory_total": 4000, "memory_used": 1000, "memory_free": 3000, "memory_available": 3000,
+                       "swap_total": 0, "swap_used": 0, "swap_free": 0, "memory_usage_percent": 25.0}}
+
+
+def table(loads, failed=()):
+    samples = {}
+    for name, load in loads.items():
+        if name in failed:
+            samples[name] = {"timestamp": "2026-01-01T10:00:00", "server_name": name, "hostname": name,
+                             "status": "failed", "error": "Connection refused"}
+        else:
+            samples[name] = sample(name, load)
+    return health_monitor.HostTable(samples)
+
+
+RULES = [{"name": "load", "metric": "load_1min", "warn": 1.0, "crit": 2.0, "for": 2,
+          "overrides": {"batch": {"warn": 4.0, "crit": 8.0, "for": 1}}}]
+TAGS = {"worker": ["batch"]}
+
+
+def levels(transitions):
+    return {(item["server"], item["to"]) for item in transitions}
+
+
+def test_for_requires_consecutive_breaches():
+    engine = health_monitor.AlertRuleEngine(RULES)
+    assert engine.evaluate(table({"web": 3.0}), TAGS) == []
+    assert levels(engine.evaluate(table({"web": 3.0}), TAGS)) == {("web", "critical")}
+    assert engine.evaluate(table({"web": 0.5}), TAGS)[0]["to"] == "ok"
+    assert engine.evaluate(table({"web": 1.5}), TAGS) == []
+    assert engine.evaluate(table({"web": 0.5}), TAGS) == []
+
+
+def test_overrides_apply_per_tag():
+    engine = health_monitor.AlertRuleEngine(RULES)
+    engine.evaluate(table({"web": 3.0, "worker": 3.0}), TAGS)
+    transitions = engine.evaluate(table({"web": 3.0, "worker": 5.0}), TAGS)
+    assert levels(transitions) == {("web", "critical"), ("worker", "warning")}
+    worker = [item for item in transitions if item["server"] == "worker"][0]
+    assert worker["threshold"] == 4.0
+    assert engine.counts() == {"load": {"warning": 1, "critical": 1}}
+
+
+def test_unobserved_hosts_keep_their_level_and_state_persists(tmp_path):
+    state_path = str(tmp_path / "alerts.json")
+    engine = health_monitor.AlertRuleEngine(RULES, state_path)
+    engine.evaluate(table({"web": 3.0}), TAGS)
+    engine.evaluate(table({"web": 3.0}), TAGS)
+    assert engine.evaluate(table({"web": 0.0}, failed={"web"}), TAGS) == []
+    engine.save()
+    restored = health_monitor.AlertRuleEngine(RULES, state_path)
+    assert restored.active() == [{"rule": "load", "server": "web", "level": "critical"}]
+    restored.forget(["web"])
+    assert restored.active() == []
+
+
+def test_invalid_rules_are_rejected():
+    with pytest.raises(ValueError):
+        health_monitor.AlertRuleEngine([{"metric": "load_1min"}])
+    with pytest.raises(ValueError):
+        health_monitor.AlertRuleEngine([{"metric": "load_1min", "warn": 1, "op": "=="}])
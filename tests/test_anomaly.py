@@ -0,0 +1,62 @@
+import health_monitor
+
+
+def table(loads, minute):
+    samples = {}
+    for name, load in loads.items():
+        samples[name] = {
+            "timestamp": f"2026-01-01T10:{minute:02d}:00", "server_name": name, "hostname": name, "status": "success",
+            "uptime": {"load_1min": load, "load_5min": load, "load_15min": load, "uptime_string": "up 3 days"},
+            "disk_usage": [{"filesystem": "/dev/sda1", "size": "20G", "used": "8G", "available": "12G",
+                            "use_percent": "40", "mounted_on": "/"}],
+            "memory": {"memory_total": 4000, "memory_used": 1000, "memory_free": 3000, "memory_available": 3000,
+                       "swap_total": 0, "swap_used": 0, "swap_free": 0, "memory_usage_percent": 25.0}
+        }
+    return health_monitor.HostTable(samples)
+
+
+def detector(state_path=None):
+    return health_monitor.AnomalyDetector(state_path, warmup=3, metrics=["load_1min"])
+
+
+def test_spike_is_flagged_after_warmup_and_recovers():
+    anomalies = detector()
+    for minute in range(4):
+        assert anomalies.update(table({"web": 0.5}, minute)) == []
+    transitions = anomalies.update(table({"web": 5.0}, 4))
+    assert [(item["server"], item["from"], item["to"]) for item in transitions] == [("web", "ok", "anomaly")]
+    assert anomalies.current["web"][0]["metric"] == "load_1min"
+    transitions = anomalies.update(table({"web": 0.5}, 5))
+    assert [(item["from"], item["to"]) for item in transitions] == [("anomaly", "ok")]
+    assert anomalies.current == {}
+
+
+def test_warmup_suppresses_scores():
+    anomalies = detector()
+    anomalies.update(table({"web": 0.5}, 0))
+    assert anomalies.update(table({"web": 50.0}, 1)) == []
+
+
+def test_repeated_samples_are_not_counted_twice():
+    anomalies = detector()
+    anomalies.update(table({"web": 0.5}, 0))
+    anomalies.update(table({"web": 0.5}, 0))
+    assert anomalies.baseline("web", "load_1min")["samples"] == 1
+    anomalies.update(table({"web": 0.5}, 1))
+    assert anomalies.baseline("web", "load_1min")["samples"] == 2
+
+
+def test_state_persists_and_forget_resets(tmp_path):
+    state_path = str(tmp_path / "anomaly.npz")
+    anomalies = detector(state_path)
+    for minute in range(4):
+        anomalies.update(table({"web": 0.5, "db": 1.0}, minute))
+    anomalies.save()
+    restored = detector(state_path)
+    assert restored.baseline("db", "load_1min") == {"mean": 1.0, "std": 0.0, "samples": 4}
+    assert restored.update(table({"web": 0.5, "db": 1.0}, 3)) == []
+    assert restored.baseline("web", "load_1min")["samples"] == 4
+    restored.forget(["web"])
+    assert restored.baseline("web", "load_1min")["samples"] == 0
+    assert restored.update(table({"web": 5.0}, 4)) == []
+    assert restored.baseline("db", "load_1min")["samples"] == 4
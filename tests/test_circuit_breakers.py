@@ -0,0 +1,59 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import ENTRY_SCRIPT
+
+import health_monitor
+
+
+def result(name, status):
+    return {"timestamp": "2026-01-01T10:00:00", "server_name": name, "hostname": name, "status": status,
+            "error": f"{name} {status}"}
+
+
+def test_breakers_are_off_by_default(tmp_path, closed_port):
+    config = tmp_path / "servers.json"
+    config.write_text(json.dumps([
+        {"name": "breaker-test", "hostname": "127.0.0.1", "port": closed_port, "username": "u", "password": "p"}
+    ]))
+    output_dir = tmp_path / "out"
+    completed = subprocess.run(
+        [sys.executable, ENTRY_SCRIPT, "--config", str(config), "--output-dir", str(output_dir), "--no-viz"],
+        cwd=tmp_path, capture_output=True, text=True, timeout=120
+    )
+    assert completed.returncode == 1, completed.stdout + completed.stderr
+    assert (output_dir / "server_health_data.json").exists()
+    assert not (output_dir / "server_health_breakers.json").exists()
+
+
+def test_timed_out_counts_as_failure(tmp_path):
+    monitor = health_monitor.ServerHealthMonitor(output_dir=str(tmp_path))
+    monitor.enable_circuit_breakers(failure_threshold=2, base_backoff=60)
+    monitor._update_circuit_breaker(result("web-1", "timed_out"))
+    monitor._update_circuit_breaker(result("web-1", "timed_out"))
+    breaker = monitor.circuit_breakers.check("web-1")
+    assert breaker["state"] == "open"
+    assert breaker["failures"] == 2
+
+
+def test_half_open_probe_is_cleared_on_every_terminal_status(tmp_path):
+    monitor = health_monitor.ServerHealthMonitor(output_dir=str(tmp_path))
+    monitor.enable_circuit_breakers(failure_threshold=1, base_backoff=60)
+    registry = monitor.circuit_breakers
+    registry.record_failure("web-1", "refused", now=0)
+    assert registry.check("web-1", now=61) is None
+    assert registry.check("web-1", now=62)["state"] == "half_open"
+    monitor._update_circuit_breaker(result("web-1", "timed_out"))
+    assert "web-1" not in registry._probing
+    assert registry.check("web-1")["state"] == "open"
+
+    registry.record_failure("web-2", "refused", now=0)
+    assert registry.check("web-2", now=61) is None
+    monitor._update_circuit_breaker(result("web-2", "unknown"))
+    assert "web-2" not in registry._probing
+    assert registry.check("web-2", now=62) is None
+    monitor._update_circuit_breaker(result("web-2", "success"))
+    assert registry.check("web-2") is None
+    assert registry.counts() == {"open": 1, "half_open": 0, "closed": 0}
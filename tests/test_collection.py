@@ -0,0 +1,120 @@
+import asyncio
+import json
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+import health_monitor
+from conftest import ENTRY_SCRIPT
+
+
+def servers(port, count=3):
+    return [
+        {"name": f"collect-test-{index}", "hostname": "127.0.0.1", "port": port, "username": "u", "password": "p"}
+        for index in range(count)
+    ]
+
+
+def test_sequential_pass_after_deadline_pass_records_failures(tmp_path, closed_port):
+    monitor = health_monitor.ServerHealthMonitor(output_dir=str(tmp_path))
+    monitor.servers = servers(closed_port)
+    monitor.enable_circuit_breakers(failure_threshold=5)
+    release = threading.Event()
+    finished = threading.Semaphore(0)
+
+    def blocked(server):
+        try:
+            assert release.wait(10)
+            raise RuntimeError("abandoned check")
+        finally:
+            finished.release()
+
+    monitor.collect_server_data = blocked
+    monitor._collect(workers=3, deadline=0.0)
+    assert monitor.collected_data.count_status("timed_out") == len(monitor.servers)
+    for server in monitor.servers:
+        assert monitor.circuit_breakers._breakers[server["name"]]["failures"] == 1
+    running = sum("before the check finished" in monitor.collected_data[server["name"]]["error"]
+                  for server in monitor.servers)
+    release.set()
+    for _ in range(running):
+        assert finished.acquire(timeout=10)
+    del monitor.collect_server_data
+
+    with monitor._state_lock:
+        monitor.failed_connections.clear()
+    monitor._collect(workers=1)
+    assert monitor.collected_data.count_status("failed") == len(monitor.servers)
+    assert sorted(entry["server"] for entry in monitor.failed_connections) == [
+        server["name"] for server in monitor.servers
+    ]
+    for server in monitor.servers:
+        assert monitor.circuit_breakers._breakers[server["name"]]["failures"] == 2
+    monitor.close()
+
+
+def test_failures_are_not_recorded_after_the_deadline_claims_a_host(tmp_path):
+    monitor = health_monitor.ServerHealthMonitor(output_dir=str(tmp_path))
+    assert monitor._claim_result("late", "deadline")
+    monitor._record_failed_connection("late", "Connection refused")
+    monitor._record_failed_connection("early", "Connection refused")
+    assert not monitor._claim_result("early", "deadline")
+    assert [entry["server"] for entry in monitor.failed_connections] == ["early"]
+    monitor.close()
+
+
+def test_deadline_exits_while_a_handshake_hangs(tmp_path, silent_port):
+    config = tmp_path / "servers.json"
+    config.write_text(json.dumps(servers(silent_port, count=2)))
+    started = time.monotonic()
+    result = subprocess.run(
+        [sys.executable, ENTRY_SCRIPT, "--config", str(config), "--workers", "2", "--deadline", "1",
+         "--output-dir", str(tmp_path), "--no-viz"],
+        cwd=tmp_path, capture_output=True, text=True, timeout=60
+    )
+    elapsed = time.monotonic() - started
+    assert result.returncode == 1, result.stdout + result.stderr
+    assert elapsed < 10
+    with open(tmp_path / "server_health_data.json") as f:
+        document = json.load(f)
+    assert {server["status"] for server in document["data"].values()} == {"timed_out"}
+
+
+class RecordingTransport(health_monitor.AsyncTransport):
+    def __init__(self):
+        self.timeouts = []
+
+    async def connect(self, server_config):
+        return server_config
+
+    async def run(self, session, command, timeout=30):
+        self.timeouts.append(timeout)
+        return "", ""
+
+    async def close(self, session):
+        return None
+
+
+def test_async_probes_use_the_configured_timeout(tmp_path, monkeypatch):
+    monkeypatch.setattr(health_monitor.monitor, "PROBE_TIMEOUT", 7)
+    monitor = health_monitor.ServerHealthMonitor(output_dir=str(tmp_path))
+    monitor.servers = servers(22, count=1)
+    transport = RecordingTransport()
+    asyncio.run(monitor.collect_all_async(transport))
+    assert transport.timeouts and set(transport.timeouts) == {7}
+    monitor.close()
+
+
+def test_asyncio_engine_rejects_the_proc_probe(tmp_path):
+    monitor = health_monitor.ServerHealthMonitor(probe_mode="proc", output_dir=str(tmp_path))
+    monitor.servers = servers(22, count=1)
+    with pytest.raises(ValueError):
+        asyncio.run(monitor.collect_all_async(RecordingTransport()))
+    monitor.close()
+    result = subprocess.run([sys.executable, ENTRY_SCRIPT, "--engine", "asyncio", "--probe", "proc"],
+                            cwd=tmp_path, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 2
+    assert "not supported by --engine asyncio" in result.stderr
@@ -0,0 +1,84 @@
+import json
+import os
+
+import health_monitor
+
+
+def sample(name, load=0.5, memory_used=1000, mounts=("/",)):
+    return {
+        "timestamp": "2026-01-01T10:00:00",
+        "server_name": name,
+        "hostname": f"{name}.example.com",
+        "status": "success",
+        "uptime": {"load_1min": load, "uptime_string": "up 1 day"},
+        "memory": {"memory_used": memory_used},
+        "disk_usage": [
+            {"filesystem": "/dev/sda1", "size": "20G", "used": "8G", "available": "12G", "use_percent": "40",
+             "mounted_on": mount}
+            for mount in mounts
+        ]
+    }
+
+
+def recorder(tmp_path, keyframe_interval=3):
+    return health_monitor.DeltaRecorder(str(tmp_path / "state.json"), str(tmp_path / "delta.ndjson"),
+                                        str(tmp_path / "delta.csv"), keyframe_interval=keyframe_interval)
+
+
+def records(tmp_path, pass_number):
+    with open(tmp_path / "delta.ndjson") as f:
+        lines = [json.loads(line) for line in f]
+    return [line for line in lines if line["type"] != "pass" and line["pass"] == pass_number]
+
+
+def test_only_changes_beyond_the_deadband_are_written(tmp_path):
+    deltas = recorder(tmp_path)
+    first = deltas.record({"web-1": sample("web-1"), "web-2": sample("web-2", mounts=("/", "/data"))})
+    assert first["keyframe"] and first["hosts_changed"] == 2
+    assert [record["type"] for record in records(tmp_path, 0)] == ["keyframe", "keyframe"]
+
+    second = deltas.record({"web-1": sample("web-1", load=0.55), "web-2": sample("web-2", memory_used=1200)})
+    assert not second["keyframe"]
+    assert second["hosts_changed"] == 1
+    [record] = records(tmp_path, 1)
+    assert record["server_name"] == "web-2"
+    assert record["metrics"] == {"memory_used": 1200}
+    assert sorted(record["removed"]) == [f"disk:/data:{field}" for field in
+                                         sorted(["filesystem", "size", "used", "available", "use_percent"])]
+
+
+def test_state_survives_restarts_and_keyframes_repeat(tmp_path):
+    recorder(tmp_path).record({"web-1": sample("web-1")})
+    restarted = recorder(tmp_path)
+    assert restarted.pass_number == 1
+    assert restarted.record({"web-1": sample("web-1")})["hosts_changed"] == 0
+    assert restarted.record({"web-1": sample("web-1", load=2.0)})["metrics_written"] == 1
+    keyframe = restarted.record({"web-1": sample("web-1", load=2.0)})
+    assert keyframe["keyframe"] and keyframe["hosts_changed"] == 1
+    with open(tmp_path / "delta.csv") as f:
+        header = f.readline().strip().split(',')
+    assert header == health_monitor.delta.DELTA_CSV_HEADER
+
+
+def test_monitor_delta_mode_keeps_full_outputs_and_forgets_retired_hosts(tmp_path):
+    config = tmp_path / "servers.json"
+    config.write_text(json.dumps([{"name": "a", "hostname": "a"}, {"name": "b", "hostname": "b"}]))
+    output_dir = tmp_path / "out"
+    monitor = health_monitor.ServerHealthMonitor(config_file=str(config), output_dir=str(output_dir))
+    monitor.enable_delta()
+    monitor.collected_data["a"] = sample("a")
+    monitor.collected_data["b"] = sample("b")
+    monitor.save_results()
+    for name in ("server_health_data.json", "server_health_data.csv", "server_health_delta.ndjson"):
+        assert (output_dir / name).exists()
+    assert sorted(monitor.delta_recorder._last_reported) == ["a", "b"]
+
+    config.write_text(json.dumps([{"name": "a", "hostname": "a"}]))
+    stat = config.stat()
+    os.utime(config, (stat.st_atime, stat.st_mtime + 1))
+    assert monitor.reload_inventory()
+    assert list(monitor.delta_recorder._last_reported) == ["a"]
+    monitor.save_results()
+    with open(output_dir / "server_health_delta_state.json") as f:
+        assert list(json.load(f)["hosts"]) == ["a"]
+    monitor.close()
@@ -0,0 +1,63 @@
+import gzip
+import json
+import urllib.request
+
+import health_monitor
+
+
+def snapshot():
+    return {
+        "timestamp": "2026-01-01T10:00:05",
+        "data": {
+            "web-1": {
+                "timestamp": "2026-01-01T10:00:00", "server_name": "web-1", "hostname": "web-1", "status": "success",
+                "uptime": {"load_1min": 0.5, "load_5min": 0.25, "load_15min": 0.125},
+                "memory": {"memory_total": 4096, "memory_used": 1024, "memory_usage_percent": 25.0},
+                "disk_usage": [
+                    {"mounted_on": "/", "use_percent": "43"},
+                    {"mounted_on": "/mnt/\"odd\"", "use_percent": "-"}
+                ]
+            },
+            'db "primary"': {
+                "timestamp": "2026-01-01T10:00:01", "server_name": "db", "hostname": "db", "status": "failed",
+                "error": "Connection refused"
+            }
+        }
+    }
+
+
+def test_render_prometheus():
+    lines = health_monitor.render_prometheus(snapshot()).splitlines()
+    assert 'server_health_up{server="web-1"} 1' in lines
+    assert 'server_health_up{server="db \\"primary\\""} 0' in lines
+    assert 'server_health_check_status{server="db \\"primary\\"",status="failed"} 1' in lines
+    assert 'server_health_load5{server="web-1"} 0.25' in lines
+    assert 'server_health_memory_usage_percent{server="web-1"} 25.0' in lines
+    assert 'server_health_disk_usage_percent{server="web-1",mount="/"} 43.0' in lines
+    assert not any('odd' in line for line in lines)
+    assert 'server_health_servers{status="success"} 1' in lines
+    assert 'server_health_servers{status="failed"} 1' in lines
+    assert '# TYPE server_health_load1 gauge' in lines
+    assert not any(line.startswith('# HELP server_health_swap_used_megabytes') for line in lines)
+    assert lines[-1].startswith('server_health_snapshot_timestamp_seconds ')
+
+
+def test_exporter_serves_the_published_snapshot():
+    exporter = health_monitor.MetricsExporter(port=0)
+    try:
+        url = "http://%s:%d" % exporter.address
+        try:
+            urllib.request.urlopen(url + "/metrics")
+            raise AssertionError("expected 503 before the first snapshot")
+        except urllib.error.HTTPError as e:
+            assert e.code == 503
+        exporter.publish(snapshot())
+        with urllib.request.urlopen(url + "/metrics") as response:
+            assert response.headers["Content-Type"] == health_monitor.exporter.PROMETHEUS_CONTENT_TYPE
+            assert response.read().decode() == health_monitor.render_prometheus(snapshot())
+        request = urllib.request.Request(url + "/snapshot.json", headers={"Accept-Encoding": "gzip"})
+        with urllib.request.urlopen(request) as response:
+            assert response.headers["Content-Encoding"] == "gzip"
+            assert json.loads(gzip.decompress(response.read())) == snapshot()
+    finally:
+        exporter.close()
@@ -0,0 +1,119 @@
+import time
+from datetime import datetime
+
+import numpy as np
+
+import health_monitor
+
+
+def sample(name, timestamp, load):
+    return {
+        "timestamp": datetime.fromtimestamp(timestamp).isoformat(),
+        "server_name": name,
+        "hostname": name,
+        "status": "success",
+        "uptime": {"load_1min": load, "load_5min": load, "load_15min": load},
+        "memory": {"memory_usage_percent": 40.0},
+        "disk_usage": []
+    }
+
+
+def test_retention_schedule_survives_restarts(tmp_path):
+    store = health_monitor.HealthHistoryStore(str(tmp_path / "history"))
+    now = 1_800_000_000.0
+    store.append(sample("web-1", now - 600, 0.5))
+    first = health_monitor.HistoryRollup(store).run(now)
+    assert "segments_expired" in first
+
+    restarted = health_monitor.HistoryRollup(store)
+    assert "segments_expired" not in restarted.run(now + 60)
+    due = health_monitor.HistoryRollup(store).run(now + health_monitor.RETENTION_CHECK_INTERVAL)
+    assert "segments_expired" in due
+
+
+def test_rollup_percentiles_keep_spikes_and_the_open_bucket(tmp_path):
+    store = health_monitor.HealthHistoryStore(str(tmp_path / "history"))
+    now = time.time()
+    timestamps = np.arange(now - 6 * 3600, now, 10.0)
+    load = np.full(len(timestamps), 0.5)
+    load[len(timestamps) // 2] = 9.0
+    recent = timestamps >= now - 30
+    load[recent] = 5.0
+    values = {metric: load for metric in health_monitor.ROLLUP_METRICS}
+    store.append_rows(store._series_dir("web-1"), timestamps, health_monitor.ROLLUP_METRICS, values)
+    health_monitor.HistoryRollup(store).run(now)
+    query = health_monitor.HistoryQuery(store, health_monitor.HistoryRollup(store))
+
+    samples = query.load("load_5min", start=now - 6 * 3600)
+    assert samples["tier"] == "1m"
+    assert samples["value"].max() == 9.0
+    assert samples["timestamp"].max() == timestamps[-1] // 60 * 60
+    assert samples["value"][samples["timestamp"] >= now - 120].max() == 5.0
+    assert query.percentiles("load_5min", [100], start=now - 6 * 3600)["web-1"]["p100_max"] == 9.0
+    assert query.percentiles("load_5min", [100], start=now - 6 * 3600, stat="mean")["web-1"]["p100_mean"] < 9.0
+    assert query.percentiles("load_5min", [100], start=now - 600, servers=["web-1"])["web-1"] == {"p100": 5.0}
+
+
+def test_open_buckets_follow_incremental_runs_and_restarts(tmp_path):
+    store = health_monitor.HealthHistoryStore(str(tmp_path / "history"))
+    start = 1_800_000_000.0 // 86400 * 86400
+    timestamps = np.arange(start, start + 3 * 3600, 30.0)
+    load = np.arange(len(timestamps), dtype=float)
+    values = {metric: load for metric in health_monitor.ROLLUP_METRICS}
+    store.append_rows(store._series_dir("web-1"), timestamps, health_monitor.ROLLUP_METRICS, values)
+    now = start + 3 * 3600
+    health_monitor.HistoryRollup(store).run(start + 5400)
+    rollup = health_monitor.HistoryRollup(store)
+    for step in (7200, 9000, 3 * 3600):
+        rollup.run(start + step)
+    for tier in ("1m", "1h", "1d"):
+        rows = rollup.read_fleet(tier, "host", ["load_1min_count", "load_1min_mean", "load_1min_last"],
+                                 start, now, include_open=True)
+        assert rows["load_1min_count"].sum() == len(timestamps)
+        assert np.isclose((rows["load_1min_mean"] * rows["load_1min_count"]).sum(), load.sum())
+        assert rows["load_1min_last"][np.argmax(rows["timestamp"])] == load[-1]
+
+
+def test_appends_are_buffered_until_flush_and_read_by_range(tmp_path):
+    store = health_monitor.HealthHistoryStore(str(tmp_path / "history"))
+    now = 1_800_000_000.0
+    for offset in range(10):
+        assert store.append(sample("web-1", now + offset * 60, float(offset)))
+    assert not store.append(sample("web-1", now, 0.0))
+    assert len(store.query("web-1")["timestamp"]) == 0
+    store.flush()
+    data = store.query("web-1", start=now + 120, end=now + 300, columns=["load_1min", "status"])
+    assert data["load_1min"].tolist() == [2.0, 3.0, 4.0, 5.0]
+    assert data["status"].tolist() == [1.0] * 4
+    assert len(store.query("web-1", start=now + 3600)["timestamp"]) == 0
+
+
+def test_unparseable_values_are_stored_as_nan_without_tearing_rows(tmp_path):
+    store = health_monitor.HealthHistoryStore(str(tmp_path / "history"))
+    now = 1_800_000_000.0
+    broken = sample("web-1", now, "-")
+    broken["disk_usage"] = [{"filesystem": "nfs:/export", "size": "-", "used": "-", "available": "-",
+                             "use_percent": "-", "mounted_on": "/mnt"},
+                            {"filesystem": "/dev/sda1", "size": "20G", "used": "8G", "available": "12G",
+                             "use_percent": "40", "mounted_on": "/"}]
+    assert store.append(broken)
+    assert store.append(sample("web-1", now + 60, 0.5))
+    store.flush()
+    data = store.query("web-1")
+    assert len(data["timestamp"]) == 2
+    assert np.isnan(data["load_1min"][0]) and data["load_1min"][1] == 0.5
+    assert all(len(values) == 2 for values in data.values())
+    assert np.isnan(store.query_disk("web-1", "/mnt")["use_percent"]).all()
+    assert store.query_disk("web-1", "/")["used"].tolist() == [8 * 1024 ** 3]
+
+
+def test_reads_ignore_a_torn_trailing_row(tmp_path):
+    store = health_monitor.HealthHistoryStore(str(tmp_path / "history"))
+    now = 1_800_000_000.0
+    store.append(sample("web-1", now, 0.5))
+    store.append(sample("web-1", now + 60, 1.5))
+    store.flush()
+    segment = store._segment_start(now)
+    with open(store._column_path(store._series_dir("web-1"), segment, "load_1min"), 'ab') as f:
+        f.write(np.array([9.0]).tobytes())
+    assert store.query("web-1")["load_1min"].tolist() == [0.5, 1.5]
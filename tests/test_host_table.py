@@ -0,0 +1,119 @@
+import pytest
+
+import health_monitor
+
+
+def sample(name, load=0.5, status="success", **overrides):
+    data = {
+        "timestamp": "2026-01-01T10:00:00.123456",
+        "server_name": name,
+        "hostname": f"{name}.prod.example.com",
+        "status": status,
+        "uptime": {"load_1min": load, "load_5min": 0.25, "load_15min": 0.125, "uptime_string": "10:00:00 up 3 days,"},
+        "disk_usage": [
+            {"filesystem": "/dev/sda1", "size": "20G", "used": "8.1G", "available": "11G",
+             "use_percent": "43", "mounted_on": "/"},
+            {"filesystem": "/dev/sdb1", "size": "100G", "used": "50G", "available": "50G",
+             "use_percent": "50", "mounted_on": "/data"}
+        ],
+        "memory": {"memory_total": 3936, "memory_used": 1234, "memory_free": 987, "memory_available": 2400,
+                   "swap_total": 2047, "swap_used": 0, "swap_free": 2047, "memory_usage_percent": 31.35},
+        "uptime_error": "",
+        "disk_error": "",
+        "memory_error": ""
+    }
+    data.update(overrides)
+    return data
+
+
+def failed(name, error="Authentication failed"):
+    return {"timestamp": "2026-01-01T10:00:01", "server_name": name, "hostname": name, "status": "failed",
+            "error": error}
+
+
+def test_round_trip_preserves_samples():
+    samples = {
+        "web-1": sample("web-1"),
+        "web-2": failed("web-2"),
+        "web-3": sample("web-3", timestamp="yesterday", hostname=None, uptime_string_extra=[1, 2]),
+        "web-4": sample("web-4", disk_usage=[{"filesystem": "/dev/vda1", "size": 21474836480, "used": 8589934592,
+                                              "available": 12884901888, "use_percent": "40", "mounted_on": "/"}]),
+        "web-5": sample("web-5", memory={"memory_total": "lots"}, uptime={"load_1min": "high"}),
+        "web-6": sample("web-6", disk_usage=[{"filesystem": "/dev/sda1", "size": ["20G"], "used": "8G",
+                                              "available": "12G", "use_percent": "40", "mounted_on": "/"}]),
+        "web-7": sample("web-7", server_name="renamed", hostname=42, disk_usage=[]),
+        "web-8": sample("web-8", uptime={"load_1min": 1, "load_5min": True, "load_15min": 0.5, "uptime_string": "x"})
+    }
+    table = health_monitor.HostTable(samples)
+    assert len(table) == len(samples)
+    assert list(table) == list(samples)
+    for name, data in samples.items():
+        assert table[name] == data
+        assert list(table[name]) == list(data)
+    assert table.to_dict() == samples
+
+
+def test_replacing_a_row_drops_stale_sections():
+    table = health_monitor.HostTable({"web-1": sample("web-1")})
+    table["web-1"] = failed("web-1", "Connection refused")
+    assert table["web-1"] == failed("web-1", "Connection refused")
+    table["web-1"] = sample("web-1", load=2.5)
+    assert table["web-1"] == sample("web-1", load=2.5)
+
+
+def test_deleted_rows_are_reused():
+    table = health_monitor.HostTable()
+    for round_number in range(50):
+        for index in range(20):
+            table[f"host-{round_number}-{index}"] = sample(f"host-{round_number}-{index}", load=index)
+        for index in range(20):
+            if round_number < 49 or index % 2:
+                del table[f"host-{round_number}-{index}"]
+    assert len(table._names) == 20
+    assert set(table) == {f"host-49-{index}" for index in range(0, 20, 2)}
+    for index in range(0, 20, 2):
+        assert table[f"host-49-{index}"] == sample(f"host-49-{index}", load=index)
+    table["reused"] = failed("reused")
+    assert table["reused"] == failed("reused")
+    assert len(table._names) == 20
+
+
+def test_churn_compacts_storage_without_losing_data():
+    table = health_monitor.HostTable()
+    for round_number in range(300):
+        for index in range(20):
+            name = f"host-{index}"
+            table[name] = sample(name, load=round_number, hostname=f"{name}-{round_number}.example.com",
+                                 uptime={"load_1min": 1.0, "load_5min": 1.0, "load_15min": 1.0,
+                                         "uptime_string": "x" * (round_number % 7 + 500)})
+    for index in range(20):
+        name = f"host-{index}"
+        expected = sample(name, load=299, hostname=f"{name}-299.example.com",
+                          uptime={"load_1min": 1.0, "load_5min": 1.0, "load_15min": 1.0,
+                                  "uptime_string": "x" * (299 % 7 + 500)})
+        assert table[name] == expected
+    assert len(table._disks["mounted_on"]) < 20 * 2 * 300 // 2
+    assert len(table._disk_values) < 50
+
+
+def test_copy_is_independent():
+    table = health_monitor.HostTable({"web-1": sample("web-1"), "web-2": failed("web-2")})
+    snapshot = table.copy()
+    table["web-1"] = sample("web-1", load=9.0, hostname="changed")
+    del table["web-2"]
+    assert snapshot.to_dict() == {"web-1": sample("web-1"), "web-2": failed("web-2")}
+
+
+def test_columns_and_status_helpers():
+    table = health_monitor.HostTable({
+        "web-1": sample("web-1", load=1.5),
+        "web-2": failed("web-2"),
+        "web-3": sample("web-3", load=0.5)
+    })
+    assert table.success_mask().tolist() == [True, False, True]
+    assert table.column("load_1min").tolist() == [1.5, 0.0, 0.5]
+    assert table.column("root_disk_percent")[[0, 2]].tolist() == [43.0, 43.0]
+    assert table.status_counts() == {"success": 2, "failed": 1}
+    assert list(table.failures()) == [("web-2", "failed", "Authentication failed")]
+    with pytest.raises(KeyError):
+        table.column("not-a-column")
@@ -0,0 +1,65 @@
+import json
+import os
+
+import health_monitor
+
+
+def write(path, document):
+    path.write_text(json.dumps(document) if not isinstance(document, str) else document)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_expand_host_ranges():
+    entry = {"name": "web[08-10]", "hostname": "web[08-10].example.com", "port": 22}
+    assert health_monitor.expand_host_ranges(entry) == [
+        {"name": "web08", "hostname": "web08.example.com", "port": 22},
+        {"name": "web09", "hostname": "web09.example.com", "port": 22},
+        {"name": "web10", "hostname": "web10.example.com", "port": 22}
+    ]
+    grid = health_monitor.expand_host_ranges({"name": "r[1-2]-n[3-1]", "hostname": "10.0.[1-2].[3-1]"})
+    assert [server["hostname"] for server in grid] == ["10.0.1.3", "10.0.1.2", "10.0.1.1",
+                                                       "10.0.2.3", "10.0.2.2", "10.0.2.1"]
+    plain = {"name": "db", "hostname": "db.example.com"}
+    assert health_monitor.expand_host_ranges(plain) == [plain]
+
+
+def test_inventory_merges_defaults_includes_and_jsonl(tmp_path):
+    (tmp_path / "extra").mkdir()
+    write(tmp_path / "main.json", {
+        "defaults": {"username": "ops", "tags": "prod"},
+        "include": ["extra/*.jsonl"],
+        "servers": [{"name": "web[1-2]", "hostname": "web[1-2].example.com"}, {"name": "broken"}]
+    })
+    write(tmp_path / "extra" / "db.jsonl", '{"name": "db1", "hostname": "db1", "tags": ["db"]}\n\n'
+                                           '{"name": "web1", "hostname": "duplicate"}\n')
+    inventory = health_monitor.ServerInventory([str(tmp_path / "main.json")])
+    servers = inventory.load()
+    assert [server["name"] for server in servers] == ["web1", "web2", "db1"]
+    assert inventory.get("web1") == {"name": "web1", "hostname": "web1.example.com", "username": "ops",
+                                     "tags": ["prod"]}
+    assert inventory.tags() == ["db", "prod"]
+    assert [server["name"] for server in inventory.select(["db"])] == ["db1"]
+    assert inventory.file_count() == 2
+    assert inventory.reload() is None
+
+
+def test_reload_reports_changes_and_retires_hosts(tmp_path):
+    config = tmp_path / "servers.json"
+    write(config, [{"name": "a", "hostname": "a"}, {"name": "b", "hostname": "b"}])
+    monitor = health_monitor.ServerHealthMonitor(config_file=str(config), output_dir=str(tmp_path / "out"))
+    monitor.collected_data["b"] = {"timestamp": "2026-01-01T10:00:00", "server_name": "b", "hostname": "b",
+                                   "status": "failed", "error": "refused"}
+    assert [server["name"] for server in monitor.servers] == ["a", "b"]
+    assert not monitor.reload_inventory()
+
+    write(config, [{"name": "a", "hostname": "a2"}, {"name": "c", "hostname": "c"}])
+    assert monitor.reload_inventory()
+    assert [(server["name"], server["hostname"]) for server in monitor.servers] == [("a", "a2"), ("c", "c")]
+    assert "b" not in monitor.collected_data
+
+    write(config, [{"name": "a", "hostname": "a3"}, {"name": "d", "hostname": "d"}])
+    changes = monitor.inventory.reload()
+    assert changes["files_parsed"] == 1
+    assert (changes["added"], changes["removed"], changes["changed"]) == (["d"], ["c"], ["a"])
+    monitor.close()
@@ -0,0 +1,77 @@
+import io
+import os
+import subprocess
+
+import health_monitor
+from health_monitor import monitor as monitor_module
+
+FAKE_COMMANDS = {
+    "uptime": "echo ' 10:00:00 up 3 days,  2 users,  load average: 0.50, 0.25, 0.10'",
+    "disk": "printf 'Filesystem Size Used Avail Use%% Mounted on\\n/dev/sda1 20G 8.1G 11G 43%% /\\n'; "
+            "echo 'df: /mnt/nfs: Stale file handle' >&2",
+    "memory": "true"
+}
+
+
+class LocalShellClient:
+    def __init__(self):
+        self.commands = []
+
+    def exec_command(self, command, timeout=None):
+        self.commands.append(command)
+        completed = subprocess.run(["sh", "-c", command], capture_output=True, timeout=timeout)
+        return None, io.BytesIO(completed.stdout), io.BytesIO(completed.stderr)
+
+
+def test_batched_probe_is_one_round_trip_split_by_section(monkeypatch, tmp_path):
+    monkeypatch.setattr(monitor_module, "PROBE_COMMANDS", FAKE_COMMANDS)
+    monitor = health_monitor.ServerHealthMonitor(output_dir=str(tmp_path))
+    client = LocalShellClient()
+    probe = monitor.execute_batched_probe(client)
+    assert len(client.commands) == 1
+    assert probe == {
+        "uptime": ("10:00:00 up 3 days,  2 users,  load average: 0.50, 0.25, 0.10", ""),
+        "disk": ("Filesystem Size Used Avail Use% Mounted on\n/dev/sda1 20G 8.1G 11G 43% /",
+                 "df: /mnt/nfs: Stale file handle"),
+        "memory": ("", "")
+    }
+
+
+def test_split_probe_output_ignores_text_outside_sections(tmp_path):
+    monitor = health_monitor.ServerHealthMonitor(output_dir=str(tmp_path))
+    marker = health_monitor.PROBE_MARKER.format
+    output = "\n".join([
+        "Welcome to the login banner",
+        f"  {marker('uptime')}  ",
+        " 10:00:00 up 1 day",
+        marker("memory"),
+        "Mem: 100 50 50",
+        marker("disk")
+    ])
+    assert monitor.split_probe_output(output) == {
+        "uptime": "10:00:00 up 1 day",
+        "disk": "",
+        "memory": "Mem: 100 50 50"
+    }
+    assert monitor.split_probe_output("") == {"uptime": "", "disk": "", "memory": ""}
+
+
+class LocalSFTP:
+    def __init__(self, files):
+        self.files = files
+
+    def open(self, path, mode='r'):
+        return io.BytesIO(self.files[path].encode())
+
+
+def test_proc_probe_falls_back_to_df_without_sftp_statvfs(monkeypatch, tmp_path):
+    monkeypatch.setattr(monitor_module, "SFTP_STATVFS_SUPPORTED", False)
+    monitor = health_monitor.ServerHealthMonitor(output_dir=str(tmp_path))
+    client = LocalShellClient()
+    sftp = LocalSFTP({"/proc/mounts": "/dev/sda1 / ext4 rw 0 0\nproc /proc proc rw 0 0\n"})
+    disks = monitor.read_proc_disks(sftp, client)
+    assert client.commands == ["df -P -k -- /"]
+    stats = os.statvfs("/")
+    assert [disk["mounted_on"] for disk in disks] == ["/"]
+    assert disks[0]["size"] == stats.f_blocks * stats.f_frsize // 1024 * 1024
+    assert disks[0]["filesystem"] == "/dev/sda1"
@@ -0,0 +1,55 @@
+import json
+
+import health_monitor
+
+
+def test_phase_timings_attribute_samples_to_hosts():
+    timings = health_monitor.PhaseTimings()
+    timings.record("connect", 0.5, "web-1")
+    timings.record("connect", 2.0, "web-2")
+    timings.record("pass:save", 1.0)
+    shard = health_monitor.PhaseTimings()
+    shard.record("connect", 3.0, "db-1")
+    timings.merge(shard.samples())
+    summary = timings.summary()
+    assert summary["connect"]["count"] == 3
+    assert [entry["server"] for entry in summary["connect"]["slowest"]] == ["db-1", "web-2", "web-1"]
+    assert "slowest" not in summary["pass:save"]
+    assert "db-1" in timings.format_table()
+
+
+def test_timings_file_covers_every_pass_phase(tmp_path, closed_port):
+    monitor = health_monitor.ServerHealthMonitor(output_dir=str(tmp_path))
+    monitor.servers = [{"name": "timing-test", "hostname": "127.0.0.1", "port": closed_port,
+                        "username": "u", "password": "p"}]
+    monitor.run_health_check(enable_visualization=False)
+    with open(tmp_path / "server_health_timings.json") as f:
+        timings = json.load(f)["timings"]
+    assert {"pass:collection", "pass:save", "pass:publish", "pass:report"} <= set(timings)
+    assert timings["ssh_connect"]["slowest"][0]["server"] == "timing-test"
+    with open(tmp_path / "server_health_data.json") as f:
+        assert "timings" not in json.load(f)
+    monitor.close()
+
+
+def test_snapshot_view_takes_its_own_copy_of_mutable_state(tmp_path):
+    monitor = health_monitor.ServerHealthMonitor(output_dir=str(tmp_path))
+    monitor.servers = [{"name": "web-1", "hostname": "web-1"}]
+    monitor.collected_data["web-1"] = {"timestamp": "2026-01-01T10:00:00", "server_name": "web-1",
+                                       "hostname": "web-1", "status": "failed", "error": "refused"}
+    monitor._retired_servers.add("old")
+    monitor.timings.record("connect", 1.0, "web-1")
+    view = monitor._snapshot_view()
+    monitor.timings.record("connect", 2.0, "web-2")
+    monitor._retired_servers.add("older")
+    monitor._active_clients["web-2"] = object()
+
+    monitor._write_snapshot_view((view, False))
+    assert view.timings.summary()["connect"]["count"] == 1
+    assert monitor.timings.summary()["connect"]["slowest"] == [{"server": "web-2", "seconds": 2.0}]
+    assert view._retired_servers == {"old"}
+    assert view._active_clients == {}
+    with open(tmp_path / "server_health_timings.json") as f:
+        assert json.load(f)["timings"]["connect"]["slowest"][0]["server"] == "web-1"
+    monitor._active_clients.clear()
+    monitor.close()
@@ -0,0 +1,57 @@
+import numpy as np
+
+import health_monitor
+
+
+def sample(name, load, disk="40"):
+    return {"timestamp": "2026-01-01T10:00:00", "server_name": name, "hostname": name, "status": "success",
+            "uptime": {"load_1min": load, "load_5min": load, "load_15min": load, "uptime_string": "up 3 days"},
+            "disk_usage": [{"filesystem": "/dev/sda1", "size": "20G", "used": "8G", "available": "12G",
+                            "use_percent": disk, "mounted_on": "/"}],
+            "memory": {"memory_total": 4000, "memory_used": 1000, "memory_free": 3000, "memory_available": 3000,
+                       "swap_total": 0, "swap_used": 0, "swap_free": 0, "memory_usage_percent": 25.0}}
+
+
+def failed(name, error):
+    return {"timestamp": "2026-01-01T10:00:00", "server_name": name, "hostname": name, "status": "failed",
+            "error": error}
+
+
+def fleet():
+    return health_monitor.HostTable({
+        "web-1": sample("web-1", 0.5),
+        "web-2": sample("web-2", 3.0, disk="90"),
+        "db-1": sample("db-1", 1.5),
+        "db-2": failed("db-2", "Timeout after 30s connecting to 10.0.0.2:22"),
+        "db-3": failed("db-3", "Timeout after 45s connecting to 10.0.0.3:22\ntraceback"),
+        "batch-1": failed("batch-1", "Authentication failed")
+    })
+
+
+def test_worst_hosts_are_ordered_and_exclude_failures():
+    summary = health_monitor.summarize_fleet(fleet(), top_n=2)
+    assert summary["hosts"] == 6
+    assert summary["statuses"] == {"success": 3, "failed": 3}
+    assert summary["worst"]["load_1min"] == [{"server": "web-2", "value": 3.0}, {"server": "db-1", "value": 1.5}]
+    assert summary["worst"]["root_disk_percent"][0] == {"server": "web-2", "value": 90.0}
+
+
+def test_failure_reasons_are_grouped_with_numbers_normalized():
+    summary = health_monitor.summarize_fleet(fleet())
+    assert summary["failure_reasons"] == [
+        {"status": "failed", "reason": "Timeout after Ns connecting to N:N", "count": 2, "servers": ["db-2", "db-3"]},
+        {"status": "failed", "reason": "Authentication failed", "count": 1, "servers": ["batch-1"]}
+    ]
+
+
+def test_groups_and_levels():
+    groups = {"web-1": ["web"], "web-2": ["web", "frontend"], "db-1": ["db"], "db-2": ["db"]}
+    levels = {"load": np.array([0, 2, 1, 0, 0, 0])}
+    summary = health_monitor.summarize_fleet(fleet(), groups=groups, levels=levels)
+    assert summary["levels"] == {"load": {"ok": 1, "warning": 1, "critical": 1}}
+    assert summary["groups"]["web"]["hosts"] == 2
+    assert summary["groups"]["web"]["load_1min"] == {"mean": 1.75, "max": 3.0}
+    assert summary["groups"]["frontend"]["load_1min"] == {"mean": 3.0, "max": 3.0}
+    assert summary["groups"]["db"]["successful"] == 1
+    assert summary["groups"]["db"]["load_1min"] == {"mean": 1.5, "max": 1.5}
+    assert summary["groups"]["untagged"] == {"hosts": 2, "successful": 0}
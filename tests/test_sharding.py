@@ -0,0 +1,33 @@
+import json
+import os
+import subprocess
+import sys
+
+from conftest import ENTRY_SCRIPT, REPO_DIR
+
+
+def test_sharded_collection_honours_output_dir(tmp_path, closed_port):
+    port = closed_port
+    servers = [
+        {"name": f"shard-test-{index}", "hostname": "127.0.0.1", "port": port, "username": "u", "password": "p"}
+        for index in range(4)
+    ]
+    config = tmp_path / "servers.json"
+    config.write_text(json.dumps(servers))
+    output_dir = tmp_path / "out"
+    result = subprocess.run(
+        [sys.executable, ENTRY_SCRIPT, "--config", str(config), "--processes", "2", "--workers", "2",
+         "--output-dir", str(output_dir), "--async-logging", "--log-max-open-files", "2", "--no-viz"],
+        cwd=tmp_path, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 1, result.stdout + result.stderr
+
+    for server in servers:
+        assert (output_dir / "logs" / f"{server['name']}.log").exists()
+        assert not os.path.exists(os.path.join(REPO_DIR, "logs", f"{server['name']}.log"))
+    assert "Unable to connect to port" in (output_dir / "server_health_main.log").read_text()
+    assert not os.path.exists(os.path.join(REPO_DIR, "server_health_main.log"))
+    with open(output_dir / "server_health_data.json") as f:
+        document = json.load(f)
+    assert sorted(document["data"]) == [server["name"] for server in servers]
+    assert document["successful_connections"] == 0